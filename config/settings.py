@@ -5,6 +5,10 @@ SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 FPS = 60
 
+# Simulation clock - fixed ticks per second, decoupled from render FPS
+SIM_TICK_RATE = 60
+MAX_FRAME_TIME = 0.25      # Clamp per-frame catch-up to avoid a spiral of death
+
 # Card database path
 CARD_DB_PATH = "config/cards.json"
 
@@ -18,6 +22,7 @@ MAX_DAYS = 10
 # Game rules
 MAX_PLAYERS_PER_LOBBY = 5
 MIN_PLAYERS_TO_START = 3
+PLAYER_MOVE_SPEED = 200        # Pixels per second for WASD movement
 
 # Role configuration
 ROLE_TYPES = ["♕", "♛", "☢"]
@@ -29,6 +34,7 @@ MONSTER_SPAWN_CONFIG = {
     "scaling_per_day": 0.5,    # Add 0.5 monsters per day
     "min_monsters": 3,         # Minimum monsters to spawn
     "max_monsters": 10,        # Maximum monsters to spawn
+    "swarm_max_monsters": 3000,  # Maximum monsters in swarm mode (spatial hash keeps this cheap)
     "types": [
         {"symbol": "§", "hp": 50, "damage": 10, "speed": 1.0, "weight": 0.5},
         {"symbol": "¥", "hp": 80, "damage": 15, "speed": 0.8, "weight": 0.3}, 
@@ -36,6 +42,13 @@ MONSTER_SPAWN_CONFIG = {
     ]
 }
 
+# Dirty-rect rendering: only push changed screen regions (for slow displays)
+DIRTY_RECT_RENDERING = False
+DIRTY_RECT_FULL_REFRESH = 600  # Full repaint every N frames to clear stray pixels (0 = never)
+
+# Visual effects - pooled particles (extra particles are dropped when full)
+PARTICLE_POOL_CAPACITY = 1024
+
 # Experience sharing
 EXP_SHARE_RADIUS = 150     # Share EXP within 150 pixels
 EXP_SHARE_RATE = 0.4       # Share 40% of EXP with nearby players
@@ -43,6 +56,41 @@ EXP_SHARE_RATE = 0.4       # Share 40% of EXP with nearby players
 # Server config (fallback if env missing)
 DEFAULT_HOST = "localhost"
 DEFAULT_PORT = 8765
+SERVER_SEND_RATE = 20      # State broadcasts per second for in-game lobbies
+SERVER_OUTBOX_LIMIT = 256  # Queued messages per client before it is disconnected
+SERVER_SEND_TIMEOUT = 5.0  # Seconds a single send may block before the client is dropped
+SERVER_HEARTBEAT_INTERVAL = 10.0  # Seconds of client silence before the server sends a heartbeat
+SERVER_IDLE_TIMEOUT = 30.0  # Seconds of client silence before the connection is reaped
+SERVER_METRICS_PORT = 8766  # Local HTTP port for /metrics (0 disables it)
+SERVER_WORKERS = 0         # Worker processes for lobby simulations (0 = run them in the server process)
+INTEREST_MANAGEMENT = True        # Send each client only the monsters near its player
+INTEREST_VIEW_RADIUS = 700        # Pixels
+INTEREST_NIGHT_VIEW_RADIUS = 350  # Pixels, reduced so night hides distant monsters
+INTEREST_HYSTERESIS = 1.2         # Visible monsters stay sent until this many radii away
+MAX_BUFFERED_INPUTS = 8    # Per-player move inputs the server holds before dropping the oldest
+
+# Client netcode
+CLIENT_INTERP_DELAY = 0.1  # Seconds remote entities are rendered behind the newest snapshot
+CLIENT_SNAP_DISTANCE = 64  # Prediction errors above this many pixels snap instead of blending
+CLIENT_CORRECTION_RATE = 10.0  # Per-second decay of smaller prediction errors
+CLIENT_FLUSH_INTERVAL = 1 / 30  # Seconds between batched sends from GameClient
+
+# NPC dialogue (LLM)
+DIALOGUE_ASYNC = True      # Serve a fallback line at once and swap in the LLM reply when it arrives
+DIALOGUE_WORKERS = 4       # Background threads for LLM requests
+DIALOGUE_TIMEOUT = 8.0     # Seconds without a reply (or first streamed piece) before the fallback is kept
+DIALOGUE_STREAM = True     # Stream replies piece by piece instead of waiting for the whole text
+DIALOGUE_RESPONSES_FILE = "data/dialogues/npc_responses.json"  # Lines for the offline dialogue engine
+DIALOGUE_HISTORY_LIMIT = 500  # Past exchanges the offline dialogue engine remembers
+RESPONSE_CACHE_PATH = "cache/llm_responses.sqlite3"  # On-disk reply cache (None for memory only)
+RESPONSE_CACHE_MEMORY_ENTRIES = 512   # Replies kept in the in-memory LRU
+RESPONSE_CACHE_DISK_ENTRIES = 20000   # Replies kept on disk
+RESPONSE_CACHE_TTL = 7 * 24 * 3600    # Seconds a cached reply stays valid (0 = forever)
+LLM_POOL_SIZE = 8          # Keep-alive connections kept per API host
+LLM_MAX_CONCURRENCY = 4    # LLM requests on the wire at once
+LLM_MAX_RETRIES = 2        # Extra attempts after a connection error or 429/5xx answer
+LLM_RETRY_BACKOFF = 0.25   # Seconds; backoff doubles per attempt, with full jitter
+LLM_RETRY_BACKOFF_MAX = 2.0
 
 # Logging
 LOG_FILE = "logs/game.log"
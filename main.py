@@ -35,9 +35,24 @@ if __name__ == "__main__":
         if len(sys.argv) > 1 and sys.argv[1] in ["standard", "swarm"]:
             game_mode = sys.argv[1]
 
-        game = Game(game_mode=game_mode)
-        logger.info(f"Running game in {game_mode} mode...")
-        game.run()
+        # Headless mode: simulate one match without a window and print the summary
+        headless = "--headless" in sys.argv[1:]
+
+        # Optional fixed seed (--seed=1234) to replay a match exactly
+        seed = None
+        for arg in sys.argv[1:]:
+            if arg.startswith("--seed="):
+                seed = int(arg.split("=", 1)[1])
+
+        # Dirty-rect rendering for slow displays (--dirty-rects)
+        dirty_rects = True if "--dirty-rects" in sys.argv[1:] else None
+
+        game = Game(game_mode=game_mode, headless=headless, seed=seed, dirty_rects=dirty_rects)
+        logger.info(f"Running game in {game_mode} mode{' (headless)' if headless else ''}...")
+        if headless:
+            logger.info(f"Simulation finished: {game.run_headless()}")
+        else:
+            game.run()
     except Exception as e:
         logger.error(f"Error: {e}")
         import traceback
@@ -0,0 +1,161 @@
+# src/ai/dialogue_pipeline.py
+"""
+Background LLM requests for NPC dialogue
+"""
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+from config.settings import DIALOGUE_WORKERS, DIALOGUE_TIMEOUT
+
+# Request states
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+TIMED_OUT = "timed_out"
+CANCELLED = "cancelled"
+
+class DialogueRequest:
+    """
+    Handle for one NPC reply being generated in the background
+
+    ``text`` is the fallback line until the real reply arrives, so the UI
+    always has something to show. Call ``poll()`` once per frame (it never
+    blocks); it returns True once the request has settled.
+
+    Streamed requests also receive the reply piece by piece: the worker
+    calls ``feed()`` and the game thread collects new text with
+    ``take_streamed()``. Their deadline only applies until the first piece.
+    """
+
+    def __init__(self, npc_id, fallback: str, timeout: float):
+        self.npc_id = npc_id
+        self.fallback = fallback
+        self.text = fallback
+        self.status = PENDING
+        self.error: Optional[str] = None
+        self.started = time.monotonic()
+        self.deadline = self.started + timeout
+        self.latency: Optional[float] = None
+        self.first_piece: Optional[float] = None  # Seconds until the first streamed piece
+        self.stream = False
+        self.streamed = ""  # Streamed text taken so far
+        self._chunks: List[str] = []
+        self._chunks_lock = threading.Lock()
+        self._future = None
+
+    @classmethod
+    def completed(cls, npc_id, text: str) -> "DialogueRequest":
+        """An already settled request, for replies that need no API call (cache hits)"""
+        request = cls(npc_id, text, 0.0)
+        request.status = DONE
+        request.latency = 0.0
+        return request
+
+    @property
+    def done(self) -> bool:
+        return self.status != PENDING
+
+    @property
+    def is_real(self) -> bool:
+        """True once the LLM reply has replaced the fallback"""
+        return self.status == DONE
+
+    def poll(self) -> bool:
+        """Check for the reply without blocking; True once settled"""
+        if self.done:
+            return True
+        if self._future.done():
+            try:
+                result = self._future.result()
+            except CancelledError:
+                self.status = CANCELLED
+            except TimeoutError as e:
+                self.status = TIMED_OUT
+                self.error = str(e)
+            except Exception as e:
+                self.status = FAILED
+                self.error = str(e)
+            else:
+                if result:
+                    self.text = result
+                    self.status = DONE
+                else:
+                    self.status = FAILED
+            self.latency = time.monotonic() - self.started
+        elif self.first_piece is None and time.monotonic() > self.deadline:
+            # The worker may still finish; its result is ignored
+            self.status = TIMED_OUT
+            self._future.cancel()
+        return self.done
+
+    def feed(self, piece: str):
+        """Worker side of streaming: hand over the next piece of the reply"""
+        with self._chunks_lock:
+            if self.first_piece is None:
+                self.first_piece = time.monotonic() - self.started
+            self._chunks.append(piece)
+
+    def take_streamed(self) -> str:
+        """Game side of streaming: text fed since the last call ("" if none)"""
+        with self._chunks_lock:
+            chunks, self._chunks = self._chunks, []
+        text = "".join(chunks)
+        self.streamed += text
+        return text
+
+    def cancel(self):
+        """Give up on the reply; a request already on the wire runs out in the background"""
+        if not self.done:
+            self._future.cancel()
+            self.status = CANCELLED
+
+class DialoguePipeline:
+    """
+    Runs blocking LLM calls on a small thread pool so the game loop never waits
+
+    ``submit(fn, ...)`` returns a DialogueRequest at once; ``fn`` runs on a
+    worker and returns the reply text (or None). With ``stream=True`` the
+    request's ``feed`` is passed to ``fn`` as its first argument. ``poll()``
+    settles pending requests and returns the ones that finished since the
+    last call.
+    """
+
+    def __init__(self, max_workers: int = DIALOGUE_WORKERS, timeout: float = DIALOGUE_TIMEOUT):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.pending: List[DialogueRequest] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def submit(self, fn: Callable[..., Optional[str]], npc_id, fallback: str, *args: Any,
+               stream: bool = False) -> DialogueRequest:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="dialogue")
+        request = DialogueRequest(npc_id, fallback, self.timeout)
+        if stream:
+            request.stream = True
+            args = (request.feed,) + args
+        request._future = self._executor.submit(fn, *args)
+        self.pending.append(request)
+        return request
+
+    def poll(self) -> List[DialogueRequest]:
+        """Settle pending requests; returns those that finished (in any state)"""
+        finished = [request for request in self.pending if request.poll()]
+        if finished:
+            self.pending = [request for request in self.pending if not request.done]
+        return finished
+
+    def cancel(self, npc_id=None):
+        """Cancel pending requests for one NPC, or all of them"""
+        for request in self.pending:
+            if npc_id is None or request.npc_id == npc_id:
+                request.cancel()
+
+    def shutdown(self):
+        self.cancel()
+        self.pending = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
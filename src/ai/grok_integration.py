@@ -1,31 +1,50 @@
 import requests
 import json
+from typing import Any, Optional
+
+from src.ai.llm_http import LLMSession, shared_llm_session
+from src.ai.response_cache import ResponseCache, make_key, shared_response_cache
 
 class GrokClient:
-    def __init__(self, api_key: str, model: str = "grok-3-mini-beta"):
+    def __init__(self, api_key: str, model: str = "grok-3-mini-beta", cache: Optional[ResponseCache] = None,
+                 session: Optional[LLMSession] = None, timeout: float = 30.0):
         self.api_key = api_key
         self.model = model
         self.endpoint = "https://api.groq.com/v1/chat/completions"
+        self.cache = cache if cache is not None else shared_response_cache()
+        self.session = session if session is not None else shared_llm_session()
+        self.timeout = timeout
 
-    def ask(self, prompt: str, system: str = "You are an NPC in a gothic investigation game.") -> str:
+    def ask(self, prompt: str, system: str = "You are an NPC in a gothic investigation game.",
+            state: Any = None) -> str:
+        """
+        Ask the model; ``state`` is a coarse NPC state bucket that becomes part
+        of the cache key (replies for different states are cached apart)
+        """
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
 
+        messages = [
+            {"role": "system", "content": system},
+            {"role": "user", "content": prompt}
+        ]
+        cache_key = make_key(messages, self.model, state)
+        cached = self.cache.get(cache_key)
+        if cached:
+            return cached
+
         payload = {
             "model": self.model,
-            "messages": [
-                {"role": "system", "content": system},
-                {"role": "user", "content": prompt}
-            ],
+            "messages": messages,
             "temperature": 0.8
         }
 
         try:
-            response = requests.post(self.endpoint, headers=headers, json=payload)
-            response.raise_for_status()
-            result = response.json()
-            return result["choices"][0]["message"]["content"].strip()
+            result = self.session.post_json(self.endpoint, payload, headers=headers, timeout=self.timeout)
+            reply = result["choices"][0]["message"]["content"].strip()
+            self.cache.put(cache_key, reply)
+            return reply
         except Exception as e:
             return f"[Grok Error] {e}"
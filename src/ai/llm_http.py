@@ -0,0 +1,246 @@
+# src/ai/llm_http.py
+"""
+Pooled HTTP session for LLM calls: keep-alive, bounded concurrency, retries
+"""
+import json
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.settings import (
+    LLM_POOL_SIZE, LLM_MAX_CONCURRENCY, LLM_MAX_RETRIES, LLM_RETRY_BACKOFF, LLM_RETRY_BACKOFF_MAX
+)
+from src.utils.shared import process_wide
+
+# Worth another try: the server is overloaded or a proxy hiccuped
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class _Call:
+    """One in-flight request that identical concurrent callers wait on"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+class LLMSession:
+    """
+    Thread-safe wrapper around one ``requests.Session``
+
+    Connections to the API are kept alive and reused (up to ``pool_size``
+    per host), so only the first call pays for the TCP and TLS handshakes.
+    At most ``max_concurrency`` requests are on the wire at once; further
+    callers wait for a slot. Connection errors and 429/5xx answers are
+    retried with full-jitter exponential backoff.
+
+    The chat-completions API takes one conversation per request, so prompts
+    cannot be packed into one call. Instead identical requests issued while
+    one is already in flight (several NPCs greeted with the same line, say)
+    are coalesced: they wait for that call and share its answer.
+    """
+
+    def __init__(self, pool_size: int = LLM_POOL_SIZE, max_concurrency: int = LLM_MAX_CONCURRENCY,
+                 max_retries: int = LLM_MAX_RETRIES, backoff: float = LLM_RETRY_BACKOFF,
+                 backoff_max: float = LLM_RETRY_BACKOFF_MAX, window: float = 60.0):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.window = window
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, _Call] = {}
+
+        self.started = time.monotonic()
+        self.requests = 0      # Logical calls made by callers
+        self.attempts = 0      # HTTP requests actually sent, retries included
+        self.retries = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.coalesced = 0
+        self.in_flight = 0
+        self.latencies: deque = deque(maxlen=512)
+        self.first_pieces: deque = deque(maxlen=512)  # Time to first streamed piece
+        self.completed: deque = deque(maxlen=4096)  # Completion times, for throughput
+
+    def post_json(self, url: str, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None,
+                  timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        POST ``payload`` as JSON and return the decoded JSON answer
+
+        Raises the last error once retries are exhausted: requests.Timeout,
+        requests.ConnectionError or requests.HTTPError.
+        """
+        key = json.dumps([url, payload], sort_keys=True, ensure_ascii=False)
+        with self._lock:
+            self.requests += 1
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+        if not leader:
+            if not call.event.wait(timeout):
+                with self._lock:
+                    self.timeouts += 1
+                raise requests.Timeout(f"Coalesced request to {url} timed out")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._send(url, payload, headers, timeout)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            call.event.set()
+
+    def _send(self, url, payload, headers, timeout) -> Dict[str, Any]:
+        start = time.monotonic()
+        with self._slots:
+            with self._lock:
+                self.in_flight += 1
+            try:
+                response = self._post(url, payload, headers, timeout)
+                result = response.json()
+                self._record(start)
+                return result
+            except requests.Timeout:
+                self._count_timeout()
+                raise
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+
+    def stream_chat(self, url: str, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None,
+                    timeout: Optional[float] = None) -> Iterator[str]:
+        """
+        Streamed chat completion: yields content pieces as the server sends them
+
+        The request is made with ``"stream": true`` and the answer read as
+        server-sent events (``data: {...}`` lines ending with ``data: [DONE]``).
+        ``timeout`` bounds the wait for each piece, not the whole reply.
+        Retries only happen before the first piece. Streams are never
+        coalesced.
+        """
+        payload = dict(payload, stream=True)
+        start = time.monotonic()
+        first_piece = True
+        with self._lock:
+            self.requests += 1
+        with self._slots:
+            with self._lock:
+                self.in_flight += 1
+            try:
+                response = self._post(url, payload, headers, timeout, stream=True)
+                with response:
+                    for line in response.iter_lines():
+                        if not line.startswith(b"data:"):
+                            continue
+                        data = line[5:].strip()
+                        if data == b"[DONE]":
+                            break
+                        choices = json.loads(data).get("choices") or [{}]
+                        piece = (choices[0].get("delta") or {}).get("content")
+                        if piece:
+                            if first_piece:
+                                first_piece = False
+                                with self._lock:
+                                    self.first_pieces.append(time.monotonic() - start)
+                            yield piece
+                self._record(start)
+            except requests.Timeout:
+                self._count_timeout()
+                raise
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+
+    def _post(self, url, payload, headers, timeout, stream=False) -> requests.Response:
+        """POST with retries; returns a successful response or raises"""
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            with self._lock:
+                self.attempts += 1
+            try:
+                response = self.session.post(url, json=payload, headers=headers, timeout=timeout, stream=stream)
+            except requests.Timeout:
+                # The caller's deadline is spent; retrying would only overrun it
+                raise
+            except requests.ConnectionError:
+                if last_attempt:
+                    with self._lock:
+                        self.errors += 1
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or last_attempt:
+                    if response.status_code >= 400:
+                        with self._lock:
+                            self.errors += 1
+                        response.close()
+                    response.raise_for_status()
+                    return response
+                response.close()
+            with self._lock:
+                self.retries += 1
+            time.sleep(random.uniform(0, min(self.backoff_max, self.backoff * 2 ** attempt)))
+
+    def _count_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+            self.errors += 1
+
+    def _record(self, start: float):
+        now = time.monotonic()
+        with self._lock:
+            self.latencies.append(now - start)
+            self.completed.append(now)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus latency percentiles and completions per second"""
+        now = time.monotonic()
+        with self._lock:
+            latencies = sorted(self.latencies)
+            first_pieces = sorted(self.first_pieces)
+            recent = sum(1 for t in self.completed if now - t <= self.window)
+            report = {
+                "requests": self.requests,
+                "attempts": self.attempts,
+                "retries": self.retries,
+                "errors": self.errors,
+                "timeouts": self.timeouts,
+                "coalesced": self.coalesced,
+                "in_flight": self.in_flight,
+            }
+        elapsed = min(self.window, max(now - self.started, 1e-9))
+        report["per_second"] = round(recent / elapsed, 3)
+        if latencies:
+            report["latency_avg"] = round(sum(latencies) / len(latencies), 4)
+            report["latency_p50"] = round(latencies[len(latencies) // 2], 4)
+            report["latency_p95"] = round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 4)
+        if first_pieces:
+            report["first_piece_p50"] = round(first_pieces[len(first_pieces) // 2], 4)
+        return report
+
+    def close(self):
+        self.session.close()
+
+@process_wide
+def shared_llm_session() -> LLMSession:
+    """Connection pool shared by DialogueSystem and GrokClient unless given their own"""
+    return LLMSession()
@@ -0,0 +1,248 @@
+# src/ai/offline_dialogue.py
+"""
+Retrieval-based NPC replies that need no network: TF-IDF over canned lines and past exchanges
+"""
+import math
+import re
+import unicodedata
+from collections import Counter, deque
+from typing import Dict, Iterable, List, Optional
+
+from config.settings import DIALOGUE_RESPONSES_FILE, DIALOGUE_HISTORY_LIMIT
+from src.utils.file_utils import load_json
+
+_WORD = re.compile(r"\w+")
+
+# Categories of npc_responses.json that speak to the player's hidden role;
+# "<role>/*" becomes "<role>/aware" or "<role>/unaware" depending on the NPC
+ROLE_CATEGORIES = ("protector", "traitor", "chaos")
+
+# Topic from DialogueSystem._extract_topic -> canned categories that fit it.
+# Role and event lines are only used when they are true (see context_tags).
+TOPIC_TAGS = {
+    "identity": {"protector/*": 0.6, "traitor/*": 0.6, "chaos/*": 0.6},
+    "murder": {"events/player_died": 1.0, "traitor/*": 0.4},
+    "clues": {"traitor/*": 0.6, "general/day": 0.3},
+    "ritual": {"chaos/*": 1.0},
+    "suspicion": {"suspicion/high": 0.8, "traitor/*": 0.5},
+    "help": {"protector/*": 0.8, "suspicion/low": 0.4},
+}
+
+# EventGenerator event types -> "events/..." groups of npc_responses.json
+EVENT_GROUPS = {"murder": "player_died"}
+
+# An NPC this suspicious has seen through the player
+AWARE_SUSPICION = 0.9
+
+# Similarity to a past exchange counts this much more than a category match
+TEXT_WEIGHT = 2.0
+OWN_HISTORY_WEIGHT = 0.3
+# Document norms are recomputed once the index has changed this much
+NORM_REFRESH = 0.25
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercased words plus adjacent-word pairs
+
+    Vietnamese words are often two syllables ("giết người", "manh mối"), so
+    pairs keep them together as terms.
+    """
+    words = _WORD.findall(unicodedata.normalize("NFC", text).lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+def context_tags(intent: Dict, suspicion: float = 0.0, night: bool = False, role: Optional[str] = None,
+                 events: Iterable[str] = ()) -> Dict[str, float]:
+    """
+    Weighted categories a reply should come from, given the player's intent and NPC state
+
+    Args:
+        intent: Result of DialogueSystem._analyze_player_intent
+        suspicion: NPC's suspicion of the player, 0-1
+        night: Whether it is night
+        role: Player's real role ("protector", "traitor", "chaos"), None if unknown;
+            lines for other roles are never picked
+        events: Event types that have happened (EventGenerator types); event
+            lines are only picked for these
+    """
+    topic = intent.get("topic", "general")
+    # Past exchanges on the same topic; weak for "general", which says little
+    wanted = {f"topic:{topic}": 0.2 if topic == "general" else 0.5,
+              f"fallback/{topic}": 1.1,
+              "general/night" if night else "general/day": 0.3}
+    wanted.update(TOPIC_TAGS.get(topic, {}))
+    if intent.get("is_accusation") or intent.get("is_threatening") or suspicion > 0.6:
+        wanted["suspicion/high"] = 1.2
+        wanted["traitor/*"] = max(wanted.get("traitor/*", 0.0), 0.5)
+    elif intent.get("is_friendly"):
+        wanted["suspicion/low"] = 1.0
+        wanted["protector/*"] = max(wanted.get("protector/*", 0.0), 0.6)
+
+    awareness = "aware" if suspicion >= AWARE_SUSPICION else "unaware"
+    happened = {EVENT_GROUPS.get(event, event) for event in events}
+    tags = {}
+    for tag, weight in wanted.items():
+        category, _, group = tag.partition("/")
+        if category in ROLE_CATEGORIES:
+            if category != role:
+                continue
+            tag = f"{category}/{awareness}"
+        elif category == "events" and group not in happened:
+            continue
+        tags[tag] = max(tags.get(tag, 0.0), weight)
+    return tags
+
+class _Document:
+    __slots__ = ("reply", "tags", "terms", "key", "norm")
+
+    def __init__(self, text: str, reply: str, tags: Iterable[str], key: Optional[tuple] = None):
+        self.reply = reply
+        self.tags = frozenset(tags)
+        self.terms = {term: 1 + math.log(tf) for term, tf in Counter(tokenize(text)).items()}
+        self.key = key
+        self.norm = 1.0
+
+class OfflineDialogueEngine:
+    """
+    Picks NPC replies locally from an inverted index
+
+    Documents are the canned lines of ``npc_responses.json`` (tagged with
+    their category, e.g. ``suspicion/high``) and past player -> NPC
+    exchanges (indexed by what the player said, tagged with its topic).
+    A query scores only the documents sharing a term or a tag with it:
+    TF-IDF cosine similarity to the player's message plus the weights of
+    matching tags from ``context_tags``.
+
+    Only the latest ``history_limit`` exchanges are kept. Adding or
+    dropping one updates the postings and document frequencies in place;
+    IDF is read at query time, and document norms are refreshed only after
+    the index has changed by ``NORM_REFRESH`` of its size.
+
+    Each NPC avoids its last few replies so a conversation does not loop.
+    """
+
+    def __init__(self, responses: Optional[Dict] = None, recent_limit: int = 3,
+                 history_limit: int = DIALOGUE_HISTORY_LIMIT):
+        self.documents: Dict[int, _Document] = {}
+        self.postings: Dict[str, Dict[int, float]] = {}  # term -> {doc id: log tf}
+        self.tag_index: Dict[str, Dict[int, None]] = {}  # tag -> doc ids, in insertion order
+        self.document_frequency: Counter = Counter()
+        self.recent: Dict[str, deque] = {}
+        self.recent_limit = recent_limit
+        self.history_limit = history_limit
+        self.history: deque = deque()  # Exchange doc ids, oldest first
+        self._exchanges: Dict[tuple, int] = {}
+        self._next_id = 0
+        self._changes = 0
+        if responses:
+            self.add_responses(responses)
+
+    @classmethod
+    def load(cls, path: str = DIALOGUE_RESPONSES_FILE) -> "OfflineDialogueEngine":
+        """Engine over a responses file ({category: {subcategory: [lines]}}); empty if missing"""
+        return cls(load_json(path))
+
+    def __len__(self):
+        return len(self.documents)
+
+    def add_responses(self, responses: Dict):
+        for category, groups in responses.items():
+            for group, lines in groups.items():
+                tag = f"{category}/{group}"
+                for line in lines:
+                    self._add(_Document(f"{line} {category} {group}", line, [tag]))
+
+    def add_exchange(self, npc_id: str, player_message: str, reply: str, topic: str = "general"):
+        """Remember what an NPC answered to a message so similar messages can reuse it"""
+        key = (npc_id, player_message, reply)
+        if not reply or key in self._exchanges:
+            return
+        doc_id = self._add(_Document(player_message, reply, [f"topic:{topic}", f"npc:{npc_id}", "history"], key))
+        self._exchanges[key] = doc_id
+        self.history.append(doc_id)
+        while len(self.history) > self.history_limit:
+            self._remove(self.history.popleft())
+
+    def idf(self, term: str) -> float:
+        return math.log((1 + len(self.documents)) / (1 + self.document_frequency[term])) + 1
+
+    def _add(self, document: _Document) -> int:
+        doc_id = self._next_id
+        self._next_id += 1
+        self.documents[doc_id] = document
+        for term, weight in document.terms.items():
+            self.postings.setdefault(term, {})[doc_id] = weight
+        self.document_frequency.update(document.terms.keys())
+        for tag in document.tags:
+            self.tag_index.setdefault(tag, {})[doc_id] = None
+        self._norm(document)
+        self._changed()
+        return doc_id
+
+    def _remove(self, doc_id: int):
+        document = self.documents.pop(doc_id)
+        for term in document.terms:
+            postings = self.postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self.postings[term]
+            self.document_frequency[term] -= 1
+            if not self.document_frequency[term]:
+                del self.document_frequency[term]
+        for tag in document.tags:
+            index = self.tag_index[tag]
+            del index[doc_id]
+            if not index:
+                del self.tag_index[tag]
+        if document.key is not None:
+            self._exchanges.pop(document.key, None)
+        self._changed()
+
+    def _norm(self, document: _Document):
+        document.norm = math.sqrt(sum((w * self.idf(t)) ** 2 for t, w in document.terms.items())) or 1.0
+
+    def _changed(self):
+        """Count a change; refresh every norm once IDF has drifted enough to matter"""
+        self._changes += 1
+        if self._changes > NORM_REFRESH * len(self.documents):
+            self._changes = 0
+            for document in self.documents.values():
+                self._norm(document)
+
+    def respond(self, npc_id: str, message: str, tags: Dict[str, float]) -> Optional[str]:
+        """
+        Best reply for a player message, or None if nothing relates to it
+
+        Args:
+            npc_id: Speaking NPC (for repeat avoidance)
+            message: What the player said
+            tags: Wanted categories and their weights (see context_tags)
+        """
+        scores: Dict[int, float] = {}
+        query = Counter(term for term in tokenize(message) if term in self.postings)
+        if query:
+            weights = {term: (1 + math.log(tf)) * self.idf(term) for term, tf in query.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values()))
+            for term, weight in weights.items():
+                idf = self.idf(term)
+                for doc_id, tf_weight in self.postings[term].items():
+                    similarity = tf_weight * idf / self.documents[doc_id].norm * weight / norm
+                    scores[doc_id] = scores.get(doc_id, 0.0) + TEXT_WEIGHT * similarity
+        # The NPC's own past answers fit its voice better than anyone else's
+        tags = dict(tags, **{f"npc:{npc_id}": OWN_HISTORY_WEIGHT})
+        for tag, weight in tags.items():
+            for doc_id in self.tag_index.get(tag, ()):
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight
+
+        recent = self.recent.setdefault(npc_id, deque(maxlen=self.recent_limit))
+        best, best_score = None, 0.0
+        for doc_id, score in scores.items():
+            reply = self.documents[doc_id].reply
+            if reply in recent:
+                score *= 0.1
+            if score > best_score or (score == best_score and best is not None and doc_id < best):
+                best, best_score = doc_id, score
+        if best is None:
+            return None
+        reply = self.documents[best].reply
+        recent.append(reply)
+        return reply
@@ -0,0 +1,201 @@
+# src/ai/response_cache.py
+"""
+Content-addressed cache for LLM replies, in memory and on disk
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from config.settings import (
+    RESPONSE_CACHE_PATH, RESPONSE_CACHE_MEMORY_ENTRIES, RESPONSE_CACHE_DISK_ENTRIES, RESPONSE_CACHE_TTL
+)
+from src.utils.shared import process_wide
+
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_text(text: str) -> str:
+    """Case, spacing and trailing punctuation do not change the reply we want"""
+    return _WHITESPACE.sub(" ", text).strip().lower().rstrip(" .!?…")
+
+def make_key(messages: List[Dict[str, str]], model: str, bucket: Any = None) -> str:
+    """
+    Cache key for a chat request
+
+    Args:
+        messages: Chat messages as sent to the API
+        model: Model name; replies from different models never mix
+        bucket: Coarse NPC state (mood, topic, ...) the reply depends on
+    """
+    payload = [model, bucket, [(m["role"], normalize_text(m["content"])) for m in messages]]
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False, default=str).encode()).hexdigest()
+
+class ResponseCache:
+    """
+    Two-tier reply cache: an LRU dict in front of a SQLite table
+
+    Entries expire ``ttl`` seconds after they were stored (0 keeps them
+    forever). Each tier drops its least recently used entries once it holds
+    more than its limit. Safe to share between threads: DialogueSystem
+    stores replies from its worker threads.
+
+    ``path=None`` keeps the cache in memory only. The SQLite file is
+    opened on the first lookup that reaches the disk tier or the first
+    store, so creating a cache touches no files.
+    """
+
+    def __init__(self, path: Optional[str] = RESPONSE_CACHE_PATH, max_entries: int = RESPONSE_CACHE_MEMORY_ENTRIES,
+                 disk_entries: int = RESPONSE_CACHE_DISK_ENTRIES, ttl: float = RESPONSE_CACHE_TTL):
+        self.path = path
+        self.max_entries = max_entries
+        self.disk_entries = disk_entries
+        self.ttl = ttl
+        self.memory: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (text, stored at)
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._opened = not path
+
+    def _disk(self) -> Optional[sqlite3.Connection]:
+        """The SQLite connection, opened on first use; None when memory-only. Call with the lock held."""
+        if not self._opened:
+            self._opened = True
+            self._open(self.path)
+        return self._db
+
+    def _open(self, path: str):
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS responses "
+                             "(key TEXT PRIMARY KEY, text TEXT NOT NULL, stored REAL NOT NULL, used REAL NOT NULL)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_used ON responses (used)")
+            self._db.commit()
+        except sqlite3.Error as e:
+            # A broken cache file must not stop dialogue: run memory-only
+            print(f"Response cache disabled on disk: {e}")
+            self._db = None
+
+    def _expired(self, stored: float, now: float) -> bool:
+        return self.ttl > 0 and now - stored > self.ttl
+
+    def get(self, key: str, memory_only: bool = False) -> Optional[str]:
+        """
+        Cached reply for ``key``, or None
+
+        ``memory_only`` skips the disk tier (and does not count a miss); use
+        it on the game thread where even a small SQLite read is unwelcome.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[1], now):
+                    self.memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return entry[0]
+                del self.memory[key]
+
+            if memory_only:
+                # A peek: the full lookup that follows counts the miss
+                return None
+            if self._disk() is None:
+                self.misses += 1
+                return None
+
+            try:
+                row = self._db.execute("SELECT text, stored FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is not None and self._expired(row[1], now):
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._db.commit()
+                    row = None
+                if row is not None:
+                    self._db.execute("UPDATE responses SET used = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+            except sqlite3.Error as e:
+                print(f"Response cache read failed: {e}")
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, row[0], row[1])
+            return row[0]
+
+    def put(self, key: str, text: str):
+        """Store a reply in both tiers"""
+        if not text:
+            return
+        now = time.time()
+        with self._lock:
+            self.stores += 1
+            self._remember(key, text, now)
+            if self._disk() is None:
+                return
+            try:
+                self._db.execute("INSERT OR REPLACE INTO responses (key, text, stored, used) VALUES (?, ?, ?, ?)",
+                                 (key, text, now, now))
+                trimmed = self._db.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY used DESC LIMIT -1 OFFSET ?)", (self.disk_entries,)).rowcount
+                if self.ttl > 0:
+                    trimmed += self._db.execute("DELETE FROM responses WHERE stored < ?", (now - self.ttl,)).rowcount
+                self._db.commit()
+                self.evictions += max(trimmed, 0)
+            except sqlite3.Error as e:
+                print(f"Response cache write failed: {e}")
+
+    def _remember(self, key: str, text: str, stored: float):
+        self.memory[key] = (text, stored)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+            self.evictions += 1
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 3),
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "memory_entries": len(self.memory),
+        }
+
+    def clear(self):
+        with self._lock:
+            self.memory.clear()
+            if self._disk() is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def close(self):
+        with self._lock:
+            # A closed cache stays memory-only instead of reopening the file
+            self._opened = True
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+@process_wide
+def shared_response_cache() -> ResponseCache:
+    """Cache used by DialogueSystem and GrokClient unless given their own; its file opens on first use"""
+    return ResponseCache()
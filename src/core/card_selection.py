@@ -3,15 +3,16 @@ import pygame
 import math
 from typing import List, Dict
 from .entities import Card
+from ..utils.font_utils import get_sys_font
 
 class CardSelection:
     def __init__(self, game):
         self.game = game
         self.screen = game.screen
         self.width, self.height = self.screen.get_size()
-        self.font_large = pygame.font.SysFont("Arial", 28, bold=True)
-        self.font_medium = pygame.font.SysFont("Arial", 20)
-        self.font_small = pygame.font.SysFont("Arial", 16)
+        self.font_large = get_sys_font("Arial", 28, bold=True)
+        self.font_medium = get_sys_font("Arial", 20)
+        self.font_small = get_sys_font("Arial", 16)
         
         # Card visuals
         self.card_width = 220
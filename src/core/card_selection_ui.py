@@ -5,7 +5,7 @@ import math
 import random
 from typing import List, Dict, Optional, Tuple, Any
 from src.core.skill_system import get_skill_registry
-from src.utils.font_utils import get_font, render_text, normalize_vietnamese
+from src.utils.font_utils import get_font, get_sys_font, render_text, normalize_vietnamese
 
 class CardSelectionUI:
     """Card selection UI for selecting cards in various game contexts"""
@@ -331,11 +331,11 @@ class CardSelectionUI:
         header_width = min(150, len(type_label) * 10)
         header_rect = pygame.Rect(width//2 - header_width//2, 10, header_width, 25)
         pygame.draw.rect(card_surface, color, header_rect)
-        type_text = self.small_font.render(type_label, True, (255, 255, 255))
+        type_text = render_text(self.small_font, type_label, (255, 255, 255))
         card_surface.blit(type_text, (width//2 - type_text.get_width()//2, 12))
         
         # Draw selection number at top left
-        idx_text = self.small_font.render(str(self.card_options.index(card) + 1), True, (255, 255, 0))
+        idx_text = render_text(self.small_font, str(self.card_options.index(card) + 1), (255, 255, 0))
         card_surface.blit(idx_text, (10, 10))
         
         # Draw card icon area (centered)
@@ -347,12 +347,12 @@ class CardSelectionUI:
         card_icon = card.get("icon", "?")
         if isinstance(card_icon, str):
             # Draw text icon
-            icon_text = self.title_font.render(card_icon, True, (255, 255, 255))
+            icon_text = render_text(self.title_font, card_icon, (255, 255, 255))
             card_surface.blit(icon_text, (icon_rect.centerx - icon_text.get_width()//2, 
                                          icon_rect.centery - icon_text.get_height()//2))
         
         # Draw card title
-        title_text = self.title_font.render(card.get("name", "Unknown Card"), True, (255, 255, 255))
+        title_text = render_text(self.title_font, card.get("name", "Unknown Card"), (255, 255, 255))
         card_surface.blit(title_text, ((width - title_text.get_width())//2, 150))
         
         # Draw card description
@@ -361,7 +361,7 @@ class CardSelectionUI:
         
         line_y = 180
         for line in desc_lines[:4]:  # Limit to first 4 lines
-            desc_text = self.desc_font.render(line, True, (200, 200, 200))
+            desc_text = render_text(self.desc_font, line, (200, 200, 200))
             card_surface.blit(desc_text, (10, line_y))
             line_y += 20
         
@@ -371,40 +371,40 @@ class CardSelectionUI:
         # For character cards, show passive skill
         if card.get('type') == 'character' and 'passive_skill' in card:
             passive = card['passive_skill']
-            passive_title = self.small_font.render("Passive: " + passive.get('name', ''), True, (180, 220, 255))
+            passive_title = render_text(self.small_font, "Passive: " + passive.get('name', ''), (180, 220, 255))
             card_surface.blit(passive_title, (10, y_pos))
             y_pos += 20
             
             passive_desc = passive.get('description', '')
             passive_lines = self._wrap_text(passive_desc, width - 20, self.small_font)
             for line in passive_lines[:2]:  # Limit to 2 lines
-                passive_text = self.small_font.render(line, True, (160, 200, 240))
+                passive_text = render_text(self.small_font, line, (160, 200, 240))
                 card_surface.blit(passive_text, (10, y_pos))
                 y_pos += 16
         
         # For role cards, show special ability
         if card.get('type') == 'role' and 'special_ability' in card:
             ability = card['special_ability']
-            ability_title = self.small_font.render("Ability: " + ability.get('name', ''), True, (220, 220, 180))
+            ability_title = render_text(self.small_font, "Ability: " + ability.get('name', ''), (220, 220, 180))
             card_surface.blit(ability_title, (10, y_pos))
             y_pos += 20
             
             ability_desc = ability.get('description', '')
             ability_lines = self._wrap_text(ability_desc, width - 20, self.small_font)
             for line in ability_lines[:2]:  # Limit to 2 lines
-                ability_text = self.small_font.render(line, True, (200, 200, 160))
+                ability_text = render_text(self.small_font, line, (200, 200, 160))
                 card_surface.blit(ability_text, (10, y_pos))
                 y_pos += 16
         
         # For weapon cards, show upgrade info
         if card.get('type') == 'weapon' and 'upgrade' in card.get('data', {}):
             upgrade = card['data']['upgrade']
-            upgrade_title = self.small_font.render("Upgrade: " + upgrade.get('name', ''), True, (180, 255, 180))
+            upgrade_title = render_text(self.small_font, "Upgrade: " + upgrade.get('name', ''), (180, 255, 180))
             card_surface.blit(upgrade_title, (10, y_pos))
             y_pos += 20
             
             condition = upgrade.get('condition', '')
-            condition_text = self.small_font.render("Condition: " + condition, True, (160, 220, 160))
+            condition_text = render_text(self.small_font, "Condition: " + condition, (160, 220, 160))
             card_surface.blit(condition_text, (10, y_pos))
             y_pos += 16
         
@@ -440,7 +440,7 @@ class CardSelectionUI:
             width=2
         )
         
-        confirm_text = self.desc_font.render("CONFIRM", True, (255, 255, 255))
+        confirm_text = render_text(self.desc_font, "CONFIRM", (255, 255, 255))
         text_rect = confirm_text.get_rect(center=(button_x + button_width/2, button_y + button_height/2))
         self.screen.blit(confirm_text, text_rect)
     
@@ -622,24 +622,24 @@ class MenuCardSelectionUI:
         pygame.draw.rect(screen, color, rect, width=border_width, border_radius=15)
         
         # Draw card title
-        title_font = pygame.font.SysFont("Arial", 24, bold=True)
+        title_font = get_sys_font("Arial", 24, bold=True)
         title_text = title_font.render(card['name'], True, (255, 255, 255))
         title_rect = title_text.get_rect(centerx=rect.centerx, top=rect.top + 20)
         screen.blit(title_text, title_rect)
         
         # Draw selection number in top-left corner
-        idx_font = pygame.font.SysFont("Arial", 18, bold=True)
+        idx_font = get_sys_font("Arial", 18, bold=True)
         idx_text = idx_font.render(str(self.cards.index(card) + 1), True, (255, 255, 0))
         screen.blit(idx_text, (rect.left + 10, rect.top + 10))
         
         # Draw card icon
-        icon_font = pygame.font.SysFont("Arial", 36)
+        icon_font = get_sys_font("Arial", 36)
         icon_text = icon_font.render(card.get('icon', '?'), True, (255, 255, 255))
         icon_rect = icon_text.get_rect(center=(rect.centerx, rect.top + 80))
         screen.blit(icon_text, icon_rect)
         
         # Draw card description (abbreviated)
-        desc_font = pygame.font.SysFont("Arial", 16)
+        desc_font = get_sys_font("Arial", 16)
         description = card.get("description", "")
         if len(description) > 100:
             description = description[:97] + "..."
@@ -665,17 +665,17 @@ class MenuCardSelectionUI:
         y_pos = rect.top + 200
         
         # Draw passive skill header
-        header_font = pygame.font.SysFont("Arial", 18, bold=True)
+        header_font = get_sys_font("Arial", 18, bold=True)
         header_text = header_font.render("Passive Skill", True, (180, 220, 255))
         screen.blit(header_text, (rect.left + 10, y_pos))
         
         # Draw passive skill name
-        name_font = pygame.font.SysFont("Arial", 16)
+        name_font = get_sys_font("Arial", 16)
         name_text = name_font.render(passive.get('name', ''), True, (160, 200, 240))
         screen.blit(name_text, (rect.left + 10, y_pos + 25))
         
         # Draw abbreviated description
-        desc_font = pygame.font.SysFont("Arial", 14)
+        desc_font = get_sys_font("Arial", 14)
         desc = passive.get('description', '')
         if len(desc) > 80:
             desc = desc[:77] + "..."
@@ -694,17 +694,17 @@ class MenuCardSelectionUI:
         y_pos = rect.top + 200
         
         # Draw ability header
-        header_font = pygame.font.SysFont("Arial", 18, bold=True)
+        header_font = get_sys_font("Arial", 18, bold=True)
         header_text = header_font.render("Special Ability", True, (220, 220, 180))
         screen.blit(header_text, (rect.left + 10, y_pos))
         
         # Draw ability name
-        name_font = pygame.font.SysFont("Arial", 16)
+        name_font = get_sys_font("Arial", 16)
         name_text = name_font.render(ability.get('name', ''), True, (200, 200, 160))
         screen.blit(name_text, (rect.left + 10, y_pos + 25))
         
         # Draw abbreviated description
-        desc_font = pygame.font.SysFont("Arial", 14)
+        desc_font = get_sys_font("Arial", 14)
         desc = ability.get('description', '')
         if len(desc) > 80:
             desc = desc[:77] + "..."
@@ -727,19 +727,19 @@ class MenuCardSelectionUI:
         pygame.draw.rect(screen, (100, 100, 150), panel_rect, width=2, border_radius=10)
         
         # Draw details title
-        title_font = pygame.font.SysFont("Arial", 24, bold=True)
+        title_font = get_sys_font("Arial", 24, bold=True)
         title_text = title_font.render(card['name'], True, (255, 255, 255))
         title_rect = title_text.get_rect(centerx=panel_rect.centerx, top=panel_rect.top + 20)
         screen.blit(title_text, title_rect)
         
         # Draw card type
-        type_font = pygame.font.SysFont("Arial", 18)
+        type_font = get_sys_font("Arial", 18)
         type_text = type_font.render(card['type'].capitalize(), True, (200, 200, 200))
         type_rect = type_text.get_rect(centerx=panel_rect.centerx, top=title_rect.bottom + 10)
         screen.blit(type_text, type_rect)
         
         # Draw card description
-        desc_font = pygame.font.SysFont("Arial", 16)
+        desc_font = get_sys_font("Arial", 16)
         description = card.get("description", "No description available.")
         desc_lines = self._wrap_text(description, desc_font, panel_rect.width - 40)
         
@@ -763,19 +763,19 @@ class MenuCardSelectionUI:
         if 'passive_skill' in card and card['passive_skill']:
             passive = card['passive_skill']
             
-            section_font = pygame.font.SysFont("Arial", 20, bold=True)
+            section_font = get_sys_font("Arial", 20, bold=True)
             section_text = section_font.render("Passive Skill", True, (180, 220, 255))
             screen.blit(section_text, (panel_rect.left + 20, y_offset))
             
             # Draw passive skill name
             y_offset += 30
-            name_font = pygame.font.SysFont("Arial", 18)
+            name_font = get_sys_font("Arial", 18)
             name_text = name_font.render(passive.get('name', ''), True, (160, 200, 240))
             screen.blit(name_text, (panel_rect.left + 20, y_offset))
             
             # Draw passive skill description
             y_offset += 25
-            desc_font = pygame.font.SysFont("Arial", 16)
+            desc_font = get_sys_font("Arial", 16)
             description = passive.get('description', '')
             desc_lines = self._wrap_text(description, desc_font, panel_rect.width - 40)
             
@@ -787,7 +787,7 @@ class MenuCardSelectionUI:
             # Draw upgrade info if available
             if 'upgrade' in passive:
                 y_offset += 15
-                upgrade_font = pygame.font.SysFont("Arial", 16)
+                upgrade_font = get_sys_font("Arial", 16)
                 upgrade_text = upgrade_font.render("Upgrade: " + passive['upgrade'].get('name', ''), True, (180, 180, 255))
                 screen.blit(upgrade_text, (panel_rect.left + 20, y_offset))
                 
@@ -809,12 +809,12 @@ class MenuCardSelectionUI:
         if 'potential_roles' in card and card['potential_roles']:
             y_offset += 20  # Add spacing
             
-            roles_font = pygame.font.SysFont("Arial", 18, bold=True)
+            roles_font = get_sys_font("Arial", 18, bold=True)
             roles_text = roles_font.render("Potential Roles:", True, (220, 180, 220))
             screen.blit(roles_text, (panel_rect.left + 20, y_offset))
             
             y_offset += 25
-            role_font = pygame.font.SysFont("Arial", 16)
+            role_font = get_sys_font("Arial", 16)
             for role in card['potential_roles']:
                 role_text = role_font.render("• " + role.capitalize(), True, (200, 160, 200))
                 screen.blit(role_text, (panel_rect.left + 40, y_offset))
@@ -828,19 +828,19 @@ class MenuCardSelectionUI:
         if 'special_ability' in card and card['special_ability']:
             ability = card['special_ability']
             
-            section_font = pygame.font.SysFont("Arial", 20, bold=True)
+            section_font = get_sys_font("Arial", 20, bold=True)
             section_text = section_font.render("Special Ability", True, (220, 220, 180))
             screen.blit(section_text, (panel_rect.left + 20, y_offset))
             
             # Draw ability name
             y_offset += 30
-            name_font = pygame.font.SysFont("Arial", 18)
+            name_font = get_sys_font("Arial", 18)
             name_text = name_font.render(ability.get('name', ''), True, (200, 200, 160))
             screen.blit(name_text, (panel_rect.left + 20, y_offset))
             
             # Draw ability description
             y_offset += 25
-            desc_font = pygame.font.SysFont("Arial", 16)
+            desc_font = get_sys_font("Arial", 16)
             description = ability.get('description', '')
             desc_lines = self._wrap_text(description, desc_font, panel_rect.width - 40)
             
@@ -851,12 +851,12 @@ class MenuCardSelectionUI:
         
         # Draw role-specific gameplay information
         y_offset += 20
-        info_font = pygame.font.SysFont("Arial", 18, bold=True)
+        info_font = get_sys_font("Arial", 18, bold=True)
         info_text = info_font.render("Victory Conditions:", True, (180, 220, 180))
         screen.blit(info_text, (panel_rect.left + 20, y_offset))
         
         y_offset += 25
-        cond_font = pygame.font.SysFont("Arial", 16)
+        cond_font = get_sys_font("Arial", 16)
         
         if card['id'] == 'protector':
             cond_text = cond_font.render("• Survive until the end of the game", True, (160, 200, 160))
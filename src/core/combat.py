@@ -78,7 +78,7 @@ class AutoCombatSystem:
         min_angle_diff = float('inf')
         
         for monster in self.game.monsters:
-            if not monster.hp > 0:
+            if not monster.alive or not monster.hp > 0:
                 continue
             
             # Vector to monster
@@ -115,6 +115,10 @@ class AutoCombatSystem:
             logger.debug(f"Auto-combat blocked attack on player {target.name}")
             return False
         
+        # Already killed this tick (not yet culled): no second kill credit
+        if isinstance(target, Monster) and not target.alive:
+            return False
+        
         # Calculate attack angle for visuals
         angle = math.atan2(
             target.position[1] - player.position[1],
@@ -146,7 +150,10 @@ class AutoCombatSystem:
         # Handle monster death
         if target.hp <= 0:
             if isinstance(target, Monster):
-                self.game.monsters.remove(target)
+                if hasattr(self.game, 'monster_system'):
+                    self.game.monster_system.kill(target)
+                else:
+                    self.game.monsters.remove(target)
                 
                 # Trigger kill effects
                 self.trigger_kill_effects(player)
@@ -183,7 +190,7 @@ class AutoCombatSystem:
         min_distance = float('inf')
         
         for monster in self.game.monsters:
-            if not monster.hp > 0:
+            if not monster.alive or not monster.hp > 0:
                 continue
             
             distance = self.distance(player.position, monster.position)
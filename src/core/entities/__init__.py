@@ -2,6 +2,7 @@
 
 from .player import Player, PlayerRole
 from .monster import Monster
+from .monster_array import MonsterArray, MonsterView
 from .boss import Boss
 from .npc import NPC
 from .skills import SkillCard, SkillType, PlayerSkill
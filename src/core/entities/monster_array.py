@@ -0,0 +1,254 @@
+# src/core/entities/monster_array.py
+
+import numpy as np
+from typing import List, Optional
+
+from .monster import Monster
+
+class MonsterArray:
+    """Structure-of-arrays monster store
+
+    Positions and stats live in contiguous NumPy arrays so movement, contact
+    damage and death culling each run as one vectorized pass. ``views`` holds
+    a thin ``MonsterView`` per row for legacy code that expects Monster objects.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.count = 0
+        self.capacity = max(1, capacity)
+        self.next_id = 1
+        self.ids = np.zeros(self.capacity, dtype=np.int64)
+        self.positions = np.zeros((self.capacity, 2), dtype=np.float64)
+        self.hp = np.zeros(self.capacity, dtype=np.float64)
+        self.max_hp = np.zeros(self.capacity, dtype=np.float64)
+        self.damage = np.zeros(self.capacity, dtype=np.float64)
+        self.speed = np.zeros(self.capacity, dtype=np.float64)
+        self.alive = np.zeros(self.capacity, dtype=bool)
+        self.is_boss = np.zeros(self.capacity, dtype=bool)
+        self.symbols: List[str] = []
+        self.views: List["MonsterView"] = []
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        """Double array capacity"""
+        new_capacity = self.capacity * 2
+        for name in ("ids", "positions", "hp", "max_hp", "damage", "speed", "alive", "is_boss"):
+            old = getattr(self, name)
+            new = np.zeros((new_capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.capacity = new_capacity
+
+    def spawn(self, symbol: str, hp: float, damage: float, position, speed: float = 1.0,
+              is_boss: bool = False) -> "MonsterView":
+        """Add a monster and return its view"""
+        if self.count == self.capacity:
+            self._grow()
+
+        i = self.count
+        self.ids[i] = self.next_id
+        self.next_id += 1
+        self.positions[i] = (position[0], position[1])
+        self.hp[i] = hp
+        self.max_hp[i] = hp
+        self.damage[i] = damage
+        self.speed[i] = speed
+        self.alive[i] = True
+        self.is_boss[i] = is_boss
+        self.symbols.append(symbol)
+
+        view = MonsterView(self, i)
+        self.views.append(view)
+        self.count += 1
+        return view
+
+    def clear(self):
+        """Remove all monsters"""
+        for view in self.views:
+            view._detach()
+        self.views.clear()
+        self.symbols.clear()
+        self.alive[:self.count] = False
+        self.count = 0
+
+    def remove(self, view: "MonsterView") -> bool:
+        """Remove a single monster (prefer marking dead and calling cull_dead)"""
+        if view._store is not self or view._index < 0:
+            return False
+        view.alive = False
+        view.hp = 0
+        self.cull_dead()
+        return True
+
+    def scale_stats(self, factor: float):
+        """Scale max_hp/damage of every monster and refill hp"""
+        n = self.count
+        self.max_hp[:n] = np.floor(self.max_hp[:n] * factor)
+        self.hp[:n] = self.max_hp[:n]
+        self.damage[:n] = np.floor(self.damage[:n] * factor)
+
+    def nearest_targets(self, target_positions: np.ndarray):
+        """Index of and squared distance to the nearest target for every monster
+
+        Args:
+            target_positions (np.ndarray): (T, 2) array of target positions
+
+        Returns:
+            tuple: (indices, dist_sq) arrays of length ``count``
+        """
+        pos = self.positions[:self.count]
+        delta = target_positions[None, :, :] - pos[:, None, :]
+        dist_sq = np.einsum('ntk,ntk->nt', delta, delta)
+        nearest = np.argmin(dist_sq, axis=1)
+        return nearest, dist_sq[np.arange(self.count), nearest]
+
+    def move_toward_nearest(self, target_positions: np.ndarray, dt: float, speed_scale: float = 50.0):
+        """Move every living monster toward its nearest target in one pass"""
+        n = self.count
+        if n == 0 or len(target_positions) == 0:
+            return
+
+        nearest, dist_sq = self.nearest_targets(target_positions)
+        delta = target_positions[nearest] - self.positions[:n]
+        dist = np.sqrt(dist_sq)
+
+        moving = self.alive[:n] & (dist > 0)
+        step = np.zeros(n, dtype=np.float64)
+        step[moving] = self.speed[:n][moving] * dt * speed_scale / dist[moving]
+        self.positions[:n] += delta * step[:, None]
+
+    def contact_damage(self, target_positions: np.ndarray, dt: float, attack_range: float) -> np.ndarray:
+        """Total damage dealt this tick to each target by monsters within range
+
+        Returns:
+            np.ndarray: (T,) damage per target
+        """
+        n = self.count
+        if n == 0 or len(target_positions) == 0:
+            return np.zeros(len(target_positions), dtype=np.float64)
+
+        delta = target_positions[None, :, :] - self.positions[:n, None, :]
+        dist_sq = np.einsum('ntk,ntk->nt', delta, delta)
+        in_range = (dist_sq < attack_range * attack_range) & self.alive[:n, None]
+        return (in_range * self.damage[:n, None]).sum(axis=0) * dt
+
+    def cull_dead(self) -> List["MonsterView"]:
+        """Compact out dead monsters, keeping row order of the survivors
+
+        Returns:
+            list: Views of the monsters that were removed (now detached)
+        """
+        n = self.count
+        keep = self.alive[:n] & (self.hp[:n] > 0)
+        if keep.all():
+            return []
+
+        removed = [view for view, k in zip(self.views, keep) if not k]
+        for view in removed:
+            view._detach()
+
+        kept_idx = np.flatnonzero(keep)
+        m = len(kept_idx)
+        for name in ("ids", "positions", "hp", "max_hp", "damage", "speed", "alive", "is_boss"):
+            arr = getattr(self, name)
+            arr[:m] = arr[kept_idx]
+        self.alive[m:n] = False
+
+        self.symbols[:] = [self.symbols[i] for i in kept_idx]
+        self.views[:] = [self.views[i] for i in kept_idx]
+        for new_index, view in enumerate(self.views):
+            view._index = new_index
+        self.count = m
+        return removed
+
+
+class MonsterView(Monster):
+    """Thin Monster facade over one row of a MonsterArray
+
+    Reads and writes go straight to the arrays; ``position`` is a live
+    NumPy row, so ``monster.position[0] += dx`` keeps working. Once the row
+    is culled the view detaches and keeps a frozen copy of its last state.
+    """
+
+    def __init__(self, store: MonsterArray, index: int):
+        self._store: Optional[MonsterArray] = store
+        self._index = index
+        self._detached = None
+
+    def _detach(self):
+        if self._store is None:
+            return
+        i, s = self._index, self._store
+        self._detached = {
+            "id": int(s.ids[i]),
+            "symbol": s.symbols[i],
+            "position": s.positions[i].copy(),
+            "hp": float(s.hp[i]),
+            "max_hp": float(s.max_hp[i]),
+            "damage": float(s.damage[i]),
+            "speed": float(s.speed[i]),
+            "alive": False,
+            "is_boss": bool(s.is_boss[i]),
+        }
+        self._store = None
+        self._index = -1
+
+    def _get(self, array_name, key, cast):
+        if self._store is None:
+            return self._detached[key]
+        return cast(getattr(self._store, array_name)[self._index])
+
+    def _set(self, array_name, key, value):
+        if self._store is None:
+            self._detached[key] = value
+        else:
+            getattr(self._store, array_name)[self._index] = value
+
+    @property
+    def id(self):
+        """Stable id, unique within the store (used for network sync)"""
+        if self._store is None:
+            return self._detached["id"]
+        return int(self._store.ids[self._index])
+
+    @property
+    def symbol(self):
+        if self._store is None:
+            return self._detached["symbol"]
+        return self._store.symbols[self._index]
+
+    @symbol.setter
+    def symbol(self, value):
+        if self._store is None:
+            self._detached["symbol"] = value
+        else:
+            self._store.symbols[self._index] = value
+
+    @property
+    def position(self):
+        if self._store is None:
+            return self._detached["position"]
+        return self._store.positions[self._index]
+
+    @position.setter
+    def position(self, value):
+        self._set("positions", "position", (value[0], value[1]))
+
+    hp = property(lambda self: self._get("hp", "hp", float),
+                  lambda self, v: self._set("hp", "hp", v))
+    max_hp = property(lambda self: self._get("max_hp", "max_hp", float),
+                      lambda self, v: self._set("max_hp", "max_hp", v))
+    damage = property(lambda self: self._get("damage", "damage", float),
+                      lambda self, v: self._set("damage", "damage", v))
+    speed = property(lambda self: self._get("speed", "speed", float),
+                     lambda self, v: self._set("speed", "speed", v))
+    alive = property(lambda self: self._get("alive", "alive", bool),
+                     lambda self, v: self._set("alive", "alive", v))
+    is_boss = property(lambda self: self._get("is_boss", "is_boss", bool),
+                       lambda self, v: self._set("is_boss", "is_boss", v))
+
+    def __repr__(self):
+        x, y = self.position
+        return f"<Monster {self.symbol} HP: {self.hp:.0f}/{self.max_hp:.0f} Pos: ({x:.1f}, {y:.1f})>"
@@ -1,8 +1,8 @@
 # src/core/entities/player.py
 
 from enum import Enum
-import random
 from typing import List, Tuple, Optional, Dict, Any
+from src.utils.rng import rng_of
 
 
 class PlayerRole(Enum):
@@ -187,10 +187,11 @@ class Player:
                 
                 # Chaos random effects
                 elif self.true_role == PlayerRole.CHAOS:
-                    if hasattr(self.role_ability, 'chaos_chance') and random.random() < self.role_ability.chaos_chance:
+                    rng = rng_of(self)
+                    if hasattr(self.role_ability, 'chaos_chance') and rng.random() < self.role_ability.chaos_chance:
                         # Add a random chaos effect
                         effects = ["slow", "stun", "burn", "heal", "silence"]
-                        chosen_effect = random.choice(effects)
+                        chosen_effect = rng.choice(effects)
                         
                         if "extra_effects" not in attack_result:
                             attack_result["extra_effects"] = {}
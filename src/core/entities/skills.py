@@ -1,7 +1,7 @@
 # src/core/entities/skills.py
 
-import random
 from enum import Enum
+from src.utils.rng import rng_of
 
 class SkillType(Enum):
     PASSIVE = "passive"
@@ -76,7 +76,7 @@ class EchoStrike(Skill):
             return None
             
         self.current_cooldown = self.cooldown
-        actual_damage = self.calculate_damage()
+        actual_damage = self.calculate_damage(user)
         
         return {
             "type": "echo_wave",
@@ -90,9 +90,9 @@ class EchoStrike(Skill):
             "description": "Tạo ra sóng âm tại vị trí mục tiêu, gây sát thương cho kẻ địch và để lại dư chấn"
         }
 
-    def calculate_damage(self):
+    def calculate_damage(self, user=None):
         """Calculate actual damage with critical hit chance"""
-        is_critical = random.random() < self.crit_rate
+        is_critical = rng_of(user).random() < self.crit_rate
         damage_multiplier = 2.0 if is_critical else 1.0
         return self.base_damage * damage_multiplier
 
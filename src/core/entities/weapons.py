@@ -1,8 +1,8 @@
 # File: src/core/entities/weapons.py
 
-import random
 import math
 from enum import Enum
+from src.utils.rng import rng_of
 
 class WeaponType(Enum):
     AREA_ATTACK = "area_attack"
@@ -81,11 +81,12 @@ class AniMines(Weapon):
         
         # Calculate positions for multiple mines
         mine_positions = [target_position]
+        rng = rng_of(user)
         if self.mine_count > 1:
             for i in range(1, self.mine_count):
                 # Calculate offset positions
-                angle = random.uniform(0, 2 * 3.14159)
-                distance = random.uniform(1, 2)
+                angle = rng.uniform(0, 2 * 3.14159)
+                distance = rng.uniform(1, 2)
                 offset_x = distance * math.cos(angle)
                 offset_y = distance * math.sin(angle)
                 mine_positions.append((target_position[0] + offset_x, target_position[1] + offset_y))
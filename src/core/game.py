@@ -2,7 +2,6 @@
 
 import pygame
 import sys
-import random
 import math
 from pathlib import Path
 from typing import Dict, Any, Optional, List
@@ -17,11 +16,16 @@ from config.settings import (
     SCREEN_WIDTH,
     SCREEN_HEIGHT,
     FPS,
-    MAX_DAYS
+    MAX_DAYS,
+    SIM_TICK_RATE,
+    MAX_FRAME_TIME,
+    DIRTY_RECT_RENDERING,
+    DIRTY_RECT_FULL_REFRESH,
+    PLAYER_MOVE_SPEED
 )
 
 # Import font utilities
-from src.utils.font_utils import get_font, render_text
+from src.utils.font_utils import get_font, preload_fonts, render_text
 
 # Import from core modules with updated paths
 from src.core.entities import Player, PlayerRole
@@ -44,6 +48,8 @@ else:
 # Import utilities
 from src.utils.logger import setup_logger
 from src.utils.ui_bridge import UIBridge
+from src.utils.dirty_rects import DirtyRectRenderer
+from src.utils.rng import new_rng
 
 # Import card generator
 from src.systems.card_generator import CardGenerator
@@ -51,7 +57,7 @@ from src.systems.card_generator import CardGenerator
 class Game:
     """Main game controller class"""
     
-    def __init__(self, game_mode="standard"):
+    def __init__(self, game_mode="standard", headless=False, seed=None, dirty_rects=None):
         # Initialize essential attributes
         self.screen = None
         self.clock = None
@@ -65,6 +71,13 @@ class Game:
         # Game mode
         self.game_mode = game_mode  # "standard" or "swarm"
         
+        # Headless mode: no window, fonts or event polling (server sims, bots)
+        self.headless = headless
+        
+        # Dirty-rect rendering: update only changed regions instead of flipping the whole screen
+        self.dirty_rects = DIRTY_RECT_RENDERING if dirty_rects is None else dirty_rects
+        self.dirty_renderer = None
+        
         # Game dimensions
         self.SCREEN_WIDTH = SCREEN_WIDTH
         self.SCREEN_HEIGHT = SCREEN_HEIGHT
@@ -72,8 +85,18 @@ class Game:
         # Initialize logger
         self.logger = setup_logger("Game")
         
-        # Setup pygame
-        self._setup_pygame()
+        # This match's own seeded RNG (handed to every system) so it can be replayed
+        self.rng, self.seed = new_rng(seed)
+        self.logger.info(f"Game seed: {self.seed}")
+        
+        # Fixed simulation timestep, independent of render frame rate
+        self.sim_dt = 1.0 / SIM_TICK_RATE
+        self.sim_accumulator = 0.0
+        self.sim_tick = 0
+        
+        # Setup pygame (skipped when running headless)
+        if not self.headless:
+            self._setup_pygame()
         
         # Game state
         self.players = []
@@ -105,11 +128,16 @@ class Game:
         pygame.display.set_caption("Shadow Echo RPG")
         self.clock = pygame.time.Clock()
 
-        # Initialize fonts with Vietnamese support
+        # Initialize fonts with Vietnamese support (warm the registry so UI screens open without disk loads)
+        preload_fonts()
         self.font = get_font(32)
         self.small_font = get_font(24)
         self.debug_font = get_font(14)
         
+        if self.dirty_rects:
+            self.dirty_renderer = DirtyRectRenderer(self.screen, DIRTY_RECT_FULL_REFRESH)
+            self.dirty_renderer.set_static_layer(self._draw_static_layer)
+        
     def _init_game_systems(self):
         """Initialize all game systems"""
         # Core systems
@@ -127,6 +155,8 @@ class Game:
             # Standard game systems
             self.auto_combat = AutoCombatSystem(self)
             self.monster_system = MonsterSystem(self)
+            # Share the live monster list so combat/skills see the same monsters
+            self.monsters = self.monster_system.monsters
             if NPCSystem:
                 self.npc_system = NPCSystem(self)
             self.card_system = CardSystem(self)
@@ -135,16 +165,19 @@ class Game:
             # Swarm mode systems
             self.skill_registry = get_skill_registry()
             self.swarm_manager = get_swarm_manager()
+            self.swarm_manager.rng = self.rng
             self.card_system = CardSystem(self, "config/cards.json")
     
-    def _add_players(self):
+    def _add_players(self, names=None):
         """Initialize players for standard mode"""
-        names = ["Alice", "Bob", "Charlie"]
-        roles = [PlayerRole.PROTECTOR, PlayerRole.TRAITOR, PlayerRole.CHAOS]
-        random.shuffle(roles)
+        names = names or ["Alice", "Bob", "Charlie"]
+        base_roles = [PlayerRole.PROTECTOR, PlayerRole.TRAITOR, PlayerRole.CHAOS]
+        roles = [base_roles[i % len(base_roles)] for i in range(len(names))]
+        self.rng.shuffle(roles)
         
         for i, name in enumerate(names):
             player = Player(id=i, name=name, role=roles[i])
+            player.rng = self.rng
             player.position = (100 + i * 100, 400)
             player.level = 1
             player.exp = 0
@@ -159,6 +192,16 @@ class Game:
                 if card_options:
                     player.cards.append(card_options[0]['id'])
     
+    def set_players(self, names):
+        """Replace the default players with one per name (server-hosted lobbies)
+        
+        Returns:
+            list: The new players, in the same order as names
+        """
+        self.players.clear()
+        self._add_players(names)
+        return self.players
+    
     def select_character(self, character_id: str, player_name: str = "Player") -> bool:
         """Select a character for the player in Swarm mode"""
         if self.game_mode != "swarm":
@@ -166,6 +209,7 @@ class Game:
             
         # Create player
         player = Player(id=0, name=player_name)
+        player.rng = self.rng
         player.is_controlled = True
         player.position = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
         
@@ -187,7 +231,8 @@ class Game:
             return
 
         # Update mouse position
-        self.mouse_pos = pygame.mouse.get_pos()
+        if not self.headless:
+            self.mouse_pos = pygame.mouse.get_pos()
 
         # Character selection phase
         if self.phase_manager.current_phase == GamePhase.CHARACTER_SELECT:
@@ -275,7 +320,7 @@ class Game:
             
     def _update_player_movement(self, dt):
         """Handle player movement controls"""
-        if self.typing_mode:
+        if self.typing_mode or self.headless:
             return
             
         if not self.players or self.current_player >= len(self.players):
@@ -286,16 +331,24 @@ class Game:
             return
             
         keys = pygame.key.get_pressed()
-        dx = dy = 0
-        speed = 200 * dt
+        move_x = move_y = 0
         
-        if keys[pygame.K_w]: dy = -speed
-        if keys[pygame.K_s]: dy = speed
-        if keys[pygame.K_a]: dx = -speed
-        if keys[pygame.K_d]: dx = speed
+        if keys[pygame.K_w]: move_y = -1
+        if keys[pygame.K_s]: move_y = 1
+        if keys[pygame.K_a]: move_x = -1
+        if keys[pygame.K_d]: move_x = 1
         
-        new_x = player.position[0] + dx
-        new_y = player.position[1] + dy
+        self.apply_movement(player, move_x, move_y, dt)
+    
+    def apply_movement(self, player, move_x, move_y, dt):
+        """Move a player by a WASD-style input (-1, 0 or 1 per axis) for one step
+        
+        Shared by local input and server-side commands so both move players
+        identically.
+        """
+        speed = PLAYER_MOVE_SPEED * dt
+        new_x = player.position[0] + move_x * speed
+        new_y = player.position[1] + move_y * speed
         
         # Keep within bounds
         if 20 <= new_x <= self.SCREEN_WIDTH - 20:
@@ -305,6 +358,16 @@ class Game:
             
     def draw(self):
         """Render all game elements"""
+        if self.headless:
+            return
+            
+        # Only changed regions are pushed while nothing covers the playfield
+        if self.dirty_renderer and self._can_draw_dirty():
+            self._draw_dirty()
+            return
+        if self.dirty_renderer:
+            self.dirty_renderer.invalidate()
+            
         # Clear screen
         self.screen.fill((20, 20, 30))
         
@@ -335,6 +398,82 @@ class Game:
             
         pygame.display.flip()
     
+    def _draw_static_layer(self, surface):
+        """Draw the parts of the frame that never change (background, panel frames)"""
+        surface.fill((20, 20, 30))
+        pygame.draw.rect(surface, (40, 40, 60), (0, self.SCREEN_HEIGHT - 100, self.SCREEN_WIDTH, 100))
+    
+    def _can_draw_dirty(self):
+        """Dirty-rect drawing only covers the playfield, not full-screen overlays"""
+        # Compare by name: standard mode uses phase_manager's own GamePhase enum
+        if self.phase_manager.current_phase.name in ("CHARACTER_SELECT", "GAME_OVER", "SKILL_SELECT", "END"):
+            return False
+        return self.phase_manager.card_selection_ui is None
+    
+    def _draw_dirty(self):
+        """Redraw the frame over the cached static layer and update only changed regions"""
+        renderer = self.dirty_renderer
+        renderer.begin_frame()
+        
+        if self.game_mode == "swarm":
+            self._draw_swarm_mode()
+        else:
+            self._draw_standard_mode()
+        self._draw_ui()
+        if self.debug_mode:
+            self._draw_debug_overlay()
+        
+        renderer.mark(self._get_dirty_rects())
+        renderer.present()
+    
+    def _get_dirty_rects(self):
+        """Screen regions drawn this frame, as reported by each system"""
+        # HUD: phase/day text and the bottom panel change every frame
+        rects = [
+            pygame.Rect(0, 0, self.SCREEN_WIDTH // 4, 60 + self.font.get_linesize()),
+            pygame.Rect(0, self.SCREEN_HEIGHT - 100, self.SCREEN_WIDTH, 100),
+        ]
+        if self.debug_mode:
+            rects.append(pygame.Rect(self.SCREEN_WIDTH - 200, 0, 200, self.SCREEN_HEIGHT))
+        
+        if self.game_mode == "swarm":
+            rects.extend(self._get_clue_dirty_rects())
+        else:
+            rects.extend(self.monster_system.get_dirty_rects())
+            if hasattr(self, 'auto_combat'):
+                rects.extend(self.auto_combat.get_dirty_rects())
+            if hasattr(self, 'npc_system'):
+                rects.extend(self.npc_system.get_dirty_rects())
+        
+        rects.extend(self._get_player_dirty_rects())
+        return rects
+    
+    def _get_player_dirty_rects(self):
+        """Rects covering each player's box, labels, health and cooldown bars"""
+        rects = []
+        for player in self.players:
+            if player.is_alive:
+                x, y = int(player.position[0]), int(player.position[1])
+                name_text = render_text(self.small_font, f"{player.name} Lv.{player.level}", (255, 255, 255))
+                rects.append(pygame.Rect(x - 30, y - 30, max(60, name_text.get_width()),
+                                         45 + name_text.get_height()))
+        return rects
+    
+    def _get_clue_dirty_rects(self):
+        """Rects covering uncollected clues and their examine hints"""
+        if not hasattr(self, 'swarm_manager'):
+            return []
+        
+        hint_width = self.small_font.size("Press E to examine")[0]
+        rects = []
+        for clue in self.swarm_manager.clues:
+            if clue.get("collected", False):
+                continue
+            x, y = clue.get("position", (0, 0))
+            half = max(self.font.get_linesize(), hint_width // 2)
+            rects.append(pygame.Rect(int(x) - half, int(y) - half, half * 2, half + 20 + self.small_font.get_linesize()))
+        return rects
+    
     def _draw_standard_mode(self):
         """Draw standard game mode elements"""
         # Draw monsters
@@ -368,7 +507,7 @@ class Game:
     def _draw_character_select(self):
         """Draw character selection screen"""
         # Draw title
-        title_text = self.font.render("Select Your Character", True, (255, 255, 255))
+        title_text = render_text(self.font, "Select Your Character", (255, 255, 255))
         self.screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, 50))
         
         # Get available characters
@@ -391,28 +530,28 @@ class Game:
             pygame.draw.rect(self.screen, (80, 80, 100), (x, y, card_width, card_height), 2)
             
             # Draw character name
-            name_text = self.font.render(character["name"], True, (255, 255, 255))
+            name_text = render_text(self.font, character["name"], (255, 255, 255))
             self.screen.blit(name_text, (x + card_width // 2 - name_text.get_width() // 2, y + 20))
             
             # Draw character description
             desc_lines = self._wrap_text(character["description"], self.small_font, card_width - 20)
             for j, line in enumerate(desc_lines):
-                desc_text = self.small_font.render(line, True, (200, 200, 200))
+                desc_text = render_text(self.small_font, line, (200, 200, 200))
                 self.screen.blit(desc_text, (x + 10, y + 70 + j * 25))
             
             # Draw passive skill info
             if "passive_skill" in character:
                 skill = character["passive_skill"]
-                skill_text = self.small_font.render(skill["name"], True, (255, 255, 0))
+                skill_text = render_text(self.small_font, skill["name"], (255, 255, 0))
                 self.screen.blit(skill_text, (x + 10, y + 180))
                 
                 skill_desc_lines = self._wrap_text(skill["description"], self.small_font, card_width - 20)
                 for j, line in enumerate(skill_desc_lines):
-                    desc_text = self.small_font.render(line, True, (180, 180, 100))
+                    desc_text = render_text(self.small_font, line, (180, 180, 100))
                     self.screen.blit(desc_text, (x + 10, y + 210 + j * 25))
             
             # Draw selection number
-            select_text = self.font.render(str(i+1), True, (255, 255, 0))
+            select_text = render_text(self.font, str(i+1), (255, 255, 0))
             self.screen.blit(select_text, (x + 10, y + 10))
     
     def _draw_game_over(self):
@@ -423,7 +562,7 @@ class Game:
         self.screen.blit(overlay, (0, 0))
         
         # Draw game over title
-        title_text = self.font.render("Game Over", True, (255, 255, 255))
+        title_text = render_text(self.font, "Game Over", (255, 255, 255))
         self.screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, SCREEN_HEIGHT // 3))
         
         # Draw winner info if available
@@ -432,17 +571,17 @@ class Game:
             message = self.victory_status.get("message", "")
             
             if winner:
-                winner_text = self.font.render(f"Winner: {winner}", True, (255, 255, 0))
+                winner_text = render_text(self.font, f"Winner: {winner}", (255, 255, 0))
                 self.screen.blit(winner_text, (SCREEN_WIDTH // 2 - winner_text.get_width() // 2, SCREEN_HEIGHT // 2))
             
             if message:
                 message_lines = self._wrap_text(message, self.small_font, SCREEN_WIDTH - 200)
                 for i, line in enumerate(message_lines):
-                    line_text = self.small_font.render(line, True, (200, 200, 200))
+                    line_text = render_text(self.small_font, line, (200, 200, 200))
                     self.screen.blit(line_text, (SCREEN_WIDTH // 2 - line_text.get_width() // 2, SCREEN_HEIGHT // 2 + 60 + i * 30))
         
         # Draw restart instructions
-        restart_text = self.small_font.render("Press ENTER to restart or ESC to quit", True, (150, 150, 150))
+        restart_text = render_text(self.small_font, "Press ENTER to restart or ESC to quit", (150, 150, 150))
         self.screen.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, SCREEN_HEIGHT * 3 // 4))
     
     def _draw_clues(self):
@@ -472,7 +611,7 @@ class Game:
                 symbol = "🔮"
             
             # Draw clue
-            clue_text = self.font.render(symbol, True, color)
+            clue_text = render_text(self.font, symbol, color)
             self.screen.blit(clue_text, (pos[0] - clue_text.get_width() // 2, pos[1] - clue_text.get_height() // 2))
             
             # If player is nearby, show hint
@@ -480,7 +619,7 @@ class Game:
             if player:
                 distance = ((player.position[0] - pos[0]) ** 2 + (player.position[1] - pos[1]) ** 2) ** 0.5
                 if distance < 100:
-                    hint_text = self.small_font.render("Press E to examine", True, (200, 200, 200))
+                    hint_text = render_text(self.small_font, "Press E to examine", (200, 200, 200))
                     self.screen.blit(hint_text, (pos[0] - hint_text.get_width() // 2, pos[1] + 20))
         
     def _draw_players(self, show_roles=True):
@@ -514,8 +653,8 @@ class Game:
                                (int(player.position[0])-10, int(player.position[1])-10, 20, 20))
                 
                 # Draw name and level
-                name_text = self.small_font.render(
-                    f"{player.name} Lv.{player.level}", True, (255, 255, 255)
+                name_text = render_text(self.small_font,
+                    f"{player.name} Lv.{player.level}", (255, 255, 255)
                 )
                 self.screen.blit(name_text, (int(player.position[0])-30, int(player.position[1])+15))
                 
@@ -525,7 +664,7 @@ class Game:
                     role_display = player.role.value
                 
                 if player.is_controlled:
-                    role_text = self.small_font.render(role_display, True, (255, 255, 255))
+                    role_text = render_text(self.small_font, role_display, (255, 255, 255))
                     self.screen.blit(role_text, (int(player.position[0])-30, int(player.position[1])-30))
                 
                 # Draw health bar
@@ -551,11 +690,11 @@ class Game:
         elif self.phase_manager.current_phase in [GamePhase.SWARM_DAY, GamePhase.SWARM_PREPARATION]:
             phase_color = (255, 200, 0)
             
-        phase_text = self.font.render(phase_name, True, phase_color)
+        phase_text = render_text(self.font, phase_name, phase_color)
         self.screen.blit(phase_text, (20, 20))
         
         # Draw day count
-        day_text = self.font.render(f"Day {self.phase_manager.day_count}/{MAX_DAYS}", True, (255, 255, 255))
+        day_text = render_text(self.font, f"Day {self.phase_manager.day_count}/{MAX_DAYS}", (255, 255, 255))
         self.screen.blit(day_text, (20, 60))
         
         # Draw bottom UI panel
@@ -565,9 +704,10 @@ class Game:
         if self.players and self.current_player < len(self.players):
             player = self.players[self.current_player]
             role_display = player.role.value if player.known_role else "?"
-            player_info = self.small_font.render(
+            player_info = render_text(
+                self.small_font,
                 f"{player.name} ({role_display}) - HP: {int(player.hp)}/{int(player.max_hp)} - Level: {player.level} - EXP: {player.exp}/{player.level * 100}",
-                True, (255, 255, 255)
+                (255, 255, 255)
             )
             self.screen.blit(player_info, (20, self.SCREEN_HEIGHT - 90))
             
@@ -577,18 +717,19 @@ class Game:
             # Draw role ability description if role is known in swarm mode
             if self.game_mode == "swarm" and player.known_role and hasattr(player, 'role_ability'):
                 role_ability = player.role_ability
-                ability_text = self.small_font.render(
+                ability_text = render_text(
+                    self.small_font,
                     f"Role Ability: {role_ability.name} - {role_ability.description[:40]}...",
-                    True, (200, 200, 100)
+                    (200, 200, 100)
                 )
                 self.screen.blit(ability_text, (20, self.SCREEN_HEIGHT - 50))
         
         # Draw command prompt if in typing mode
         if self.typing_mode:
-            prompt_text = self.small_font.render(f"Command: {self.command_input}_", True, (255, 255, 255))
+            prompt_text = render_text(self.small_font, f"Command: {self.command_input}_", (255, 255, 255))
             self.screen.blit(prompt_text, (20, self.SCREEN_HEIGHT - 30))
         elif self.game_mode == "standard":
-            help_text = self.small_font.render("Press T to enter commands", True, (200, 200, 200))
+            help_text = render_text(self.small_font, "Press T to enter commands", (200, 200, 200))
             self.screen.blit(help_text, (20, self.SCREEN_HEIGHT - 30))
             
     def _draw_cards(self):
@@ -609,16 +750,16 @@ class Game:
                 if hasattr(weapon, 'name'):
                     name_parts = weapon.name.split(' ')
                     short_name = name_parts[0][:3] + "." if len(name_parts[0]) > 3 else name_parts[0]
-                    name_text = self.small_font.render(short_name, True, (255, 255, 255))
+                    name_text = render_text(self.small_font, short_name, (255, 255, 255))
                     self.screen.blit(name_text, (weapon_x + i * 80 + 5, self.SCREEN_HEIGHT - 75))
                 
                 # Draw weapon level
                 if hasattr(weapon, 'level'):
-                    level_text = self.small_font.render(f"Lv{weapon.level}", True, (255, 255, 0))
+                    level_text = render_text(self.small_font, f"Lv{weapon.level}", (255, 255, 0))
                     self.screen.blit(level_text, (weapon_x + i * 80 + 5, self.SCREEN_HEIGHT - 55))
                 
                 # Draw number key
-                key_text = self.small_font.render(str(i+1), True, (255, 255, 0))
+                key_text = render_text(self.small_font, str(i+1), (255, 255, 0))
                 self.screen.blit(key_text, (weapon_x + i * 80 + 5, self.SCREEN_HEIGHT - 90))
         
         # Standard mode: Draw cards
@@ -631,11 +772,11 @@ class Game:
                     pygame.draw.rect(self.screen, (60, 60, 80), (card_x + i * 80, self.SCREEN_HEIGHT - 90, 70, 60))
                     
                     # Draw card symbol
-                    symbol_text = self.font.render(card_info.get("symbol", "?"), True, (255, 255, 255))
+                    symbol_text = render_text(self.font, card_info.get("symbol", "?"), (255, 255, 255))
                     self.screen.blit(symbol_text, (card_x + i * 80 + 25, self.SCREEN_HEIGHT - 75))
                     
                     # Draw number key
-                    key_text = self.small_font.render(str(i+1), True, (255, 255, 0))
+                    key_text = render_text(self.small_font, str(i+1), (255, 255, 0))
                     self.screen.blit(key_text, (card_x + i * 80 + 5, self.SCREEN_HEIGHT - 85))
     
     def _draw_debug_overlay(self):
@@ -675,7 +816,7 @@ class Game:
         
         y = 10
         for info in debug_info:
-            text = self.debug_font.render(info, True, (255, 255, 0))
+            text = render_text(self.debug_font, info, (255, 255, 0))
             self.screen.blit(text, (self.SCREEN_WIDTH - 200, y))
             y += 20
     
@@ -723,6 +864,15 @@ class Game:
             
         return False
     
+    def _auto_select_character(self):
+        """Select a random (seeded) character; used by headless runs"""
+        if not hasattr(self, 'skill_registry'):
+            return False
+        characters = sorted(self.skill_registry.characters.keys())
+        if not characters:
+            return False
+        return self.select_character(self.rng.choice(characters))
+    
     def _restart_game(self):
         """Restart the game with the same mode"""
         # Reset game state
@@ -1042,7 +1192,7 @@ class Game:
         """Main game loop"""
         try:
             while self.game_running:
-                dt = self.clock.tick(FPS) / 1000.0
+                frame_dt = self.clock.tick(FPS) / 1000.0
                 
                 # Handle events
                 for event in pygame.event.get():
@@ -1051,8 +1201,8 @@ class Game:
                     else:
                         self.handle_event(event)
                 
-                # Update and draw
-                self.update(dt)
+                # Run as many fixed simulation ticks as the frame time covers
+                self.advance(frame_dt)
                 self.draw()
                 
         except Exception as e:
@@ -1061,4 +1211,66 @@ class Game:
             traceback.print_exc()
         finally:
             pygame.quit()
-            sys.exit()
\ No newline at end of file
+            sys.exit()
+    
+    def tick(self):
+        """Run exactly one fixed simulation step"""
+        self.update(self.sim_dt)
+        self.sim_tick += 1
+    
+    def advance(self, frame_dt):
+        """Feed wall-clock frame time into the fixed-timestep accumulator
+        
+        Args:
+            frame_dt (float): Real seconds since the last frame
+            
+        Returns:
+            int: Number of simulation ticks that were run
+        """
+        # Clamp long frames (window drag, breakpoints) to avoid a spiral of death
+        self.sim_accumulator += min(frame_dt, MAX_FRAME_TIME)
+        
+        ticks = 0
+        while self.sim_accumulator >= self.sim_dt:
+            self.tick()
+            self.sim_accumulator -= self.sim_dt
+            ticks += 1
+        return ticks
+    
+    def run_headless(self, max_steps=None):
+        """Step the simulation as fast as possible without rendering
+        
+        Every step is one fixed tick of ``sim_dt`` seconds, so a given seed
+        always produces the same match.
+        
+        Args:
+            max_steps (int): Stop after this many steps (None = until game over)
+            
+        Returns:
+            dict: Summary of the finished simulation
+        """
+        steps = 0
+        while self.game_running:
+            if max_steps is not None and steps >= max_steps:
+                break
+            if self.phase_manager.is_end_phase() or self.phase_manager.current_phase == GamePhase.GAME_OVER:
+                break
+            # Swarm mode needs a character before there is anything to simulate:
+            # pick one from the seeded RNG so the run stays reproducible
+            if self.phase_manager.current_phase == GamePhase.CHARACTER_SELECT:
+                if not self._auto_select_character():
+                    break
+                continue
+                
+            self.tick()
+            steps += 1
+            
+        return {
+            "seed": self.seed,
+            "steps": steps,
+            "sim_time": steps * self.sim_dt,
+            "day": self.phase_manager.day_count,
+            "phase": self.phase_manager.current_phase.value,
+            "survivors": [p.name for p in self.players if p.is_alive],
+            "victory_status": getattr(self, 'victory_status', None)
+        }
\ No newline at end of file
@@ -6,6 +6,8 @@ import time
 import json
 
 from src.core.entities import Player, NPC, Monster, Boss, PlayerRole
+from src.utils.font_utils import get_sys_font
+from src.ui.streaming_text import StreamingTextBox
 from src.systems.memory_system import MemorySystem
 from src.systems.card_generator_enhanced import EnhancedCardGenerator
 from src.systems.dialogue_system import DialogueSystem
@@ -22,8 +24,8 @@ class GameManager:
         self.clock = pygame.time.Clock()
         
         # Thiết lập font
-        self.font = pygame.font.SysFont("Arial", 24)
-        self.small_font = pygame.font.SysFont("Arial", 16)
+        self.font = get_sys_font("Arial", 24)
+        self.small_font = get_sys_font("Arial", 16)
         
         # Trạng thái game
         self.running = True
@@ -37,6 +39,7 @@ class GameManager:
         self.real_player = None  # Người chơi thật (do người dùng điều khiển)
         self.npcs = []           # Danh sách NPC
         self.monsters = []       # Danh sách quái vật
+        self.dialogue_boxes: Dict[str, StreamingTextBox] = {}  # Bong bóng thoại đang hiện theo NPC
         
         # Thiết lập hệ thống
         self.memory_system = MemorySystem(self)
@@ -147,6 +150,19 @@ class GameManager:
         
         # Cập nhật hệ thống event
         self.event_generator.update()
+        
+        # Nhận phản hồi NPC từ luồng nền (không chặn)
+        for npc, reply in self.dialogue_system.update(on_stream=self._on_dialogue_stream):
+            print(f"[{npc.name}]: {reply}")
+    
+    def _on_dialogue_stream(self, npc_id, piece, new_reply):
+        """Nối đoạn phản hồi vừa stream về vào bong bóng thoại của NPC"""
+        box = self.dialogue_boxes.get(npc_id)
+        if box is None:
+            box = self.dialogue_boxes[npc_id] = StreamingTextBox(self.small_font, 280, (230, 230, 200), max_lines=5)
+        if new_reply:
+            box.clear()
+        box.append(piece)
     
     def _update_player_movement(self, dt):
         """Cập nhật di chuyển người chơi"""
@@ -244,6 +260,14 @@ class GameManager:
         # Vẽ trợ giúp điều khiển
         controls_text = self.small_font.render("W/A/S/D: Di chuyển | E: Tương tác | K: Giết | TAB: Nhật ký", True, (200, 200, 200))
         self.screen.blit(controls_text, (20, 680))
+        
+        # Vẽ bong bóng thoại (chỉ dòng cuối được vẽ lại khi có đoạn mới)
+        for npc in self.npcs:
+            box = self.dialogue_boxes.get(npc.npc_id)
+            if box and npc.alive:
+                x = int(npc.position[0]) - box.max_width // 2
+                y = int(npc.position[1]) - 20 - box.height
+                box.draw(self.screen, (x, y))
     
     def _handle_kill_attempt(self):
         """Xử lý khi người chơi cố gắng giết ai đó"""
@@ -349,6 +373,7 @@ class GameManager:
         """Bắt đầu hội thoại với NPC"""
         greeting = self.dialogue_system.start_conversation(self.real_player, npc.npc_id)
         print(f"[{npc.name}]: {greeting}")
+        self._on_dialogue_stream(npc.npc_id, greeting, True)
         
         # TODO: Hiển thị UI hội thoại
     
@@ -2,13 +2,18 @@ import pygame
 import math
 import random
 from typing import List, Tuple, Dict, Any, Optional
+from config.settings import PARTICLE_POOL_CAPACITY
 from ..core.entities import Player, Monster
+from ..core.particles import ParticlePool
+from ..utils.sprite_cache import RotationCache, StampCache
 
 class GameplayEnhancements:
     def __init__(self, game):
         self.game = game
         self.attack_effects = []
-        self.impact_effects = []
+        self.particles = ParticlePool(PARTICLE_POOL_CAPACITY)  # Hiệu ứng va chạm / hạt
+        self.stamps = StampCache()  # Surface dựng sẵn cho hạt và hình kỹ năng
+        self.rotated_sprites = RotationCache()  # Surface đã xoay sẵn cho đòn đánh, tia, đạn
         self.skill_effects = []  # Danh sách lưu trữ hiệu ứng kỹ năng
         self.last_attack_time = 0
         self.attack_cooldown = 0.3
@@ -153,45 +158,41 @@ class GameplayEnhancements:
         self.attack_effects.append(effect)
 
     def create_impact_effect(self, position: Tuple[float, float], color=None, max_radius=20, lifetime=0.15):
-        effect = {
-            'pos': list(position),
-            'radius': 0,
-            'max_radius': max_radius,
-            'lifetime': lifetime,
-            'current_time': 0.0,
-            'color': color or (255, 100, 100)
-        }
-        self.impact_effects.append(effect)
+        self.particles.emit(position, color or (255, 100, 100), max_radius, lifetime)
+
+    def _expire_effects(self, effects: List[Dict[str, Any]]):
+        """Xóa hiệu ứng hết thời gian bằng swap-remove (không dùng list.remove)"""
+        i = 0
+        while i < len(effects):
+            effect = effects[i]
+            if effect['current_time'] >= effect['lifetime']:
+                effects[i] = effects[-1]
+                effects.pop()
+            else:
+                i += 1
 
     def update_visual_effects(self, dt: float):
         # Cập nhật hiệu ứng tấn công
-        for effect in self.attack_effects[:]:
+        for effect in self.attack_effects:
             effect['current_time'] += dt
-            if effect['current_time'] >= effect['lifetime']:
-                self.attack_effects.remove(effect)
+        self._expire_effects(self.attack_effects)
 
         # Cập nhật hiệu ứng va chạm
-        for effect in self.impact_effects[:]:
-            effect['current_time'] += dt
-            progress = effect['current_time'] / effect['lifetime']
-            effect['radius'] = effect['max_radius'] * progress
-            if effect['current_time'] >= effect['lifetime']:
-                self.impact_effects.remove(effect)
+        self.particles.update(dt)
 
         # Cập nhật hiệu ứng kỹ năng
-        for effect in self.skill_effects[:]:
+        for effect in self.skill_effects:
             effect['current_time'] += dt
+            progress = effect['current_time'] / effect['lifetime']
 
             # Cập nhật các thuộc tính dựa trên loại hiệu ứng
             if effect['type'] == 'aoe_circle':
                 # Hiệu ứng hình tròn mở rộng
-                progress = effect['current_time'] / effect['lifetime']
                 effect['radius'] = effect['max_radius'] * min(progress * 2, 1.0)  # Mở rộng nhanh sau đó giữ nguyên
                 effect['opacity'] = int(255 * (1 - progress))  # Mờ dần theo thời gian
 
             elif effect['type'] == 'projectile':
                 # Hiệu ứng đạn bay
-                progress = effect['current_time'] / effect['lifetime']
                 effect['pos'][0] += effect['speed'] * math.cos(effect['direction']) * dt
                 effect['pos'][1] += effect['speed'] * math.sin(effect['direction']) * dt
 
@@ -214,93 +215,43 @@ class GameplayEnhancements:
 
             elif effect['type'] == 'beam':
                 # Hiệu ứng tia sáng kéo dài
-                progress = effect['current_time'] / effect['lifetime']
                 effect['width'] = effect['max_width'] * (1 - progress * 0.5)
                 effect['length'] = effect['max_length'] * min(progress * 3, 1.0)  # Kéo dài nhanh sau đó giữ nguyên
                 effect['opacity'] = int(255 * (1 - progress))
 
-            # Xóa hiệu ứng khi hết thời gian
-            if effect['current_time'] >= effect['lifetime']:
-                self.skill_effects.remove(effect)
+        # Xóa hiệu ứng khi hết thời gian
+        self._expire_effects(self.skill_effects)
 
     def draw_visual_effects(self):
         # Vẽ hiệu ứng tấn công
         for effect in self.attack_effects:
             progress = effect['current_time'] / effect['lifetime']
             alpha = int(255 * (1 - progress))
-            surf = pygame.Surface((2 * effect['range'], effect['width']), pygame.SRCALPHA)
-            end_x = effect['range'] * math.cos(effect['direction'])
-            end_y = effect['range'] * math.sin(effect['direction'])
-            color = (*effect['color'], alpha)
-            pygame.draw.line(surf, color, (0, effect['width']//2), (end_x, end_y + effect['width']//2), effect['width'])
-            rotated = pygame.transform.rotate(surf, -math.degrees(effect['direction']))
-            rect = rotated.get_rect(center=effect['pos'])
-            self.game.screen.blit(rotated, rect)
+            self.rotated_sprites.blit(self.game.screen, 'attack', (effect['range'], effect['width']),
+                                      effect['color'], effect['pos'], effect['direction'], alpha)
 
         # Vẽ hiệu ứng va chạm
-        for effect in self.impact_effects:
-            alpha = int(200 * (1 - effect['current_time'] / effect['lifetime']))
-            color = (*effect['color'], alpha)
-            surf = pygame.Surface((effect['radius'] * 2, effect['radius'] * 2), pygame.SRCALPHA)
-            pygame.draw.circle(surf, color, (effect['radius'], effect['radius']), effect['radius'])
-            rect = surf.get_rect(center=effect['pos'])
-            self.game.screen.blit(surf, rect)
+        self.particles.draw(self.game.screen, self.stamps)
 
         # Vẽ hiệu ứng kỹ năng
         for effect in self.skill_effects:
             if effect['type'] == 'aoe_circle':
-                # Vẽ hiệu ứng vòng tròn AOE
+                # Vẽ hiệu ứng vòng tròn AOE (vòng tròn đầy + đường viền, dựng sẵn)
                 alpha = effect.get('opacity', 200)
-                color = (*effect['color'], alpha)
-
-                # Tạo surface trong suốt kích thước phù hợp với bán kính
-                surf = pygame.Surface((effect['radius'] * 2, effect['radius'] * 2), pygame.SRCALPHA)
-
-                # Vẽ vòng tròn đầy
-                pygame.draw.circle(surf, color, (effect['radius'], effect['radius']), effect['radius'])
-
-                # Vẽ đường viền
-                border_color = (*effect['color'], min(255, alpha + 50))
-                pygame.draw.circle(surf, border_color, (effect['radius'], effect['radius']), effect['radius'], 3)
-
-                # Hiển thị lên màn hình
-                rect = surf.get_rect(center=effect['pos'])
-                self.game.screen.blit(surf, rect)
+                self.stamps.blit(self.game.screen, 'aoe', effect['radius'], effect['color'], effect['pos'], alpha)
 
             elif effect['type'] == 'projectile':
                 # Vẽ hiệu ứng đạn bay
                 alpha = int(255 * (1 - effect['current_time'] / effect['lifetime']))
-                color = (*effect['color'], alpha)
+                shape = effect.get('projectile_shape', 'circle')
 
-                # Tạo surface trong suốt
-                surf = pygame.Surface((effect['size'] * 2, effect['size'] * 2), pygame.SRCALPHA)
-
-                # Vẽ hình dạng của đạn
-                if effect.get('projectile_shape', 'circle') == 'circle':
-                    pygame.draw.circle(surf, color, (effect['size'], effect['size']), effect['size'])
-                elif effect.get('projectile_shape', 'circle') == 'triangle':
-                    points = [
-                        (effect['size'], 0),
-                        (0, effect['size'] * 2),
-                        (effect['size'] * 2, effect['size'] * 2)
-                    ]
-                    pygame.draw.polygon(surf, color, points)
-                elif effect.get('projectile_shape', 'circle') == 'star':
-                    # Vẽ sao 5 cánh
-                    points = []
-                    for i in range(10):
-                        angle = math.pi * 2 * i / 10
-                        radius = effect['size'] if i % 2 == 0 else effect['size'] / 2
-                        points.append((
-                            effect['size'] + radius * math.cos(angle),
-                            effect['size'] + radius * math.sin(angle)
-                        ))
-                    pygame.draw.polygon(surf, color, points)
-
-                # Xoay surface theo hướng chuyển động
-                rotated = pygame.transform.rotate(surf, -math.degrees(effect['direction']) - 90)
-                rect = rotated.get_rect(center=effect['pos'])
-                self.game.screen.blit(rotated, rect)
+                # Hình tròn không cần xoay
+                if shape == 'circle':
+                    self.stamps.blit(self.game.screen, shape, effect['size'], effect['color'], effect['pos'], alpha)
+                else:
+                    # Hình đã xoay sẵn theo hướng chuyển động
+                    self.rotated_sprites.blit(self.game.screen, shape, (effect['size'],), effect['color'],
+                                              effect['pos'], effect['direction'], alpha)
 
             elif effect['type'] == 'buff':
                 # Vẽ hiệu ứng buff
@@ -328,27 +279,11 @@ class GameplayEnhancements:
                 self.game.screen.blit(surf, rect)
 
             elif effect['type'] == 'beam':
-                # Vẽ hiệu ứng tia
+                # Vẽ hiệu ứng tia (có gradient, đã xoay sẵn theo hướng), cắt theo độ dài hiện tại
                 alpha = effect.get('opacity', 200)
-                color = (*effect['color'], alpha)
-
-                # Tạo surface trong suốt
-                length = effect['length']
-                width = effect['width']
-                surf = pygame.Surface((length, width), pygame.SRCALPHA)
-
-                # Vẽ tia thẳng
-                pygame.draw.line(surf, color, (0, width//2), (length, width//2), width)
-
-                # Thêm hiệu ứng gradient
-                for i in range(5):
-                    gradient_color = (*effect['color'], alpha * (5-i) / 5)
-                    pygame.draw.line(surf, gradient_color, (0, width//2), (length, width//2), max(1, width - i*2))
-
-                # Xoay surface theo hướng
-                rotated = pygame.transform.rotate(surf, -math.degrees(effect['direction']))
-                rect = rotated.get_rect(center=effect['pos'])
-                self.game.screen.blit(rotated, rect)
+                self.rotated_sprites.blit_beam(self.game.screen, effect['max_length'], effect['width'],
+                                               effect['color'], effect['pos'], effect['direction'],
+                                               effect['length'], alpha)
 
     def create_skill_effect(self, source_position, target_position, effect_type, skill_name=None):
         """Tạo hiệu ứng trực quan cho kỹ năng
@@ -502,7 +437,11 @@ class GameplayEnhancements:
         angle = math.atan2(dy, dx)
         attack_range = 70
         self.create_attack_effect(tuple(player.position), angle, attack_range)
+        killed = []
         for monster in self.game.monsters[:]:
+            if not monster.alive:
+                # Killed earlier this tick, not yet culled
+                continue
             dx = monster.position[0] - player.position[0]
             dy = monster.position[1] - player.position[1]
             distance = math.sqrt(dx**2 + dy**2)
@@ -513,5 +452,10 @@ class GameplayEnhancements:
                     monster.hp -= 30
                     self.create_impact_effect(tuple(monster.position))
                     if monster.hp <= 0:
-                        self.game.monsters.remove(monster)
+                        if hasattr(self.game, 'monster_system'):
+                            killed.append(monster)
+                        else:
+                            self.game.monsters.remove(monster)
                         player.add_exp(50)
+        if killed:
+            self.game.monster_system.kill(*killed)
@@ -0,0 +1,85 @@
+# src/core/particles.py
+
+import numpy as np
+
+class ParticlePool:
+    """Fixed-capacity pool of short-lived circular particles
+
+    State lives in preallocated NumPy arrays. Live particles are packed into
+    rows ``[0, count)`` and rows ``[count, capacity)`` are the free list, so
+    emitting reuses the first free row and expiry swap-removes: the freed
+    rows are refilled with the live rows from the end of the array. Nothing
+    is allocated per particle.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = max(1, capacity)
+        self.count = 0
+        self.dropped = 0
+        self.positions = np.zeros((self.capacity, 2), dtype=np.float64)
+        self.age = np.zeros(self.capacity, dtype=np.float64)
+        self.lifetime = np.ones(self.capacity, dtype=np.float64)
+        self.max_radius = np.zeros(self.capacity, dtype=np.float64)
+        self.start_alpha = np.zeros(self.capacity, dtype=np.float64)
+        self.colors = np.zeros((self.capacity, 3), dtype=np.uint8)
+
+    def __len__(self):
+        return self.count
+
+    def emit(self, position, color, max_radius: float, lifetime: float, start_alpha: float = 200) -> bool:
+        """Spawn a particle that grows to max_radius while fading out
+
+        Returns:
+            bool: False if the pool was full and the particle was dropped
+        """
+        if self.count == self.capacity:
+            self.dropped += 1
+            return False
+
+        i = self.count
+        self.positions[i] = (position[0], position[1])
+        self.age[i] = 0.0
+        self.lifetime[i] = max(lifetime, 1e-6)
+        self.max_radius[i] = max_radius
+        self.start_alpha[i] = start_alpha
+        self.colors[i] = color[:3]
+        self.count += 1
+        return True
+
+    def update(self, dt: float):
+        """Age every particle and swap-remove the expired ones"""
+        n = self.count
+        if n == 0:
+            return
+
+        self.age[:n] += dt
+        expired = self.age[:n] >= self.lifetime[:n]
+        dead = int(expired.sum())
+        if dead == 0:
+            return
+
+        m = n - dead
+        # Holes below the new count are refilled by survivors from the tail
+        holes = np.flatnonzero(expired[:m])
+        fillers = m + np.flatnonzero(~expired[m:n])
+        if len(holes):
+            for arr in (self.positions, self.age, self.lifetime, self.max_radius, self.start_alpha, self.colors):
+                arr[holes] = arr[fillers]
+        self.count = m
+
+    def clear(self):
+        """Release every particle"""
+        self.count = 0
+
+    def draw(self, screen, stamps):
+        """Blit every live particle using pre-rendered circle stamps"""
+        n = self.count
+        if n == 0:
+            return
+
+        progress = self.age[:n] / self.lifetime[:n]
+        radii = self.max_radius[:n] * progress
+        alphas = (self.start_alpha[:n] * (1 - progress)).astype(np.int32)
+        for pos, radius, alpha, color in zip(self.positions[:n].tolist(), radii.tolist(),
+                                             alphas.tolist(), self.colors[:n].tolist()):
+            stamps.blit(screen, 'circle', radius, color, pos, alpha)
@@ -4,13 +4,14 @@ import os
 import sys
 import pygame
 import math
-import random
 from pathlib import Path
 from enum import Enum
 from typing import Optional, List
 
 # Sửa lại đường dẫn import
 from .entities.player import PlayerRole
+from ..utils.rng import rng_of
+from ..utils.font_utils import get_sys_font
 
 class GamePhase(Enum):
     PREPARATION = "Preparation"
@@ -155,10 +156,15 @@ class PhaseManager:
             player = self.game.get_current_player()
             card_options = self.game.card_generator.generate_card_options(player.level)
             
-            # Create and show card selection UI
-            from .card_selection_ui import CardSelectionUI
-            self.card_selection_ui = CardSelectionUI(self.game)
-            self.card_selection_ui.set_card_options(card_options)
+            # Headless games have no UI - take the first option straight away
+            if getattr(self.game, 'headless', False):
+                if card_options:
+                    self.game.card_system.add_card_to_player(player, card_options[0])
+            else:
+                # Create and show card selection UI
+                from .card_selection_ui import CardSelectionUI
+                self.card_selection_ui = CardSelectionUI(self.game)
+                self.card_selection_ui.set_card_options(card_options)
         
         # Start night phase for all players
         if hasattr(self.game, 'player_manager') and hasattr(self.game.player_manager, 'start_night_card_selection'):
@@ -175,6 +181,15 @@ class PhaseManager:
         try:
             from .skills import SKILL_LIBRARY
             
+            # Headless games pick a random skill and go straight to the next day
+            if getattr(self.game, 'headless', False):
+                player = self.game.get_current_player()
+                available_skills = list(SKILL_LIBRARY.values())
+                if player and available_skills and hasattr(self.game, 'skill_system'):
+                    self.game.skill_system.process_skill_selection(player, rng_of(self.game).choice(available_skills))
+                self.start_day()
+                return
+            
             self.current_phase = GamePhase.SKILL_SELECT
             player = self.game.get_current_player()
             self.skill_select_ui = SkillSelectUI(self.game.screen)
@@ -182,7 +197,7 @@ class PhaseManager:
             
             # Select 3 random skills for player to choose from
             available_skills = list(SKILL_LIBRARY.values())
-            self.skill_select_ui.skill_options = random.sample(available_skills, min(3, len(available_skills)))
+            self.skill_select_ui.skill_options = rng_of(self.game).sample(available_skills, min(3, len(available_skills)))
             
             if hasattr(self.game, 'ui_bridge'):
                 self.game.ui_bridge.show_notification("Choose a skill!", "info")
@@ -269,6 +284,11 @@ class PhaseManager:
         if hasattr(self.game, 'ui_bridge'):
             self.game.ui_bridge.show_notification("NEW GAME STARTED!", "info")
     
+    def set_phase(self, phase):
+        """Force the current phase (used by swarm mode and menus)"""
+        self.current_phase = phase
+        self.just_switched_phase = True
+    
     def is_day_phase(self):
         """Check if current phase is day"""
         return self.current_phase == GamePhase.DAY
@@ -331,16 +351,16 @@ class PhaseManager:
         screen.blit(overlay, (0, 0))
         
         # Draw title
-        font_large = pygame.font.SysFont("Arial", 48, bold=True)
+        font_large = get_sys_font("Arial", 48, bold=True)
         title_text = font_large.render("GAME OVER", True, (255, 0, 0))
         screen.blit(title_text, (width // 2 - title_text.get_width() // 2, 100))
         
         # Draw day count
-        font_medium = pygame.font.SysFont("Arial", 36)
+        font_medium = get_sys_font("Arial", 36)
         day_text = font_medium.render(f"Survived {self.day_count} days", True, (255, 255, 255))
         screen.blit(day_text, (width // 2 - day_text.get_width() // 2, 180))
         
         # Draw restart prompt
-        font_small = pygame.font.SysFont("Arial", 24)
+        font_small = get_sys_font("Arial", 24)
         restart_text = font_small.render("Press SPACE to restart", True, (200, 200, 200))
         screen.blit(restart_text, (width // 2 - restart_text.get_width() // 2, height - 100))
@@ -4,6 +4,7 @@ import random
 import math
 import pygame
 from .core.entities import Player, PlayerRole, AlignmentSystem
+from ..utils.font_utils import render_text
 
 class PlayerManager:
     """Manages all player-related operations including cards, alignment, and clues"""
@@ -164,7 +165,7 @@ class PlayerManager:
                 color = (100, 100, 255)
 
             pygame.draw.rect(screen, color, (int(player.position[0]) - 10, int(player.position[1]) - 10, 20, 20))
-            name_text = self.game.small_font.render(f"{player.name} Lv.{player.level}", True, (255, 255, 255))
+            name_text = render_text(self.game.small_font, f"{player.name} Lv.{player.level}", (255, 255, 255))
             screen.blit(name_text, (int(player.position[0]) - 30, int(player.position[1]) + 15))
 
     def get_current_player(self):
@@ -4,9 +4,9 @@ from .entities import PlayerSkill
 from .skills import SKILL_LIBRARY
 import json
 import os
-import random
 from src.core.entities.skills import EchoStrike, VoidResonance, SkillType, Skill
 from src.core.entities.weapons import AniMines, JinxTriNamite
+from src.utils.rng import rng_of
 
 class SkillSystem:
     """Manages skill usage and cooldowns"""
@@ -193,7 +193,7 @@ class SkillSystem:
 
         # Apply critical chance
         crit_chance = player.stats.get("crit_rate", 0.05)
-        is_critical = random.random() < crit_chance
+        is_critical = rng_of(self.game).random() < crit_chance
         if is_critical:
             damage *= 2
 
@@ -417,9 +417,10 @@ class RoleAbility(Skill):
                 }
         elif self.id == 'chaotic_energy':
             # Random chance to apply chaos effect
-            if random.random() < self.chaos_chance:
+            rng = rng_of(self.owner)
+            if rng.random() < self.chaos_chance:
                 effects = ["slow", "stun", "burn", "heal", "silence"]
-                chosen_effect = random.choice(effects)
+                chosen_effect = rng.choice(effects)
                 
                 return {
                     "effect": chosen_effect,
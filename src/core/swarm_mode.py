@@ -1,9 +1,9 @@
 # File: src/core/swarm_mode.py
 
-import random
 from typing import List, Dict, Any, Optional
 from src.core.skill_system import get_skill_registry
 from src.core.entities.player import Player, PlayerRole
+from src.utils.rng import rng
 
 class SwarmModeManager:
     """Manager for Swarm mode gameplay with character and role mechanics"""
@@ -14,6 +14,7 @@ class SwarmModeManager:
         self.day = 1  # Current day
         self.max_days = 10  # Maximum number of days
         self.suspicious_actions = {}  # Track suspicious actions by player ID
+        self.rng = rng  # Replaced by the running Game's own generator
         
     def add_player(self, player: Player):
         """Add a player to the game"""
@@ -57,7 +58,7 @@ class SwarmModeManager:
         potential_roles = self.skill_registry.get_potential_roles_for_character(character_id)
         
         # Choose a random role from the potential roles
-        role_id = random.choice(potential_roles)
+        role_id = self.rng.choice(potential_roles)
         
         if role_id in self.skill_registry.roles:
             role_data = self.skill_registry.roles[role_id]
@@ -80,7 +81,7 @@ class SwarmModeManager:
             "type": clue_type,
             "position": position,
             "collected": False,
-            "reveals_role": random.random() < reveal_chance,
+            "reveals_role": self.rng.random() < reveal_chance,
             "content": self._generate_clue_content(clue_type)
         }
         self.clues.append(clue)
@@ -89,21 +90,21 @@ class SwarmModeManager:
     def _generate_clue_content(self, clue_type: str) -> str:
         """Generate appropriate content for a clue based on its type"""
         if clue_type == "document":
-            return random.choice([
+            return self.rng.choice([
                 "A torn page mentions suspicious behavior by one of the members...",
                 "A coded message suggests someone is working for the enemy...",
                 "A list of names with one circled in red ink...",
                 "A map with strategic locations marked for sabotage..."
             ])
         elif clue_type == "item":
-            return random.choice([
+            return self.rng.choice([
                 "A peculiar device of unknown origin...",
                 "A strange symbol that gives off an eerie glow...",
                 "A weapon with distinctive markings...",
                 "A personal item belonging to someone in your group..."
             ])
         elif clue_type == "environment":
-            return random.choice([
+            return self.rng.choice([
                 "Strange markings on the wall that reveal secrets when lit...",
                 "A hidden compartment containing cryptic information...",
                 "An unusual pattern in the environment that suggests hidden meanings...",
@@ -185,11 +186,11 @@ class SwarmModeManager:
     
     def _generate_daily_clues(self) -> None:
         """Generate new clues for the current day"""
-        clue_count = random.randint(2, 4)  # Random number of clues each day
+        clue_count = self.rng.randint(2, 4)  # Random number of clues each day
         
         for _ in range(clue_count):
-            clue_type = random.choice(["document", "item", "environment"])
-            position = (random.randint(100, 1100), random.randint(100, 600))  # Random position on screen
+            clue_type = self.rng.choice(["document", "item", "environment"])
+            position = (self.rng.randint(100, 1100), self.rng.randint(100, 600))  # Random position on screen
             self.create_clue(clue_type, position)
     
     def check_victory_conditions(self) -> Dict[str, Any]:
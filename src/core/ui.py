@@ -5,6 +5,7 @@ UI Components - Skill Selection UI
 import pygame
 from typing import List, Optional
 from .entities import SkillCard, SkillType
+from ..utils.font_utils import get_sys_font
 
 # UI Constants
 SCREEN_WIDTH = 1200
@@ -15,8 +16,8 @@ MAX_ROLLS_PER_NIGHT = 2
 class SkillSelectUI:
     def __init__(self, screen):
         self.screen = screen
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
+        self.font = get_sys_font(None, 36)
+        self.small_font = get_sys_font(None, 24)
         self.skill_options = []
         self.time_left = SKILL_CARD_SELECT_TIME
         self.rolls_left = MAX_ROLLS_PER_NIGHT
@@ -98,7 +99,7 @@ class SkillSelectUI:
                 self.screen.blit(type_text, (x + 10, start_y + 10))
                 
                 # Draw skill icon (larger)
-                icon_font = pygame.font.Font(None, 96)
+                icon_font = get_sys_font(None, 96)
                 icon_text = icon_font.render(skill_card.icon, True, (255, 255, 255))
                 icon_bg = pygame.Surface((80, 80))
                 icon_bg.fill((0, 0, 0))
@@ -158,7 +159,7 @@ class SkillSelectUI:
                 self.screen.blit(auto_cast_text, (x + 20, start_y + card_height - 20))
                 
                 # Draw number indicator
-                num_font = pygame.font.Font(None, 60)
+                num_font = get_sys_font(None, 60)
                 num_text = num_font.render(str(i + 1), True, (255, 255, 0))
                 num_bg = pygame.Surface((40, 40))
                 num_bg.fill((0, 0, 0))
@@ -0,0 +1,74 @@
+# src/network/batching.py
+"""
+Gom message gửi từ client thành frame
+"""
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+class OutboundBatcher:
+    """
+    Gom các message gửi đi trong một khoảng flush thành một frame 'batch'.
+
+    Trạng thái dư thừa được gộp lại: state_ack và move/aim không có seq chỉ
+    giữ bản mới nhất; các input move có seq liên tiếp giống nhau được nén
+    thành một message với 'count'. Thứ tự các message còn lại được giữ nguyên.
+
+    Vì vậy input dự đoán tới server theo từng đợt; LobbySimulation để dành
+    lượt cho các tick không nhận được input nên vẫn áp dụng đủ cả đợt mà
+    không chạy trước client.
+    """
+
+    # Action chỉ cần giá trị mới nhất (trạng thái giữ phím / hướng ngắm)
+    COALESCED_ACTIONS = ("move", "aim")
+
+    def __init__(self):
+        self.pending: List[Optional[Dict[str, Any]]] = []
+        self.latest: Dict[Tuple, int] = {}
+        self.queued = 0
+        self.frames = 0
+
+    def __len__(self):
+        return sum(1 for message in self.pending if message is not None)
+
+    def _coalesce_key(self, message: Dict[str, Any]) -> Optional[Tuple]:
+        if message["type"] == "state_ack":
+            return ("state_ack",)
+        if message["type"] == "game_action" and message.get("action") in self.COALESCED_ACTIONS \
+                and "seq" not in message:
+            return ("game_action", message["action"])
+        return None
+
+    def add(self, message: Dict[str, Any]):
+        self.queued += 1
+
+        # Input move có seq: nối vào run trước đó nếu cùng hướng và seq liên tiếp
+        if message.get("action") == "move" and "seq" in message and self.pending:
+            last = self.pending[-1]
+            if last and last.get("action") == "move" and "seq" in last \
+                    and (last["x"], last["y"]) == (message["x"], message["y"]) \
+                    and last["seq"] + last.get("count", 1) == message["seq"]:
+                last["count"] = last.get("count", 1) + 1
+                return
+
+        key = self._coalesce_key(message)
+        if key is not None:
+            index = self.latest.get(key)
+            if index is not None:
+                # Bỏ bản cũ, đưa bản mới về cuối để giữ đúng thứ tự với lệnh khác
+                self.pending[index] = None
+            self.latest[key] = len(self.pending)
+        self.pending.append(dict(message))
+
+    def take_frame(self) -> Optional[str]:
+        """
+        Lấy frame JSON cần gửi (None nếu không có gì). Một message thì gửi nguyên.
+        """
+        messages = [m for m in self.pending if m is not None]
+        self.pending = []
+        self.latest.clear()
+        if not messages:
+            return None
+        self.frames += 1
+        if len(messages) == 1:
+            return json.dumps(messages[0])
+        return json.dumps({"type": "batch", "messages": messages})
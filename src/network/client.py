@@ -2,10 +2,15 @@ import asyncio
 import websockets
 import json
 from queue import Queue
-from typing import Callable, Dict
+from typing import Any, Callable, Dict, Optional
+from config.settings import CLIENT_FLUSH_INTERVAL
+from .batching import OutboundBatcher
+from .protocol import (
+    SNAPSHOT_HISTORY, ProtocolError, apply_delta, decode_delta, empty_snapshot, snapshot_to_game_state
+)
 
 class GameClient:
-    def __init__(self, server_url: str = "ws://localhost:8765"):
+    def __init__(self, server_url: str = "ws://localhost:8765", flush_interval: float = CLIENT_FLUSH_INTERVAL):
         self.server_url = server_url
         self.websocket = None
         self.player_id = None
@@ -13,6 +18,15 @@ class GameClient:
         self.connected = False
         self.callbacks: Dict[str, Callable] = {}
         self.message_queue = Queue()
+        
+        # Message gửi đi được gom lại và flush định kỳ
+        self.outbound = OutboundBatcher()
+        self.flush_interval = flush_interval
+        self._flush_task: Optional[asyncio.Task] = None
+        
+        # Snapshots nhận từ server (seq -> snapshot), dùng làm baseline cho delta
+        self.snapshots: Dict[int, Dict[str, Any]] = {}
+        self.game_state: Optional[Dict[str, Any]] = None
 
     async def connect(self, player_name: str) -> bool:
         """
@@ -29,12 +43,37 @@ class GameClient:
             
             # Bắt đầu xử lý nhận message từ server
             asyncio.create_task(self.receive_messages())
+            self._flush_task = asyncio.create_task(self._flush_loop())
             self.connected = True
             return True
         except Exception as e:
             print(f"Connection failed: {e}")
             return False
 
+    def send(self, message: Dict[str, Any]):
+        """
+        Đưa message vào hàng đợi gửi; sẽ được gửi ở lần flush kế tiếp.
+        """
+        if self.connected:
+            self.outbound.add(message)
+
+    async def flush(self):
+        """
+        Gửi ngay các message đang chờ thành một frame.
+        """
+        frame = self.outbound.take_frame()
+        if frame is None or self.websocket is None:
+            return
+        try:
+            await self.websocket.send(frame)
+        except websockets.exceptions.ConnectionClosed:
+            self.connected = False
+
+    async def _flush_loop(self):
+        while self.connected:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
     async def receive_messages(self):
         """
         Lắng nghe và xử lý các message nhận được từ server.
@@ -42,11 +81,25 @@ class GameClient:
         """
         try:
             async for message in self.websocket:
-                data = json.loads(message)
+                # Message nhị phân là snapshot/delta trạng thái game
+                if isinstance(message, bytes):
+                    data = await self._apply_state_message(message)
+                    if data is None:
+                        continue
+                else:
+                    data = json.loads(message)
+                
+                # Server kiểm tra kết nối: trả lời ngay
+                if data["type"] == "heartbeat":
+                    self.send({"type": "heartbeat_ack"})
+                    continue
                 
                 # Nếu nhận được message 'connected', lưu lại player_id
                 if data["type"] == "connected":
                     self.player_id = data.get("player_id")
+                # Lobby vừa tạo/tham gia: server báo lobby_id qua 'player_joined'
+                elif data["type"] == "player_joined" and data.get("player_id") == self.player_id:
+                    self.lobby_id = data.get("lobby_id", self.lobby_id)
                 
                 # Gọi callback nếu đã đăng ký
                 callback = self.callbacks.get(data["type"])
@@ -55,49 +108,99 @@ class GameClient:
                 else:
                     self.message_queue.put(data)
         except websockets.exceptions.ConnectionClosed:
-            self.connected = False
             print("Disconnected from server")
+        self.connected = False
+
+    async def _apply_state_message(self, message: bytes):
+        """
+        Áp dụng delta trạng thái lên baseline tương ứng và gửi ack cho server.
+        Trả về message 'game_update' hoặc None nếu thiếu baseline.
+        """
+        try:
+            delta = decode_delta(message)
+            if delta["baseline"]:
+                base = self.snapshots.get(delta["baseline"])
+                if base is None:
+                    # Mất baseline: yêu cầu server gửi snapshot đầy đủ
+                    self.send({"type": "state_ack", "seq": 0})
+                    return None
+            else:
+                base = empty_snapshot()
+            snapshot = apply_delta(base, delta)
+        except ProtocolError as e:
+            print(f"Invalid state message: {e}")
+            self.send({"type": "state_ack", "seq": 0})
+            return None
+        
+        # Giữ lại một số snapshot gần nhất làm baseline
+        self.snapshots[snapshot["seq"]] = snapshot
+        for seq in [s for s in self.snapshots if s <= snapshot["seq"] - SNAPSHOT_HISTORY]:
+            del self.snapshots[seq]
+        self.send({"type": "state_ack", "seq": snapshot["seq"]})
+        
+        self.game_state = snapshot_to_game_state(snapshot)
+        return {
+            "type": "game_update",
+            "seq": snapshot["seq"],
+            "game_state": self.game_state
+        }
 
     async def create_lobby(self, lobby_name: str):
         """
         Gửi yêu cầu tạo lobby với tên đã chọn.
         """
-        if self.connected:
-            await self.websocket.send(json.dumps({
-                "type": "create_lobby",
-                "name": lobby_name
-            }))
+        self.send({
+            "type": "create_lobby",
+            "name": lobby_name
+        })
 
     async def join_lobby(self, lobby_id: str):
         """
         Gửi yêu cầu tham gia lobby theo lobby_id.
         """
         if self.connected:
-            await self.websocket.send(json.dumps({
+            self.send({
                 "type": "join_lobby",
                 "lobby_id": lobby_id
-            }))
+            })
             self.lobby_id = lobby_id
 
     async def set_ready(self):
         """
         Gửi yêu cầu báo sẵn sàng.
         """
-        if self.connected:
-            await self.websocket.send(json.dumps({
-                "type": "ready"
-            }))
+        self.send({
+            "type": "ready"
+        })
 
     async def send_command(self, command: str):
         """
         Gửi các lệnh gameplay lên server (ví dụ: build, scan, use, accuse,...)
         """
-        if self.connected and self.lobby_id:
-            await self.websocket.send(json.dumps({
+        await self.send_action("command", command=command)
+
+    async def send_action(self, action: str, **data):
+        """
+        Gửi một game_action bất kỳ (command, move, use_card,...) lên server.
+        """
+        if self.lobby_id:
+            self.send({
                 "type": "game_action",
-                "action": "command",
-                "command": command
-            }))
+                "action": action,
+                **data
+            })
+
+    async def ping(self, timestamp: float):
+        """
+        Gửi ping; server trả về 'pong' kèm nguyên timestamp để đo round-trip.
+        Ping được flush ngay để không tính thời gian chờ gom message.
+        """
+        if self.connected:
+            self.send({
+                "type": "ping",
+                "t": timestamp
+            })
+            await self.flush()
 
     def register_callback(self, message_type: str, callback: Callable):
         """
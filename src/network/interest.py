@@ -0,0 +1,116 @@
+# src/network/interest.py
+"""
+Per-client relevancy filtering of lobby snapshots
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set
+
+from config.settings import INTEREST_VIEW_RADIUS, INTEREST_NIGHT_VIEW_RADIUS, INTEREST_HYSTERESIS
+from src.utils.spatial_hash import SpatialHash
+from .protocol import SNAPSHOT_HISTORY, diff_snapshots, empty_snapshot, encode_delta
+
+# Phase value (phase_manager.GamePhase.NIGHT) with the reduced view radius
+NIGHT_PHASE = "Night"
+
+class ClientView:
+    """What one client can see: its relevant monster ids and filtered snapshots"""
+
+    def __init__(self, max_snapshots: int = SNAPSHOT_HISTORY):
+        self.max_snapshots = max_snapshots
+        self.relevant: Set[int] = set()
+        self.snapshots: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self.entered = 0
+        self.left = 0
+
+    def push(self, snapshot: Dict[str, Any]):
+        self.snapshots[snapshot["seq"]] = snapshot
+        while len(self.snapshots) > self.max_snapshots:
+            self.snapshots.popitem(last=False)
+
+class InterestManager:
+    """
+    Filters each lobby snapshot down to what every player can see
+
+    Players receive the globals (phase, day, timer), every player record
+    and only the monsters within their view radius, which shrinks at
+    night. Each client gets deltas against its own filtered snapshots, so
+    a monster walking into view arrives as a spawn and one walking out as
+    a removal.
+
+    Relevancy is updated incrementally once per snapshot: monsters are
+    bucketed into a spatial hash and each player queries only the cells
+    around it. A monster already visible stays visible until it is
+    ``hysteresis`` times the radius away, so entities on the edge don't
+    flicker in and out every send. Players without a position (dead or
+    spectating) see everything.
+    """
+
+    def __init__(self, view_radius: float = INTEREST_VIEW_RADIUS,
+                 night_view_radius: float = INTEREST_NIGHT_VIEW_RADIUS,
+                 hysteresis: float = INTEREST_HYSTERESIS):
+        self.view_radius = view_radius
+        self.night_view_radius = night_view_radius
+        self.hysteresis = hysteresis
+        self.grid = SpatialHash(cell_size=view_radius / 2)
+        self.views: Dict[str, ClientView] = {}
+
+    def radius_for(self, snapshot: Dict[str, Any]) -> float:
+        if snapshot["globals"].get("phase") == NIGHT_PHASE:
+            return self.night_view_radius
+        return self.view_radius
+
+    def update(self, snapshot: Dict[str, Any]):
+        """Recompute relevancy for every player and store their filtered snapshots"""
+        monsters = snapshot["monsters"]
+        self.grid.clear()
+        for mid, record in monsters.items():
+            self.grid.insert((record["x"], record["y"]), mid)
+
+        radius = self.radius_for(snapshot)
+        outer = radius * self.hysteresis
+        r2 = radius * radius
+
+        for pid, record in snapshot["players"].items():
+            view = self.views.get(pid)
+            if view is None:
+                view = self.views[pid] = ClientView()
+
+            position = record.get("position")
+            if position is None or not record.get("alive", True):
+                relevant = set(monsters)
+            else:
+                px, py = position
+                relevant = set()
+                previous = view.relevant
+                for x, y, mid in self.grid.query_radius(position, outer):
+                    if mid in previous or (x - px) ** 2 + (y - py) ** 2 < r2:
+                        relevant.add(mid)
+
+            view.entered += len(relevant - view.relevant)
+            view.left += len(view.relevant - relevant)
+            view.relevant = relevant
+            view.push({
+                "seq": snapshot["seq"],
+                "globals": snapshot["globals"],
+                "players": snapshot["players"],
+                "monsters": {mid: monsters[mid] for mid in relevant},
+            })
+
+        for pid in [pid for pid in self.views if pid not in snapshot["players"]]:
+            del self.views[pid]
+
+    def encode_for(self, player_id: str, acked_seq: Optional[int]) -> bytes:
+        """
+        Encode a player's latest filtered snapshot
+
+        Args:
+            player_id (str): Lobby player id
+            acked_seq (int): Last snapshot the client acknowledged, or None
+
+        Returns:
+            bytes: Delta against acked_seq if still in the client's history, else full
+        """
+        view = self.views[player_id]
+        baseline = acked_seq if acked_seq in view.snapshots else 0
+        base = view.snapshots[baseline] if baseline else empty_snapshot()
+        return encode_delta(diff_snapshots(base, next(reversed(view.snapshots.values()))))
@@ -0,0 +1,305 @@
+# src/network/loadtest.py
+"""
+Load generator: swarms of scripted GameClient bots against a local GameServer
+
+    python -m src.network.loadtest --bots=2000 --procs=4 --duration=60
+
+Starts a GameServer in a child process (unless --url points at a running
+one), connects the bots, groups them into lobbies that ready up, then has
+every bot send game actions and pings at fixed rates. Prints connection
+setup times, ping round-trip percentiles, server CPU use and drops.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from config.settings import MIN_PLAYERS_TO_START
+from .client import GameClient
+
+@dataclass
+class LoadConfig:
+    url: str = "ws://localhost:8765"
+    bots: int = 100
+    lobby_size: int = MIN_PLAYERS_TO_START
+    duration: float = 30.0      # Seconds of gameplay traffic after lobbies start
+    action_rate: float = 5.0    # game_action messages per bot per second
+    ping_rate: float = 1.0      # Pings per bot per second
+    connect_rate: float = 200.0 # New connections per second per process
+    seed: int = 0
+
+@dataclass
+class BotStats:
+    """Measurements from one process' bots (merged across processes)"""
+    connect_times: List[float] = field(default_factory=list)
+    rtts: List[float] = field(default_factory=list)
+    failed_connects: int = 0
+    disconnects: int = 0
+    lobbies_started: int = 0
+    actions_sent: int = 0
+    pings_sent: int = 0
+    pongs: int = 0
+    messages: int = 0
+    state_updates: int = 0
+
+    def merge(self, other: "BotStats"):
+        self.connect_times += other.connect_times
+        self.rtts += other.rtts
+        for name in ("failed_connects", "disconnects", "lobbies_started", "actions_sent",
+                     "pings_sent", "pongs", "messages", "state_updates"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+def percentile(samples: List[float], p: float) -> float:
+    """Nearest-rank percentile of the samples (0 if empty)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+class Bot:
+    """One scripted client: connect, lobby up, then send actions and pings"""
+
+    def __init__(self, name: str, config: LoadConfig, stats: BotStats, rand: random.Random):
+        self.name = name
+        self.config = config
+        self.stats = stats
+        self.rand = rand
+        self.client = GameClient(config.url)
+        self.connected = asyncio.Event()
+        self.joined = asyncio.Event()
+        self.started = asyncio.Event()
+        self.pending_pings: Dict[float, float] = {}
+
+        self.client.register_callback("connected", lambda data: self.connected.set())
+        self.client.register_callback("player_joined", self._on_joined)
+        self.client.register_callback("game_started", lambda data: self.started.set())
+        self.client.register_callback("pong", self._on_pong)
+        self.client.register_callback("game_update", self._on_update)
+        for message_type in ("player_left", "action_result", "game_over", "error"):
+            self.client.register_callback(message_type, self._on_message)
+
+    def _on_message(self, data):
+        self.stats.messages += 1
+
+    def _on_joined(self, data):
+        self.stats.messages += 1
+        if data.get("player_id") == self.client.player_id:
+            self.joined.set()
+
+    def _on_update(self, data):
+        self.stats.messages += 1
+        self.stats.state_updates += 1
+
+    def _on_pong(self, data):
+        self.stats.messages += 1
+        sent = self.pending_pings.pop(data.get("t"), None)
+        if sent is not None:
+            self.stats.pongs += 1
+            self.stats.rtts.append(time.perf_counter() - sent)
+
+    async def connect(self, timeout: float = 10.0) -> bool:
+        start = time.perf_counter()
+        try:
+            ok = await asyncio.wait_for(self.client.connect(self.name), timeout)
+            if ok:
+                await asyncio.wait_for(self.connected.wait(), timeout)
+        except asyncio.TimeoutError:
+            ok = False
+        if not ok:
+            self.stats.failed_connects += 1
+            return False
+        self.stats.connect_times.append(time.perf_counter() - start)
+        return True
+
+    async def play(self, until: float):
+        """Send actions and pings at the configured rates until the deadline"""
+        loop = asyncio.get_running_loop()
+        action_interval = 1.0 / self.config.action_rate if self.config.action_rate > 0 else None
+        ping_interval = 1.0 / self.config.ping_rate if self.config.ping_rate > 0 else None
+        # Spread bots over the interval so they don't all send on the same tick
+        next_action = loop.time() + self.rand.random() * (action_interval or 0)
+        next_ping = loop.time() + self.rand.random() * (ping_interval or 0)
+
+        while loop.time() < until and self.client.connected:
+            now = loop.time()
+            if action_interval and now >= next_action:
+                if self.rand.random() < 0.8:
+                    await self.client.send_action("move", x=self.rand.randint(-1, 1), y=self.rand.randint(-1, 1))
+                else:
+                    await self.client.send_command(self.rand.choice(["scan", "build", "use"]))
+                self.stats.actions_sent += 1
+                next_action += action_interval
+            if ping_interval and now >= next_ping:
+                # perf_counter timestamps are unique enough to key pending pings
+                sent = time.perf_counter()
+                self.pending_pings[sent] = sent
+                await self.client.ping(sent)
+                self.stats.pings_sent += 1
+                next_ping += ping_interval
+            await asyncio.sleep(max(0.0, min(next_action if action_interval else until,
+                                             next_ping if ping_interval else until) - loop.time()))
+
+        if not self.client.connected:
+            self.stats.disconnects += 1
+
+    async def close(self):
+        if self.client.websocket is not None:
+            await self.client.websocket.close()
+
+async def _run_lobby(bots: List[Bot], index: int, stats: BotStats, until: float):
+    """Create a lobby with the first bot, join the rest, ready everyone up and play"""
+    host = bots[0]
+    await host.client.create_lobby(f"load_{index}")
+    await asyncio.wait_for(host.joined.wait(), 10)
+    for bot in bots[1:]:
+        await bot.client.join_lobby(host.client.lobby_id)
+    await asyncio.gather(*(asyncio.wait_for(bot.joined.wait(), 10) for bot in bots[1:]))
+    for bot in bots:
+        await bot.client.set_ready()
+    await asyncio.wait_for(host.started.wait(), 10)
+    stats.lobbies_started += 1
+    await asyncio.gather(*(bot.play(until) for bot in bots))
+
+async def run_bots(config: LoadConfig, count: int, offset: int = 0) -> BotStats:
+    """Run ``count`` bots in the current event loop and return their stats"""
+    stats = BotStats()
+    rand = random.Random(config.seed + offset)
+    bots = [Bot(f"bot_{offset + i}", config, stats, rand) for i in range(count)]
+
+    # Ramp up connections instead of opening them all at once
+    connects = []
+    for bot in bots:
+        connects.append(asyncio.create_task(bot.connect()))
+        await asyncio.sleep(1.0 / config.connect_rate)
+    results = await asyncio.gather(*connects)
+    connected = [bot for bot, ok in zip(bots, results) if ok]
+
+    until = asyncio.get_running_loop().time() + config.duration
+    groups = [connected[i:i + config.lobby_size]
+              for i in range(0, len(connected) - config.lobby_size + 1, config.lobby_size)]
+    outcomes = await asyncio.gather(*(_run_lobby(group, offset + i, stats, until)
+                                      for i, group in enumerate(groups)), return_exceptions=True)
+    for outcome in outcomes:
+        if isinstance(outcome, Exception):
+            print(f"Lobby failed to start: {outcome!r}")
+
+    await asyncio.gather(*(bot.close() for bot in connected), return_exceptions=True)
+    return stats
+
+def _bot_process(config: LoadConfig, count: int, offset: int, queue):
+    queue.put(asyncio.run(run_bots(config, count, offset)))
+
+def _server_process(port: int, workers: int, conn):
+    """Run a GameServer and answer CPU-time queries on ``conn``"""
+    from .server import GameServer
+
+    def answer():
+        conn.recv()
+        conn.send(time.process_time())
+
+    async def main():
+        server = GameServer(port=port, workers=workers)
+        asyncio.get_running_loop().add_reader(conn.fileno(), answer)
+        await server.start()
+
+    asyncio.run(main())
+
+def run_load_test(config: LoadConfig, procs: int = 1) -> BotStats:
+    """Run the bots, split over ``procs`` processes, and merge their stats"""
+    if procs <= 1:
+        return asyncio.run(run_bots(config, config.bots))
+
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    # Keep lobbies within one process so their bots can coordinate
+    per_proc = -(-config.bots // procs)
+    per_proc += -per_proc % config.lobby_size
+    processes = []
+    for offset in range(0, config.bots, per_proc):
+        count = min(per_proc, config.bots - offset)
+        process = ctx.Process(target=_bot_process, args=(config, count, offset, queue))
+        process.start()
+        processes.append(process)
+
+    stats = BotStats()
+    for _ in processes:
+        stats.merge(queue.get())
+    for process in processes:
+        process.join()
+    return stats
+
+def format_report(config: LoadConfig, stats: BotStats, elapsed: float,
+                  server_cpu: Optional[float] = None) -> str:
+    ms = 1000.0
+    lines = [
+        f"Bots: {config.bots}  lobbies started: {stats.lobbies_started}  elapsed: {elapsed:.1f}s",
+        f"Connect: ok {len(stats.connect_times)}  failed {stats.failed_connects}  "
+        f"p50 {percentile(stats.connect_times, 50) * ms:.1f} ms  "
+        f"p99 {percentile(stats.connect_times, 99) * ms:.1f} ms  "
+        f"max {max(stats.connect_times, default=0) * ms:.1f} ms",
+        f"RTT: p50 {percentile(stats.rtts, 50) * ms:.1f} ms  p90 {percentile(stats.rtts, 90) * ms:.1f} ms  "
+        f"p99 {percentile(stats.rtts, 99) * ms:.1f} ms  max {max(stats.rtts, default=0) * ms:.1f} ms",
+        f"Sent: {stats.actions_sent} actions, {stats.pings_sent} pings  "
+        f"received: {stats.messages} messages ({stats.state_updates} state updates)",
+        f"Dropped: {stats.pings_sent - stats.pongs} pings unanswered, {stats.disconnects} bots disconnected",
+    ]
+    if server_cpu is not None:
+        lines.append(f"Server CPU: {server_cpu:.1f}s ({server_cpu / elapsed * 100:.0f}% of one core, "
+                     f"front process only)")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test a Shadow Echo GameServer")
+    parser.add_argument("--url", help="Server to test; by default a local server is started")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=0, help="Lobby worker processes for the local server")
+    parser.add_argument("--bots", type=int, default=LoadConfig.bots)
+    parser.add_argument("--procs", type=int, default=1, help="Processes to run the bots in")
+    parser.add_argument("--lobby-size", type=int, default=LoadConfig.lobby_size)
+    parser.add_argument("--duration", type=float, default=LoadConfig.duration)
+    parser.add_argument("--action-rate", type=float, default=LoadConfig.action_rate)
+    parser.add_argument("--ping-rate", type=float, default=LoadConfig.ping_rate)
+    parser.add_argument("--connect-rate", type=float, default=LoadConfig.connect_rate)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    config = LoadConfig(
+        url=args.url or f"ws://localhost:{args.port}", bots=args.bots, lobby_size=args.lobby_size,
+        duration=args.duration, action_rate=args.action_rate, ping_rate=args.ping_rate,
+        connect_rate=args.connect_rate, seed=args.seed,
+    )
+
+    server, control = None, None
+    if not args.url:
+        ctx = multiprocessing.get_context("spawn")
+        control, child_conn = ctx.Pipe()
+        server = ctx.Process(target=_server_process, args=(args.port, args.workers, child_conn), daemon=True)
+        server.start()
+        control.send("cpu")
+        control.recv()  # Server process is up
+        time.sleep(0.5)
+
+    cpu_start = None
+    if control:
+        control.send("cpu")
+        cpu_start = control.recv()
+    start = time.perf_counter()
+    stats = run_load_test(config, args.procs)
+    elapsed = time.perf_counter() - start
+    server_cpu = None
+    if control:
+        control.send("cpu")
+        server_cpu = control.recv() - cpu_start
+
+    print(format_report(config, stats, elapsed, server_cpu))
+    if server:
+        server.terminate()
+        server.join()
+
+if __name__ == "__main__":
+    sys.exit(main())
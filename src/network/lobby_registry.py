@@ -0,0 +1,170 @@
+# src/network/lobby_registry.py
+"""
+Lobby bookkeeping: unique ids, open-lobby index and matchmaking queue
+"""
+import asyncio
+import itertools
+from typing import Dict, List, Optional, Set, Tuple
+
+from config.settings import INTEREST_MANAGEMENT, MAX_PLAYERS_PER_LOBBY, MIN_PLAYERS_TO_START
+from .interest import InterestManager
+from .protocol import SnapshotHistory
+from .simulation import LobbySimulation
+
+class Lobby:
+    def __init__(self, id: str, name: str):
+        self.id = id
+        self.name = name
+        self.players: Set[str] = set()
+        self.state = "waiting"
+        self.max_players = MAX_PLAYERS_PER_LOBBY
+        self.history = SnapshotHistory()
+        self.interest: Optional[InterestManager] = InterestManager() if INTEREST_MANAGEMENT else None
+        self.simulation: Optional[LobbySimulation] = None
+        self.sim_task: Optional[asyncio.Task] = None
+        self.worker: Optional[int] = None  # Worker process index when sharded
+
+    @property
+    def free_slots(self) -> int:
+        return self.max_players - len(self.players)
+
+    @property
+    def is_open(self) -> bool:
+        """Whether players can join: still waiting to start and not full"""
+        return self.state == "waiting" and self.free_slots > 0
+
+class LobbyRegistry:
+    """
+    All lobbies of a server, indexed for constant-time placement
+
+    Waiting lobbies with room are kept in ``open_lobbies``, bucketed by free
+    slots, so finding the fullest lobby a player can join walks at most
+    ``MAX_PLAYERS_PER_LOBBY`` buckets however many lobbies exist. Lobbies
+    are deleted as soon as their last player leaves.
+
+    Players who ask for a match wait in ``queue`` (insertion ordered) and
+    are placed by ``match()``: first topping up open lobbies, fullest
+    first, then opening new lobbies once enough players are waiting to
+    start one.
+    """
+
+    def __init__(self, min_players: int = MIN_PLAYERS_TO_START):
+        self.min_players = min_players
+        self.lobbies: Dict[str, Lobby] = {}
+        # free slots -> ordered set (dict) of waiting lobby ids
+        self.open_lobbies: Dict[int, Dict[str, None]] = {}
+        self.queue: Dict[str, None] = {}
+        self._ids = itertools.count()
+
+    def __len__(self):
+        return len(self.lobbies)
+
+    def __contains__(self, lobby_id) -> bool:
+        return lobby_id in self.lobbies
+
+    def get(self, lobby_id: str) -> Optional[Lobby]:
+        return self.lobbies.get(lobby_id)
+
+    def create(self, name: str) -> Lobby:
+        """Create an empty waiting lobby with a never-reused id"""
+        lobby = Lobby(f"lobby_{next(self._ids)}", name)
+        self.lobbies[lobby.id] = lobby
+        self._index(lobby)
+        return lobby
+
+    def _unindex(self, lobby: Lobby, free_slots: int):
+        bucket = self.open_lobbies.get(free_slots)
+        if bucket is not None:
+            bucket.pop(lobby.id, None)
+            if not bucket:
+                del self.open_lobbies[free_slots]
+
+    def _index(self, lobby: Lobby):
+        if lobby.is_open:
+            self.open_lobbies.setdefault(lobby.free_slots, {})[lobby.id] = None
+
+    def add_player(self, lobby: Lobby, player_id: str) -> bool:
+        """Seat a player; False if the lobby is full or no longer waiting"""
+        if not lobby.is_open:
+            return False
+        self._unindex(lobby, lobby.free_slots)
+        lobby.players.add(player_id)
+        self._index(lobby)
+        return True
+
+    def remove_player(self, lobby: Lobby, player_id: str) -> bool:
+        """
+        Unseat a player, deleting the lobby once it is empty
+
+        Returns:
+            bool: True if the lobby was deleted
+        """
+        self._unindex(lobby, lobby.free_slots)
+        lobby.players.discard(player_id)
+        if not lobby.players:
+            self.lobbies.pop(lobby.id, None)
+            return True
+        self._index(lobby)
+        return False
+
+    def set_state(self, lobby: Lobby, state: str):
+        """Change a lobby's state; only 'waiting' lobbies are open to joins"""
+        self._unindex(lobby, lobby.free_slots)
+        lobby.state = state
+        self._index(lobby)
+
+    def find_open(self) -> Optional[Lobby]:
+        """Waiting lobby with the fewest free slots (closest to starting), or None"""
+        for free_slots in range(1, MAX_PLAYERS_PER_LOBBY + 1):
+            bucket = self.open_lobbies.get(free_slots)
+            if bucket:
+                return self.lobbies[next(iter(bucket))]
+        return None
+
+    def list_open(self, limit: int = 20) -> List[Dict]:
+        """Summaries of up to ``limit`` open lobbies, fullest first"""
+        result = []
+        for free_slots in sorted(self.open_lobbies):
+            for lobby_id in self.open_lobbies[free_slots]:
+                if len(result) >= limit:
+                    return result
+                lobby = self.lobbies[lobby_id]
+                result.append({"lobby_id": lobby.id, "name": lobby.name, "players": len(lobby.players),
+                               "max_players": lobby.max_players})
+        return result
+
+    def enqueue(self, player_id: str) -> int:
+        """Add a player to the matchmaking queue; returns their position (1-based)"""
+        self.queue[player_id] = None
+        return len(self.queue)
+
+    def dequeue(self, player_id: str):
+        self.queue.pop(player_id, None)
+
+    def _take_queued(self, count: int) -> List[str]:
+        taken = list(itertools.islice(self.queue, count))
+        for player_id in taken:
+            del self.queue[player_id]
+        return taken
+
+    def match(self) -> List[Tuple[Lobby, List[str]]]:
+        """
+        Place queued players
+
+        Returns:
+            list: (lobby, player ids) pairs; the caller seats each player
+                with add_player and announces the join
+        """
+        placements = []
+        # Top up lobbies that already have players, fullest first
+        for free_slots in range(1, MAX_PLAYERS_PER_LOBBY):
+            for lobby_id in list(self.open_lobbies.get(free_slots, ())):
+                if not self.queue:
+                    return placements
+                placements.append((self.lobbies[lobby_id], self._take_queued(free_slots)))
+
+        # New lobbies once enough players wait to start one
+        while len(self.queue) >= self.min_players:
+            lobby = self.create("Matchmaking")
+            placements.append((lobby, self._take_queued(lobby.max_players)))
+        return placements
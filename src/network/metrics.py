@@ -0,0 +1,84 @@
+# src/network/metrics.py
+"""
+Server counters and a tiny local HTTP endpoint to read them
+"""
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+# Counters reported as totals and as per-second rates. dropped_clients counts
+# every server-side disconnect (send overflow, send timeout, idle reaping).
+COUNTERS = ("messages_in", "messages_out", "bytes_in", "bytes_out",
+            "connections_opened", "connections_closed", "reaped", "dropped_clients")
+
+class ServerMetrics:
+    """
+    Monotonic counters plus per-second rates over a sliding window
+
+    The server bumps counters as traffic happens; ``sample()`` is called
+    once a second to record totals so rates can be reported without
+    touching the hot path. Gauges (connections, queue depth, ...) are read
+    from the server when a report is built.
+    """
+
+    def __init__(self, window: int = 10):
+        for name in COUNTERS:
+            setattr(self, name, 0)
+        self.started = time.monotonic()
+        self.samples: deque = deque(maxlen=window + 1)
+        self.sample()
+
+    def count_in(self, size: int):
+        self.messages_in += 1
+        self.bytes_in += size
+
+    def count_out(self, size: int):
+        self.messages_out += 1
+        self.bytes_out += size
+
+    def sample(self):
+        """Record the current totals (call about once a second)"""
+        self.samples.append((time.monotonic(), {name: getattr(self, name) for name in COUNTERS}))
+
+    def rates(self) -> Dict[str, float]:
+        """Per-second rates over the sampled window"""
+        if len(self.samples) < 2:
+            return {name: 0.0 for name in COUNTERS}
+        (t0, first), (t1, last) = self.samples[0], self.samples[-1]
+        elapsed = max(t1 - t0, 1e-9)
+        return {name: round((last[name] - first[name]) / elapsed, 2) for name in COUNTERS}
+
+    def report(self, gauges: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return {
+            "uptime": round(time.monotonic() - self.started, 1),
+            "totals": {name: getattr(self, name) for name in COUNTERS},
+            "per_second": self.rates(),
+            "gauges": gauges or {},
+        }
+
+async def serve_metrics(report: Callable[[], Dict[str, Any]], host: str, port: int):
+    """
+    Serve ``report()`` as JSON on http://host:port/metrics
+
+    Deliberately minimal: one GET per connection, no keep-alive. Bind it to
+    localhost and scrape it from the host.
+    """
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 5)
+            path = request.split(b" ", 2)[1] if request.count(b" ") >= 2 else b""
+            if path in (b"/metrics", b"/"):
+                status, body = "200 OK", json.dumps(report(), indent=1).encode()
+            else:
+                status, body = "404 Not Found", b'{"error": "not found"}'
+            writer.write(f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+            await writer.drain()
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
@@ -0,0 +1,128 @@
+# src/network/outbox.py
+"""
+Per-client bounded send queues
+"""
+import asyncio
+from collections import deque
+from typing import Optional, Union
+
+from config.settings import SERVER_OUTBOX_LIMIT, SERVER_SEND_TIMEOUT
+
+Payload = Union[str, bytes]
+
+class ClientOutbox:
+    """
+    Bounded send queue for one client, drained by its own writer task
+
+    Broadcasting only enqueues, so a slow client never stalls the sender or
+    the rest of its lobby. Events (JSON messages) queue up to ``limit``;
+    state updates are coalesced so at most one, the newest, is pending -
+    each state message is a delta against the client's acked baseline, so
+    a newer one supersedes any older unsent one.
+
+    A client whose event queue overflows, or whose socket stays blocked
+    longer than ``send_timeout``, is disconnected.
+    """
+
+    def __init__(self, websocket, limit: int = SERVER_OUTBOX_LIMIT, send_timeout: float = SERVER_SEND_TIMEOUT,
+                 metrics=None):
+        self.websocket = websocket
+        self.metrics = metrics
+        self.limit = limit
+        self.send_timeout = send_timeout
+        self.events = deque()
+        self.state: Optional[bytes] = None
+        self.closed = False
+        self.close_reason = ""
+        self.sent = 0
+        self.coalesced = 0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._close_task: Optional[asyncio.Task] = None
+
+    def __len__(self):
+        return len(self.events) + (self.state is not None)
+
+    def start(self):
+        """Start the writer task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def put_event(self, payload: Payload) -> bool:
+        """
+        Queue a message that must be delivered in order
+
+        Returns:
+            bool: False if the client is closed or just overflowed
+        """
+        if self.closed:
+            return False
+        if len(self.events) >= self.limit:
+            self.close("send queue overflow")
+            return False
+        self.events.append(payload)
+        self._wakeup.set()
+        return True
+
+    def put_state(self, payload: bytes) -> bool:
+        """Queue a state update, replacing any state update not yet sent"""
+        if self.closed:
+            return False
+        if self.state is not None:
+            self.coalesced += 1
+        self.state = payload
+        self._wakeup.set()
+        return True
+
+    def close(self, reason: str = ""):
+        """Stop sending and close the connection (the server's receive loop then cleans up)"""
+        if self.closed:
+            return
+        self.closed = True
+        self.close_reason = reason
+        self.events.clear()
+        self.state = None
+        self._wakeup.set()
+        if reason:
+            print(f"Disconnecting client: {reason}")
+            if self.metrics:
+                self.metrics.dropped_clients += 1
+            # Kept so aclose() can wait for it (and the task is not garbage collected)
+            self._close_task = asyncio.create_task(self.websocket.close(code=1013, reason=reason))
+
+    async def _run(self):
+        try:
+            while not self.closed:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                while not self.closed and (self.events or self.state is not None):
+                    if self.events:
+                        payload = self.events.popleft()
+                    else:
+                        payload, self.state = self.state, None
+                    await asyncio.wait_for(self.websocket.send(payload), self.send_timeout)
+                    self.sent += 1
+                    if self.metrics:
+                        self.metrics.count_out(len(payload))
+        except asyncio.TimeoutError:
+            self.close("send timed out")
+        except Exception:
+            # Normally websockets' ConnectionClosed, which the server's receive
+            # loop also sees and cleans up after; any failed send ends writing
+            self.closed = True
+
+    async def aclose(self):
+        """Close and wait for the writer task and any pending connection close to finish"""
+        self.close()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._close_task is not None:
+            try:
+                await self._close_task
+            except Exception:
+                # Already closed from the other side
+                pass
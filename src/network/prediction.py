@@ -0,0 +1,234 @@
+# src/network/prediction.py
+"""
+Client-side netcode: snapshot interpolation, movement prediction, reconciliation
+"""
+import bisect
+from collections import deque
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config.settings import (
+    SIM_TICK_RATE, MAX_FRAME_TIME,
+    CLIENT_INTERP_DELAY, CLIENT_SNAP_DISTANCE, CLIENT_CORRECTION_RATE
+)
+
+# Render clock may run this much faster/slower to drift back to its target
+CLOCK_ADJUST = 0.1
+
+def _lerp_position(a, b, t):
+    return [a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t]
+
+class SnapshotBuffer:
+    """
+    Server states keyed by simulation tick, sampled slightly in the past
+
+    Remote entities are drawn ``delay`` seconds behind the newest state, so
+    there is nearly always a state on each side of the render time to
+    interpolate between, however unevenly packets arrive.
+    """
+
+    def __init__(self, tick_rate: int = SIM_TICK_RATE, delay: float = CLIENT_INTERP_DELAY, max_states: int = 32):
+        self.tick_rate = tick_rate
+        self.delay_ticks = delay * tick_rate
+        self.max_states = max_states
+        self.ticks: List[int] = []
+        self.states: List[Dict[str, Any]] = []
+        self.render_tick: Optional[float] = None
+
+    def __len__(self):
+        return len(self.states)
+
+    def push(self, game_state: Dict[str, Any]):
+        """Add a server game_state (must contain 'tick'); stale duplicates are ignored"""
+        tick = game_state.get("tick")
+        if tick is None or (self.ticks and tick <= self.ticks[0]):
+            return
+        index = bisect.bisect_left(self.ticks, tick)
+        if index < len(self.ticks) and self.ticks[index] == tick:
+            return
+        self.ticks.insert(index, tick)
+        self.states.insert(index, game_state)
+        if len(self.states) > self.max_states:
+            del self.ticks[0]
+            del self.states[0]
+        if self.render_tick is None:
+            self.render_tick = tick - self.delay_ticks
+
+    def advance(self, dt: float):
+        """Move the render clock forward by dt, easing it towards newest tick - delay"""
+        if self.render_tick is None:
+            return
+        target = self.ticks[-1] - self.delay_ticks
+        error = target - self.render_tick
+        if abs(error) > self.tick_rate:
+            # More than a second off (stall or long hitch): jump
+            self.render_tick = target
+            return
+        scale = 1.0 + max(-CLOCK_ADJUST, min(CLOCK_ADJUST, error / self.tick_rate))
+        self.render_tick += dt * self.tick_rate * scale
+
+    def sample(self) -> Optional[Dict[str, Any]]:
+        """
+        Game state at the render tick, with positions interpolated
+
+        Returns:
+            dict: Newer bracketing state with monster and player positions
+                blended from the older one, or None before the first state
+        """
+        if not self.states:
+            return None
+        index = bisect.bisect_right(self.ticks, self.render_tick)
+        if index == 0:
+            return self.states[0]
+        if index >= len(self.states):
+            # Ran past the newest state: hold it rather than extrapolating
+            return self.states[-1]
+
+        older, newer = self.states[index - 1], self.states[index]
+        t = (self.render_tick - self.ticks[index - 1]) / (self.ticks[index] - self.ticks[index - 1])
+        state = dict(newer)
+        for table in ("players", "monsters"):
+            old_records = older.get(table, {})
+            blended = {}
+            for key, record in newer.get(table, {}).items():
+                old = old_records.get(key)
+                if old is not None and "position" in record and "position" in old:
+                    record = dict(record)
+                    record["position"] = _lerp_position(old["position"], record["position"], t)
+                blended[key] = record
+            state[table] = blended
+        return state
+
+class PlayerPredictor:
+    """
+    Predicts the local player's movement ahead of the server
+
+    Every fixed tick the current WASD input is applied locally with the
+    same ``apply_movement`` the server uses and remembered with a sequence
+    number. When a server state arrives, inputs the server has already
+    applied (``input_seq``) are dropped and the rest are replayed on top of
+    the server position. Small differences are blended out over a few
+    frames; large ones snap.
+    """
+
+    def __init__(self, apply_movement: Callable, tick_rate: int = SIM_TICK_RATE,
+                 snap_distance: float = CLIENT_SNAP_DISTANCE, correction_rate: float = CLIENT_CORRECTION_RATE):
+        self.apply_movement = apply_movement
+        self.dt = 1.0 / tick_rate
+        self.snap_distance = snap_distance
+        self.correction_rate = correction_rate
+        # Stand-in with just the attribute apply_movement touches
+        self.player = SimpleNamespace(position=None)
+        self.pending: deque = deque()
+        self.next_seq = 1
+        self.last_input = (0, 0)
+        self.error = [0.0, 0.0]
+        self.corrections = 0
+
+    @property
+    def position(self) -> Optional[Tuple[float, float]]:
+        return self.player.position
+
+    @property
+    def render_position(self) -> Optional[Tuple[float, float]]:
+        """Predicted position plus the part of the last correction not yet blended out"""
+        if self.player.position is None:
+            return None
+        return (self.player.position[0] + self.error[0], self.player.position[1] + self.error[1])
+
+    def step(self, move_x: int, move_y: int) -> Optional[Dict[str, Any]]:
+        """
+        Apply one tick of input locally
+
+        Returns:
+            dict: game_action payload to send, or None if there is nothing
+                new to tell the server (standing still)
+        """
+        decay = max(0.0, 1.0 - self.correction_rate * self.dt)
+        self.error[0] *= decay
+        self.error[1] *= decay
+
+        if self.player.position is None:
+            return None
+        if not (move_x or move_y) and self.last_input == (0, 0):
+            return None
+        self.last_input = (move_x, move_y)
+
+        seq = self.next_seq
+        self.next_seq += 1
+        self.pending.append((seq, move_x, move_y))
+        self.apply_movement(self.player, move_x, move_y, self.dt)
+        return {"action": "move", "x": move_x, "y": move_y, "seq": seq}
+
+    def reconcile(self, server_position, input_seq: int):
+        """Rebase prediction on an authoritative position and replay unacknowledged inputs"""
+        while self.pending and self.pending[0][0] <= input_seq:
+            self.pending.popleft()
+
+        predicted = self.render_position
+        self.player.position = (server_position[0], server_position[1])
+        for _, move_x, move_y in self.pending:
+            self.apply_movement(self.player, move_x, move_y, self.dt)
+
+        if predicted is None:
+            return
+        error_x = predicted[0] - self.player.position[0]
+        error_y = predicted[1] - self.player.position[1]
+        if error_x * error_x + error_y * error_y > self.snap_distance * self.snap_distance:
+            self.error = [0.0, 0.0]
+        else:
+            self.error = [error_x, error_y]
+        if abs(error_x) >= 1 or abs(error_y) >= 1:
+            self.corrections += 1
+
+class ClientSync:
+    """
+    Ties a GameClient to a snapshot buffer and a predictor for its own player
+
+    Call ``update(dt, move_x, move_y)`` once per rendered frame and draw
+    from ``render_state()``. Prediction runs at the server's tick rate, so
+    the local player responds immediately whatever the round-trip time.
+    """
+
+    def __init__(self, client, apply_movement: Callable, tick_rate: int = SIM_TICK_RATE):
+        self.client = client
+        self.tick_rate = tick_rate
+        self.buffer = SnapshotBuffer(tick_rate)
+        self.predictor = PlayerPredictor(apply_movement, tick_rate)
+        self.accumulator = 0.0
+        client.register_callback("game_update", self.on_game_update)
+
+    def on_game_update(self, data: Dict[str, Any]):
+        state = data["game_state"]
+        self.buffer.push(state)
+        record = state.get("players", {}).get(self.client.player_id)
+        if record and "position" in record and record.get("alive", True):
+            self.predictor.reconcile(record["position"], record.get("input_seq", 0))
+
+    async def update(self, dt: float, move_x: int, move_y: int):
+        """Advance the render clock and run (and send) any due prediction ticks"""
+        dt = min(dt, MAX_FRAME_TIME)
+        self.buffer.advance(dt)
+        self.accumulator += dt
+        tick_dt = 1.0 / self.tick_rate
+        while self.accumulator >= tick_dt:
+            self.accumulator -= tick_dt
+            payload = self.predictor.step(move_x, move_y)
+            if payload:
+                action = payload.pop("action")
+                await self.client.send_action(action, **payload)
+
+    def render_state(self) -> Optional[Dict[str, Any]]:
+        """Interpolated state with the local player at its predicted position"""
+        state = self.buffer.sample()
+        position = self.predictor.render_position
+        if state is None or position is None:
+            return state
+        players = dict(state.get("players", {}))
+        me = players.get(self.client.player_id)
+        if me is not None:
+            me = dict(me)
+            me["position"] = [position[0], position[1]]
+            players[self.client.player_id] = me
+            state = dict(state, players=players)
+        return state
@@ -0,0 +1,351 @@
+# src/network/protocol.py
+"""
+Versioned snapshot/delta state sync
+
+The server turns each lobby ``game_state`` into a quantized snapshot with a
+sequence number. Every client is sent a delta against the last snapshot it
+acknowledged (or a full snapshot when it has none), so unchanged fields
+never go over the wire.
+
+Binary layout (little endian)::
+
+    header   B version | B kind | I seq | I baseline
+    json     I length  | utf-8 JSON (globals, players, spawned/changed monsters)
+    monsters I removed count | ids
+             I moved count   | ids | B value format | dx[] | dy[]
+             I hp count      | ids | f hp[]
+
+Monster positions are whole pixels sent as int8/int16 offsets from the
+baseline, and ids are sent as one uint32 followed by uint8 gaps when they
+fit, so a moving monster costs about 3 bytes.
+"""
+import json
+import struct
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+PROTOCOL_VERSION = 1
+
+# Message kinds
+KIND_FULL = 0
+KIND_DELTA = 1
+
+HEADER = struct.Struct("<BBII")
+COUNT = struct.Struct("<I")
+
+# Snapshots kept per lobby for clients that are a few sends behind
+SNAPSHOT_HISTORY = 32
+
+# Fields of a monster record that are packed rather than sent as JSON
+PACKED_MONSTER_FIELDS = ("x", "y", "hp")
+
+class ProtocolError(Exception):
+    """Malformed or incompatible state message"""
+
+def empty_snapshot() -> Dict[str, Any]:
+    """Snapshot of nothing; a full snapshot is a delta against this"""
+    return {"seq": 0, "globals": {}, "players": {}, "monsters": {}}
+
+def make_snapshot(seq: int, game_state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build a quantized snapshot of a lobby game_state
+
+    Args:
+        seq (int): Sequence number of the snapshot (> 0)
+        game_state (dict): Server state with 'players' (id -> record) and
+            'monsters' (int id -> record with 'position' and 'hp')
+
+    Returns:
+        dict: Snapshot with 'seq', 'globals', 'players' and 'monsters'
+    """
+    globals_ = {}
+    for key, value in game_state.items():
+        if key in ("players", "monsters"):
+            continue
+        globals_[key] = round(value, 1) if isinstance(value, float) else value
+
+    players = {}
+    for pid, record in game_state.get("players", {}).items():
+        record = dict(record)
+        if "position" in record:
+            record["position"] = [int(round(record["position"][0])), int(round(record["position"][1]))]
+        if isinstance(record.get("hp"), float):
+            record["hp"] = round(record["hp"], 1)
+        players[str(pid)] = record
+
+    monsters = {}
+    for mid, record in game_state.get("monsters", {}).items():
+        flat = {k: v for k, v in record.items() if k != "position"}
+        flat["x"] = int(round(record["position"][0]))
+        flat["y"] = int(round(record["position"][1]))
+        flat["hp"] = round(float(record.get("hp", 0)), 1)
+        monsters[int(mid)] = flat
+
+    return {"seq": seq, "globals": globals_, "players": players, "monsters": monsters}
+
+def snapshot_to_game_state(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a snapshot back to the game_state layout used by clients"""
+    state = dict(snapshot["globals"])
+    state["players"] = {pid: dict(record) for pid, record in snapshot["players"].items()}
+    monsters = {}
+    for mid, record in snapshot["monsters"].items():
+        monster = {k: v for k, v in record.items() if k not in ("x", "y")}
+        monster["position"] = [record["x"], record["y"]]
+        monsters[mid] = monster
+    state["monsters"] = monsters
+    return state
+
+def _diff_records(base: Dict, new: Dict) -> Tuple[Dict, List]:
+    """Field-level diff of two id -> record tables (full record for new ids)"""
+    changed = {}
+    for key, record in new.items():
+        old = base.get(key)
+        if old is None:
+            changed[key] = record
+            continue
+        fields = {f: v for f, v in record.items() if old.get(f) != v}
+        if fields:
+            changed[key] = fields
+    removed = [key for key in base if key not in new]
+    return changed, removed
+
+def diff_snapshots(base: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compute the delta that turns base into new
+
+    Returns:
+        dict: Delta with 'seq', 'baseline' and per-table changes
+    """
+    globals_changed = {k: v for k, v in new["globals"].items() if base["globals"].get(k) != v}
+    globals_removed = [k for k in base["globals"] if k not in new["globals"]]
+    players_changed, players_removed = _diff_records(base["players"], new["players"])
+
+    spawned, changed = {}, {}
+    moved_ids, moved_dx, moved_dy = [], [], []
+    hp_ids, hp_values = [], []
+    base_monsters = base["monsters"]
+    for mid, record in new["monsters"].items():
+        old = base_monsters.get(mid)
+        if old is None:
+            spawned[mid] = record
+            continue
+        if record["x"] != old["x"] or record["y"] != old["y"]:
+            moved_ids.append(mid)
+            moved_dx.append(record["x"] - old["x"])
+            moved_dy.append(record["y"] - old["y"])
+        if record["hp"] != old["hp"]:
+            hp_ids.append(mid)
+            hp_values.append(record["hp"])
+        fields = {f: v for f, v in record.items()
+                  if f not in PACKED_MONSTER_FIELDS and old.get(f) != v}
+        if fields:
+            changed[mid] = fields
+
+    return {
+        "seq": new["seq"],
+        "baseline": base["seq"],
+        "globals": globals_changed,
+        "globals_removed": globals_removed,
+        "players": players_changed,
+        "players_removed": players_removed,
+        "monsters_spawned": spawned,
+        "monsters_changed": changed,
+        "monsters_removed": [mid for mid in base_monsters if mid not in new["monsters"]],
+        "monsters_moved": (moved_ids, moved_dx, moved_dy),
+        "monsters_hp": (hp_ids, hp_values),
+    }
+
+def apply_delta(base: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Apply a delta to its baseline snapshot
+
+    Returns:
+        dict: New snapshot (base is left untouched)
+    """
+    if delta["baseline"] != base["seq"]:
+        raise ProtocolError(f"Delta against {delta['baseline']} applied to snapshot {base['seq']}")
+
+    globals_ = dict(base["globals"])
+    globals_.update(delta["globals"])
+    for key in delta["globals_removed"]:
+        globals_.pop(key, None)
+
+    players = {pid: dict(record) for pid, record in base["players"].items()}
+    for pid in delta["players_removed"]:
+        players.pop(pid, None)
+    for pid, fields in delta["players"].items():
+        players.setdefault(pid, {}).update(fields)
+
+    monsters = {mid: dict(record) for mid, record in base["monsters"].items()}
+    for mid in delta["monsters_removed"]:
+        monsters.pop(mid, None)
+    for mid, record in delta["monsters_spawned"].items():
+        monsters[mid] = dict(record)
+    for mid, fields in delta["monsters_changed"].items():
+        monsters[mid].update(fields)
+    for mid, dx, dy in zip(*delta["monsters_moved"]):
+        monsters[mid]["x"] += dx
+        monsters[mid]["y"] += dy
+    for mid, hp in zip(*delta["monsters_hp"]):
+        monsters[mid]["hp"] = hp
+
+    return {"seq": delta["seq"], "globals": globals_, "players": players, "monsters": monsters}
+
+def _pack_ids(out: bytearray, ids: List[int]):
+    """Append sorted ids as a count, then uint32 first + uint8 gaps when possible"""
+    out += COUNT.pack(len(ids))
+    if not ids:
+        return
+    gaps = [b - a for a, b in zip(ids, ids[1:])]
+    if all(0 < g < 256 for g in gaps):
+        out += struct.pack("<BI", 0, ids[0])
+        out += bytes(gaps)
+    else:
+        out += struct.pack("<B", 1)
+        out += array("I", ids).tobytes()
+
+def _unpack_ids(data: memoryview, offset: int) -> Tuple[List[int], int]:
+    (count,) = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    if not count:
+        return [], offset
+    mode = data[offset]
+    offset += 1
+    if mode == 0:
+        (first,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        ids = [first]
+        for gap in data[offset:offset + count - 1]:
+            ids.append(ids[-1] + gap)
+        return ids, offset + count - 1
+    ids = array("I")
+    ids.frombytes(data[offset:offset + 4 * count])
+    return ids.tolist(), offset + 4 * count
+
+def _sorted_columns(ids, *columns):
+    order = sorted(range(len(ids)), key=ids.__getitem__)
+    return [ids[i] for i in order], [[col[i] for i in order] for col in columns]
+
+def encode_delta(delta: Dict[str, Any]) -> bytes:
+    """Serialize a delta (or full snapshot, baseline 0) to bytes"""
+    kind = KIND_FULL if delta["baseline"] == 0 else KIND_DELTA
+    out = bytearray(HEADER.pack(PROTOCOL_VERSION, kind, delta["seq"], delta["baseline"]))
+
+    meta = {
+        "g": delta["globals"],
+        "gr": delta["globals_removed"],
+        "p": delta["players"],
+        "pr": delta["players_removed"],
+        "ms": {str(mid): r for mid, r in delta["monsters_spawned"].items()},
+        "mc": {str(mid): r for mid, r in delta["monsters_changed"].items()},
+    }
+    payload = json.dumps(meta, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    out += COUNT.pack(len(payload))
+    out += payload
+
+    _pack_ids(out, sorted(delta["monsters_removed"]))
+
+    ids, (dx, dy) = _sorted_columns(*delta["monsters_moved"])
+    _pack_ids(out, ids)
+    if ids:
+        fmt = "b" if all(-128 <= v <= 127 for v in dx + dy) else "h"
+        out += fmt.encode("ascii")
+        out += array(fmt, dx).tobytes()
+        out += array(fmt, dy).tobytes()
+
+    ids, (hp,) = _sorted_columns(*delta["monsters_hp"])
+    _pack_ids(out, ids)
+    out += array("f", hp).tobytes()
+    return bytes(out)
+
+def decode_delta(data: bytes) -> Dict[str, Any]:
+    """Parse bytes produced by encode_delta"""
+    view = memoryview(data)
+    try:
+        version, kind, seq, baseline = HEADER.unpack_from(view, 0)
+        if version != PROTOCOL_VERSION:
+            raise ProtocolError(f"Unsupported protocol version {version}")
+        offset = HEADER.size
+
+        (length,) = COUNT.unpack_from(view, offset)
+        offset += COUNT.size
+        meta = json.loads(bytes(view[offset:offset + length]).decode("utf-8"))
+        offset += length
+
+        removed, offset = _unpack_ids(view, offset)
+
+        moved_ids, offset = _unpack_ids(view, offset)
+        dx, dy = [], []
+        if moved_ids:
+            fmt = chr(view[offset])
+            offset += 1
+            size = array(fmt).itemsize * len(moved_ids)
+            dx = array(fmt, bytes(view[offset:offset + size])).tolist()
+            dy = array(fmt, bytes(view[offset + size:offset + 2 * size])).tolist()
+            offset += 2 * size
+
+        hp_ids, offset = _unpack_ids(view, offset)
+        hp = array("f", bytes(view[offset:offset + 4 * len(hp_ids)]))
+        # float32 -> the 1-decimal value the server quantized to
+        hp_values = [round(v, 1) for v in hp]
+    except (struct.error, ValueError, IndexError) as e:
+        raise ProtocolError(f"Malformed state message: {e}") from e
+
+    return {
+        "seq": seq,
+        "baseline": baseline if kind == KIND_DELTA else 0,
+        "globals": meta["g"],
+        "globals_removed": meta["gr"],
+        "players": meta["p"],
+        "players_removed": meta["pr"],
+        "monsters_spawned": {int(mid): r for mid, r in meta["ms"].items()},
+        "monsters_changed": {int(mid): r for mid, r in meta["mc"].items()},
+        "monsters_removed": removed,
+        "monsters_moved": (moved_ids, dx, dy),
+        "monsters_hp": (hp_ids, hp_values),
+    }
+
+class SnapshotHistory:
+    """
+    Recent snapshots of one lobby, plus encoded deltas cached per baseline
+
+    Clients that acked the same snapshot share a single encoded message.
+    """
+
+    def __init__(self, max_snapshots: int = SNAPSHOT_HISTORY):
+        self.max_snapshots = max_snapshots
+        self.snapshots: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self.seq = 0
+        self._encoded: Dict[int, bytes] = {}
+
+    @property
+    def latest(self) -> Optional[Dict[str, Any]]:
+        return self.snapshots[self.seq] if self.seq else None
+
+    def push(self, game_state: Dict[str, Any]) -> Dict[str, Any]:
+        """Record the current game_state as the next snapshot"""
+        self.seq += 1
+        snapshot = make_snapshot(self.seq, game_state)
+        self.snapshots[self.seq] = snapshot
+        while len(self.snapshots) > self.max_snapshots:
+            self.snapshots.popitem(last=False)
+        self._encoded.clear()
+        return snapshot
+
+    def encode_for(self, acked_seq: Optional[int]) -> bytes:
+        """
+        Encode the latest snapshot for a client
+
+        Args:
+            acked_seq (int): Last snapshot the client acknowledged, or None
+
+        Returns:
+            bytes: Delta against acked_seq if still in history, else a full snapshot
+        """
+        baseline = acked_seq if acked_seq in self.snapshots else 0
+        data = self._encoded.get(baseline)
+        if data is None:
+            base = self.snapshots[baseline] if baseline else empty_snapshot()
+            data = self._encoded[baseline] = encode_delta(diff_snapshots(base, self.latest))
+        return data
@@ -4,8 +4,16 @@ import json
 import asyncio
 import websockets
 from dataclasses import dataclass
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
 from queue import Queue
+from .outbox import ClientOutbox
+from config.settings import (
+    SERVER_WORKERS, MIN_PLAYERS_TO_START, SERVER_HEARTBEAT_INTERVAL, SERVER_IDLE_TIMEOUT, SERVER_METRICS_PORT
+)
+from .metrics import ServerMetrics, serve_metrics
+from .lobby_registry import Lobby, LobbyRegistry
+from .shard import ShardPool
+from .simulation import LobbySimulation
 
 @dataclass
 class NetworkPlayer:
@@ -14,41 +22,113 @@ class NetworkPlayer:
     websocket: websockets.WebSocketServerProtocol
     lobby_id: str = None
     ready: bool = False
+    acked_seq: Optional[int] = None  # Last state snapshot the client confirmed
+    outbox: Optional[ClientOutbox] = None
+    last_seen: float = 0.0  # Event loop time of the last message from the client
+    heartbeat_sent: bool = False
 
 class GameServer:
-    def __init__(self, host: str = "localhost", port: int = 8765):
+    def __init__(self, host: str = "localhost", port: int = 8765, workers: int = SERVER_WORKERS,
+                 metrics_port: int = SERVER_METRICS_PORT):
         self.host = host
         self.port = port
-        self.lobbies: Dict[str, 'Lobby'] = {}
+        self.metrics_port = metrics_port
+        self.metrics = ServerMetrics()
+        self.registry = LobbyRegistry()
+        self.lobbies: Dict[str, Lobby] = self.registry.lobbies
         self.players: Dict[str, NetworkPlayer] = {}
         self.game_states: Dict[str, dict] = {}
+        # Matches run on worker processes when sharded, otherwise in this process
+        self.shards: Optional[ShardPool] = ShardPool(workers) if workers > 0 else None
 
     async def start(self):
+        if self.shards:
+            self.shards.start(self.on_shard_message)
         server = await websockets.serve(self.handle_client, self.host, self.port)
-        print(f"Shadow Echo Server running on {self.host}:{self.port}")
-        await server.wait_closed()
+        print(f"Shadow Echo Server running on {self.host}:{self.port}"
+              f"{f' with {self.shards.size} lobby workers' if self.shards else ''}")
+        metrics_server = None
+        if self.metrics_port:
+            # Local only: metrics are for the host's monitoring, not for players
+            metrics_server = await serve_metrics(self.metrics_report, "127.0.0.1", self.metrics_port)
+            print(f"Metrics on http://127.0.0.1:{self.metrics_port}/metrics")
+        housekeeping = asyncio.create_task(self.housekeeping())
+        try:
+            await server.wait_closed()
+        finally:
+            housekeeping.cancel()
+            if metrics_server:
+                metrics_server.close()
+            if self.shards:
+                self.shards.shutdown()
 
-    async def handle_client(self, websocket, path):
+    async def housekeeping(self):
+        """Once a second: sample metrics, heartbeat quiet clients and reap dead ones"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(1.0)
+            self.metrics.sample()
+            now = loop.time()
+            for player in list(self.players.values()):
+                idle = now - player.last_seen
+                if idle > SERVER_IDLE_TIMEOUT:
+                    # Half-open peers never make recv() fail, so drop them here
+                    self.metrics.reaped += 1
+                    player.outbox.close("idle timeout")
+                    await self.remove_player(player.id)
+                elif idle > SERVER_HEARTBEAT_INTERVAL and not player.heartbeat_sent:
+                    player.heartbeat_sent = True
+                    self.send_to(player, {"type": "heartbeat"})
+
+    def metrics_report(self) -> dict:
+        outboxes = [p.outbox for p in self.players.values() if p.outbox]
+        depths = [len(outbox) for outbox in outboxes]
+        gauges = {
+            "connections": len(self.players),
+            "lobbies": len(self.lobbies),
+            "lobbies_in_game": sum(1 for lobby in self.lobbies.values() if lobby.state == "in_game"),
+            "open_lobbies": sum(len(bucket) for bucket in self.registry.open_lobbies.values()),
+            "matchmaking_queue": len(self.registry.queue),
+            "send_queue_total": sum(depths),
+            "send_queue_max": max(depths, default=0),
+            "states_coalesced": sum(outbox.coalesced for outbox in outboxes),
+        }
+        if self.shards:
+            gauges["worker_players"] = list(self.shards.player_load)
+            gauges["worker_lobbies"] = list(self.shards.lobby_load)
+        return self.metrics.report(gauges)
+
+    # websockets < 13 also passes the request path; newer versions pass only the connection
+    async def handle_client(self, websocket, path=None):
         player_id = str(id(websocket))
         try:
             data = await websocket.recv()
+            self.metrics.count_in(len(data))
             initial_data = json.loads(data)
 
             if initial_data["type"] == "join":
                 player = NetworkPlayer(
                     id=player_id,
                     name=initial_data["name"],
-                    websocket=websocket
+                    websocket=websocket,
+                    outbox=ClientOutbox(websocket, metrics=self.metrics),
+                    last_seen=asyncio.get_running_loop().time()
                 )
+                self.metrics.connections_opened += 1
+                player.outbox.start()
                 self.players[player_id] = player
 
-                await websocket.send(json.dumps({
+                # Lobby lists are fetched on demand ('list_lobbies') or skipped via 'find_match'
+                self.send_to(player, {
                     "type": "connected",
                     "player_id": player_id,
-                    "available_lobbies": list(self.lobbies.keys())
-                }))
+                    "open_lobbies": sum(len(b) for b in self.registry.open_lobbies.values())
+                })
 
                 async for message in websocket:
+                    self.metrics.count_in(len(message))
+                    player.last_seen = asyncio.get_running_loop().time()
+                    player.heartbeat_sent = False
                     await self.handle_message(player_id, json.loads(message))
 
         except websockets.exceptions.ConnectionClosed:
@@ -63,19 +143,52 @@ class GameServer:
             return
 
         msg_type = data.get("type")
-        if msg_type == "create_lobby":
+        if msg_type == "batch":
+            # Messages a client gathered over one flush interval, in send order
+            for message in data.get("messages", []):
+                if isinstance(message, dict) and message.get("type") != "batch":
+                    await self.handle_message(player_id, message)
+
+        elif msg_type == "create_lobby":
+            if player.lobby_id:
+                await self.leave_lobby(player_id)
             lobby_id = self.create_lobby(data.get("name", "New Lobby"))
             await self.join_lobby(player_id, lobby_id)
 
         elif msg_type == "join_lobby":
             lobby_id = data.get("lobby_id")
             if lobby_id in self.lobbies:
+                if player.lobby_id and player.lobby_id != lobby_id and self.lobbies[lobby_id].is_open:
+                    await self.leave_lobby(player_id)
                 await self.join_lobby(player_id, lobby_id)
             else:
-                await player.websocket.send(json.dumps({
+                self.send_to(player, {
                     "type": "error",
                     "message": "Lobby not found"
-                }))
+                })
+
+        elif msg_type == "list_lobbies":
+            try:
+                limit = max(0, min(int(data.get("limit", 20)), 100))
+            except (TypeError, ValueError, OverflowError):
+                # A malformed limit from the client must not drop its connection
+                limit = 20
+            self.send_to(player, {
+                "type": "lobby_list",
+                "lobbies": self.registry.list_open(limit)
+            })
+
+        elif msg_type == "find_match":
+            # Players stay seated in a finished lobby until they move on
+            if player.lobby_id:
+                await self.leave_lobby(player_id)
+            position = self.registry.enqueue(player_id)
+            self.send_to(player, {"type": "matchmaking", "status": "queued", "position": position})
+            await self.run_matchmaking()
+
+        elif msg_type == "cancel_match":
+            self.registry.dequeue(player_id)
+            self.send_to(player, {"type": "matchmaking", "status": "cancelled"})
 
         elif msg_type == "ready":
             if player.lobby_id:
@@ -86,103 +199,226 @@ class GameServer:
             if player.lobby_id:
                 await self.handle_game_action(player.lobby_id, player_id, data)
 
+        elif msg_type == "state_ack":
+            # seq 0 means the client lost its baseline and needs a full snapshot
+            player.acked_seq = data.get("seq") or None
+
+        elif msg_type == "heartbeat_ack":
+            # Receiving it already refreshed last_seen
+            pass
+
+        elif msg_type == "ping":
+            # Echo the client's timestamp so it can measure round-trip time
+            self.send_to(player, {"type": "pong", "t": data.get("t")})
+
     def create_lobby(self, name: str) -> str:
-        lobby_id = f"lobby_{len(self.lobbies)}"
-        self.lobbies[lobby_id] = Lobby(lobby_id, name)
-        return lobby_id
+        return self.registry.create(name).id
+
+    async def run_matchmaking(self):
+        """Seat queued players in open lobbies, or new ones once enough are waiting"""
+        for lobby, player_ids in self.registry.match():
+            for pid in player_ids:
+                await self.join_lobby(pid, lobby.id)
 
     async def join_lobby(self, player_id: str, lobby_id: str):
         player = self.players[player_id]
         lobby = self.lobbies[lobby_id]
 
-        if len(lobby.players) < 5:
+        if player_id in lobby.players:
+            return
+        if self.registry.add_player(lobby, player_id):
+            self.registry.dequeue(player_id)
             player.lobby_id = lobby_id
-            lobby.players.add(player_id)
+            player.ready = False
             await self.broadcast_to_lobby(lobby_id, {
                 "type": "player_joined",
+                "lobby_id": lobby_id,
                 "player_id": player_id,
                 "player_name": player.name,
                 "current_players": len(lobby.players)
             })
         else:
-            await player.websocket.send(json.dumps({
+            self.send_to(player, {
                 "type": "error",
-                "message": "Lobby is full"
-            }))
+                "message": "Lobby is full" if lobby.state == "waiting" else "Lobby is not accepting players"
+            })
 
     async def check_lobby_start(self, lobby_id: str):
         lobby = self.lobbies[lobby_id]
         ready_count = sum(1 for pid in lobby.players if self.players[pid].ready)
-        if ready_count == len(lobby.players) and len(lobby.players) >= 3:
+        if ready_count == len(lobby.players) and len(lobby.players) >= MIN_PLAYERS_TO_START \
+                and lobby.state == "waiting":
             await self.start_game(lobby_id)
 
     async def start_game(self, lobby_id: str):
         lobby = self.lobbies[lobby_id]
-        lobby.state = "in_game"
-        game_state = {
-            "phase": "preparation",
-            "day_count": 0,
-            "time_left": 60,
-            "players": {},
-            "monsters": [],
-            "npcs": self.create_npcs()
-        }
-        roles = ["♕", "♛", "☢"]
-        import random
-        random.shuffle(roles)
-        for i, pid in enumerate(lobby.players):
-            role = roles[i % len(roles)]
-            game_state["players"][pid] = {
-                "hp": 100,
-                "role": role,
-                "cards": [],
-                "position": [100 + i * 50, 400]
-            }
-        self.game_states[lobby_id] = game_state
+        self.registry.set_state(lobby, "in_game")
+        player_ids = sorted(lobby.players)
+        for pid in player_ids:
+            self.players[pid].acked_seq = None
+
+        player_names = [self.players[pid].name for pid in player_ids]
+
         await self.broadcast_to_lobby(lobby_id, {
-            "type": "game_started",
-            "game_state": game_state
+            "type": "game_started"
         })
+        if self.shards:
+            # The worker replies with the initial state, then one per send tick
+            lobby.worker = self.shards.start_lobby(lobby_id, player_ids, player_names)
+            if lobby.worker is not None:
+                return
+            # Every worker has died: run the match here instead
+
+        # The lobby's match runs on the server; clients only send commands
+        lobby.simulation = LobbySimulation(
+            player_ids,
+            player_names,
+            on_state=lambda sim: self.on_simulation_state(lobby_id, sim)
+        )
+        await self.publish_state(lobby_id, lobby.simulation.get_state(), [])
+        lobby.sim_task = asyncio.create_task(self.run_simulation(lobby_id))
+
+    async def run_simulation(self, lobby_id: str):
+        lobby = self.lobbies[lobby_id]
+        summary = None
+        reason = "stopped"
+        try:
+            await lobby.simulation.run()
+            if lobby.simulation.is_over():
+                summary = lobby.simulation.summary()
+        except Exception as e:
+            print(f"Lobby {lobby_id} simulation failed: {e!r}")
+            reason = "error"
+        finally:
+            await self.finish_game(lobby_id, summary, reason)
 
-    def create_npcs(self):
-        return []  # Placeholder for NPC list
+    async def finish_game(self, lobby_id: str, summary: Optional[dict], reason: str = "stopped"):
+        """
+        Announce the end of a match and close the lobby
+
+        Args:
+            summary: Result of the match, None if it was stopped early
+                (crash, dead worker); clients are told anyway so they can
+                go back to the lobby list
+            reason: Why a match without a summary ended ("stopped", "error")
+        """
+        if lobby_id not in self.lobbies:
+            # Everyone left and the lobby was deleted
+            return
+        message = {"type": "game_over", "summary": summary}
+        if summary is None:
+            message["reason"] = reason
+        await self.broadcast_to_lobby(lobby_id, message)
+        self.registry.set_state(self.lobbies[lobby_id], "finished")
+
+    async def on_simulation_state(self, lobby_id: str, simulation: LobbySimulation):
+        """Publish an in-process simulation's state (called at the send rate)"""
+        await self.publish_state(lobby_id, simulation.get_state(), simulation.take_results())
+
+    async def on_shard_message(self, msg: tuple):
+        """Handle a message from a lobby worker process"""
+        kind, lobby_id = msg[0], msg[1]
+        if lobby_id not in self.lobbies:
+            return
+        if kind == "state":
+            await self.publish_state(lobby_id, msg[2], msg[3])
+        elif kind == "game_over":
+            await self.finish_game(lobby_id, msg[2], msg[3])
+
+    async def publish_state(self, lobby_id: str, state: dict, results: List[str]):
+        """Broadcast command results and the latest simulated state"""
+        if lobby_id not in self.lobbies:
+            return
+        for result in results:
+            # Results are one-off events, not part of the synced state
+            await self.broadcast_to_lobby(lobby_id, {
+                "type": "action_result",
+                "action_result": result
+            })
+        self.game_states[lobby_id] = state
+        await self.sync_lobby_state(lobby_id)
 
     async def handle_game_action(self, lobby_id: str, player_id: str, data: dict):
-        game_state = self.game_states[lobby_id]
-        command = data.get("command")
-        result = f"Player {player_id} executed {command}"
-        game_state.setdefault("results", []).append(result)
-        await self.broadcast_to_lobby(lobby_id, {
-            "type": "game_update",
-            "game_state": game_state,
-            "action_result": result
-        })
+        lobby = self.lobbies[lobby_id]
+        # Applied by the simulation at the next tick boundary
+        if lobby.worker is not None:
+            self.shards.send(lobby_id, "command", player_id, data)
+        elif lobby.simulation is not None:
+            lobby.simulation.queue_command(player_id, data)
+
+    async def sync_lobby_state(self, lobby_id: str):
+        """Snapshot the lobby state and send each member a binary delta against its acked baseline"""
+        lobby = self.lobbies[lobby_id]
+        snapshot = lobby.history.push(self.game_states[lobby_id])
+        if lobby.interest:
+            # Each member in the match only gets what is near their own player
+            lobby.interest.update(snapshot)
+        for pid in lobby.players:
+            player = self.players[pid]
+            if lobby.interest and pid in lobby.interest.views:
+                player.outbox.put_state(lobby.interest.encode_for(pid, player.acked_seq))
+            else:
+                # Encoded once per distinct baseline; unsent older state is replaced
+                player.outbox.put_state(lobby.history.encode_for(player.acked_seq))
+
+    def send_to(self, player: NetworkPlayer, message: dict):
+        """Queue a JSON message for one player"""
+        player.outbox.put_event(json.dumps(message))
 
     async def broadcast_to_lobby(self, lobby_id: str, message: dict):
+        """Encode once and queue for every member; never waits on slow clients"""
+        payload = json.dumps(message)
         for pid in self.lobbies[lobby_id].players:
-            try:
-                await self.players[pid].websocket.send(json.dumps(message))
-            except:
-                pass
+            # Overflowing clients are closed by their outbox and cleaned up on disconnect
+            self.players[pid].outbox.put_event(payload)
+
+    async def leave_lobby(self, player_id: str):
+        """Take a player out of their lobby; empty lobbies are stopped and deleted"""
+        player = self.players[player_id]
+        lobby = self.lobbies.get(player.lobby_id)
+        player.lobby_id = None
+        player.ready = False
+        if lobby is None:
+            return
+
+        deleted = self.registry.remove_player(lobby, player_id)
+        if lobby.worker is not None:
+            self.shards.send(lobby.id, "remove_player", player_id)
+            if deleted:
+                self.shards.send(lobby.id, "stop")
+        elif lobby.simulation:
+            lobby.simulation.remove_player(player_id)
+            if deleted:
+                lobby.simulation.stop()
+
+        if deleted:
+            self.game_states.pop(lobby.id, None)
+            return
+        await self.broadcast_to_lobby(lobby.id, {
+            "type": "player_left",
+            "player_id": player_id
+        })
+        # Someone waiting can take the freed seat
+        if lobby.state == "waiting" and self.registry.queue:
+            await self.run_matchmaking()
 
     async def remove_player(self, player_id: str):
         player = self.players.get(player_id)
+        if player:
+            self.metrics.connections_closed += 1
+        self.registry.dequeue(player_id)
         if player and player.lobby_id:
-            self.lobbies[player.lobby_id].players.discard(player_id)
-            await self.broadcast_to_lobby(player.lobby_id, {
-                "type": "player_left",
-                "player_id": player_id
-            })
+            await self.leave_lobby(player_id)
         self.players.pop(player_id, None)
-
-class Lobby:
-    def __init__(self, id: str, name: str):
-        self.id = id
-        self.name = name
-        self.players: Set[str] = set()
-        self.state = "waiting"
-        self.max_players = 5
+        if player and player.outbox:
+            await player.outbox.aclose()
 
 if __name__ == "__main__":
-    server = GameServer()
+    import sys
+    # Optional lobby worker count (--workers=4)
+    workers = SERVER_WORKERS
+    for arg in sys.argv[1:]:
+        if arg.startswith("--workers="):
+            workers = int(arg.split("=", 1)[1])
+    server = GameServer(workers=workers)
     asyncio.run(server.start())
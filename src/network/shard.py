@@ -0,0 +1,332 @@
+# src/network/shard.py
+"""
+Lobby simulations spread over worker processes
+"""
+import asyncio
+import multiprocessing
+import pickle
+import socket
+import struct
+from typing import Any, Callable, Dict, List, Optional
+
+from .simulation import LobbySimulation
+
+# Messages are plain tuples, pickled and length-prefixed over a socketpair:
+#   front -> worker: ("start", lobby_id, player_ids, player_names, seed)
+#                    ("command", lobby_id, player_id, data)
+#                    ("remove_player", lobby_id, player_id)
+#                    ("stop", lobby_id)
+#                    ("shutdown",)
+#   worker -> front: ("state", lobby_id, game_state, results)
+#                    ("game_over", lobby_id, summary or None if stopped early,
+#                     reason: "stopped" or "error" when there is no summary)
+
+_HEADER = struct.Struct("!I")
+
+class _Channel:
+    """
+    Message stream over one end of a socketpair that never blocks the event loop
+
+    send() queues the encoded message and writes what the socket accepts;
+    the rest is written from a ``loop.add_writer`` callback. Neither side
+    can then stall on a full pipe while the other is stalled the same way.
+    Once the peer is gone (EOF or a write error) the channel closes itself,
+    calls ``on_closed`` once and drops further sends.
+    """
+
+    def __init__(self, sock: socket.socket, on_message: Callable[[tuple], Any], on_closed: Callable[[], Any]):
+        self.sock = sock
+        self.on_message = on_message
+        self.on_closed = on_closed
+        self.closed = False
+        self._inbox = bytearray()
+        self._outbox = bytearray()
+        self._writing = False
+        self._loop = asyncio.get_running_loop()
+        sock.setblocking(False)
+        self._loop.add_reader(sock.fileno(), self._on_readable)
+
+    @property
+    def pending(self) -> int:
+        """Bytes queued but not yet written"""
+        return len(self._outbox)
+
+    def send(self, msg: tuple):
+        if self.closed:
+            return
+        payload = pickle.dumps(msg, pickle.HIGHEST_PROTOCOL)
+        self._outbox += _HEADER.pack(len(payload))
+        self._outbox += payload
+        if not self._writing:
+            self._on_writable()
+
+    def _on_writable(self):
+        try:
+            while self._outbox:
+                sent = self.sock.send(self._outbox)
+                del self._outbox[:sent]
+        except BlockingIOError:
+            if not self._writing:
+                self._writing = True
+                self._loop.add_writer(self.sock.fileno(), self._on_writable)
+            return
+        except OSError:
+            self._lost()
+            return
+        if self._writing:
+            self._writing = False
+            self._loop.remove_writer(self.sock.fileno())
+
+    def _on_readable(self):
+        eof = False
+        try:
+            while True:
+                data = self.sock.recv(1 << 16)
+                if not data:
+                    eof = True
+                    break
+                self._inbox += data
+        except BlockingIOError:
+            pass
+        except OSError:
+            eof = True
+        # Messages that arrived before EOF still count (a worker's last game_over)
+        while len(self._inbox) >= _HEADER.size:
+            (size,) = _HEADER.unpack_from(self._inbox)
+            if len(self._inbox) < _HEADER.size + size:
+                break
+            msg = pickle.loads(self._inbox[_HEADER.size:_HEADER.size + size])
+            del self._inbox[:_HEADER.size + size]
+            self.on_message(msg)
+            if self.closed:
+                return
+        if eof:
+            self._lost()
+
+    def _lost(self):
+        if not self.closed:
+            self.close()
+            self.on_closed()
+
+    def flush(self, timeout: float):
+        """Write whatever is still queued, waiting up to ``timeout`` (used on shutdown)"""
+        if self.closed or not self._outbox:
+            return
+        try:
+            self.sock.settimeout(timeout)
+            self.sock.sendall(self._outbox)
+            self._outbox.clear()
+        except OSError:
+            pass
+        finally:
+            if not self.closed:
+                self.sock.setblocking(False)
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self._loop.remove_reader(self.sock.fileno())
+        if self._writing:
+            self._writing = False
+            self._loop.remove_writer(self.sock.fileno())
+        self._outbox.clear()
+        self.sock.close()
+
+def worker_main(sock: socket.socket, index: int):
+    """Entry point of a worker process: host lobby simulations until shut down"""
+    asyncio.run(_LobbyHost(sock, index).serve())
+
+class _LobbyHost:
+    """Runs the simulations placed on one worker process"""
+
+    def __init__(self, sock: socket.socket, index: int):
+        self.sock = sock
+        self.index = index
+        self.channel: Optional[_Channel] = None
+        self.simulations: Dict[str, LobbySimulation] = {}
+        self.tasks: Dict[str, asyncio.Task] = {}
+        self.done: Optional[asyncio.Future] = None
+
+    async def serve(self):
+        loop = asyncio.get_running_loop()
+        self.done = loop.create_future()
+        # Front process went away: the channel closes and the worker stops
+        self.channel = _Channel(self.sock, self._handle, self._shutdown)
+        try:
+            await self.done
+        finally:
+            for simulation in self.simulations.values():
+                simulation.stop()
+            if self.tasks:
+                await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+            # Deliver the last game_over messages before exiting
+            self.channel.flush(timeout=5)
+            self.channel.close()
+
+    def _shutdown(self):
+        if not self.done.done():
+            self.done.set_result(None)
+
+    def _handle(self, msg: tuple):
+        kind = msg[0]
+        if kind == "start":
+            _, lobby_id, player_ids, player_names, seed = msg
+            simulation = LobbySimulation(player_ids, player_names, seed=seed,
+                                         on_state=lambda sim: self._send_state(lobby_id, sim))
+            self.simulations[lobby_id] = simulation
+            # Initial state before the first tick, as the in-process server does
+            self._send_state_now(lobby_id, simulation)
+            self.tasks[lobby_id] = asyncio.create_task(self._run(lobby_id, simulation))
+        elif kind == "command":
+            simulation = self.simulations.get(msg[1])
+            if simulation:
+                simulation.queue_command(msg[2], msg[3])
+        elif kind == "remove_player":
+            simulation = self.simulations.get(msg[1])
+            if simulation:
+                simulation.remove_player(msg[2])
+        elif kind == "stop":
+            simulation = self.simulations.get(msg[1])
+            if simulation:
+                simulation.stop()
+        elif kind == "shutdown":
+            self._shutdown()
+
+    def _send_state_now(self, lobby_id: str, simulation: LobbySimulation):
+        self.channel.send(("state", lobby_id, simulation.get_state(), simulation.take_results()))
+
+    async def _send_state(self, lobby_id: str, simulation: LobbySimulation):
+        self._send_state_now(lobby_id, simulation)
+
+    async def _run(self, lobby_id: str, simulation: LobbySimulation):
+        summary = None
+        reason = "stopped"
+        try:
+            await simulation.run()
+            if simulation.is_over():
+                summary = simulation.summary()
+        except Exception as e:
+            # One broken match must not take the worker's other lobbies down
+            print(f"Lobby {lobby_id} simulation failed: {e!r}")
+            reason = "error"
+        finally:
+            # Always release the match and tell the front, or its lobby never closes
+            self.simulations.pop(lobby_id, None)
+            self.tasks.pop(lobby_id, None)
+            self.channel.send(("game_over", lobby_id, summary, reason))
+
+class ShardPool:
+    """
+    Front-process side of the lobby workers
+
+    Each worker is a separate process running lobby simulations, so matches
+    use every core instead of sharing the server's event loop. The front
+    process keeps all websockets and lobby bookkeeping; workers only see
+    commands in and states out.
+
+    A new match goes to the worker with the fewest players in running
+    matches (ties broken by match count). If a worker dies, its matches
+    are lost: each is reported to ``on_message`` as ended by an error
+    (``game_over`` with no summary) and no new match is placed there.
+    """
+
+    def __init__(self, workers: int):
+        self.size = workers
+        self.channels: List[Optional[_Channel]] = [None] * workers
+        self.processes: List[multiprocessing.Process] = []
+        self.player_load: List[int] = [0] * workers
+        self.lobby_load: List[int] = [0] * workers
+        self.placement: Dict[str, int] = {}
+        self.lobby_players: Dict[str, int] = {}
+        self.alive: List[bool] = [False] * workers
+        self.on_message: Optional[Callable[[tuple], Any]] = None
+
+    def start(self, on_message: Callable[[tuple], Any]):
+        """
+        Spawn the workers and start reading their messages
+
+        Args:
+            on_message (callable): Called with each message from a worker;
+                coroutine results are scheduled on the running loop
+        """
+        self.on_message = on_message
+        # Spawned rather than forked: the parent already runs an event loop
+        ctx = multiprocessing.get_context("spawn")
+        for index in range(self.size):
+            parent_sock, child_sock = socket.socketpair()
+            process = ctx.Process(target=worker_main, args=(child_sock, index),
+                                  name=f"lobby-worker-{index}", daemon=True)
+            process.start()
+            child_sock.close()
+            self.processes.append(process)
+            self.channels[index] = _Channel(parent_sock, self._on_worker_message,
+                                            lambda index=index: self._on_worker_lost(index))
+            self.alive[index] = True
+
+    def _on_worker_message(self, msg: tuple):
+        if msg[0] == "game_over":
+            self.release(msg[1])
+        self._deliver(msg)
+
+    def _on_worker_lost(self, index: int):
+        """EOF or a failed write: the worker is gone"""
+        self.alive[index] = False
+        print(f"Lobby worker {index} exited")
+        # Its matches died with it: close their lobbies
+        for lobby_id in [lid for lid, i in self.placement.items() if i == index]:
+            self.release(lobby_id)
+            self._deliver(("game_over", lobby_id, None, "error"))
+
+    def _deliver(self, msg: tuple):
+        result = self.on_message(msg)
+        if asyncio.iscoroutine(result):
+            asyncio.ensure_future(result)
+
+    def start_lobby(self, lobby_id: str, player_ids: List[str], player_names: List[str],
+                    seed: Optional[int] = None) -> Optional[int]:
+        """Place a match on the least loaded live worker; returns its index, or None if none is left"""
+        while True:
+            live = [i for i in range(self.size) if self.alive[i]]
+            if not live:
+                return None
+            index = min(live, key=lambda i: (self.player_load[i], self.lobby_load[i]))
+            # A write error marks the worker dead right away; try the next one
+            self.channels[index].send(("start", lobby_id, list(player_ids), list(player_names), seed))
+            if self.alive[index]:
+                break
+        self.placement[lobby_id] = index
+        self.lobby_players[lobby_id] = len(player_ids)
+        self.player_load[index] += len(player_ids)
+        self.lobby_load[index] += 1
+        return index
+
+    def send(self, lobby_id: str, *msg):
+        """
+        Forward a message for a lobby to the worker running it
+
+        Never blocks and never raises: if the worker is gone, its lobbies
+        get their game_over and the message is dropped.
+        """
+        index = self.placement.get(lobby_id)
+        if index is not None:
+            self.channels[index].send((msg[0], lobby_id) + msg[1:])
+
+    def release(self, lobby_id: str):
+        """Forget a finished match and free its share of the worker's load"""
+        index = self.placement.pop(lobby_id, None)
+        if index is not None:
+            self.lobby_load[index] -= 1
+            self.player_load[index] -= self.lobby_players.pop(lobby_id)
+
+    def shutdown(self):
+        """Ask every worker to stop and wait for them"""
+        for channel in self.channels:
+            if channel is not None and not channel.closed:
+                channel.send(("shutdown",))
+                channel.flush(timeout=5)
+        for process in self.processes:
+            process.join(timeout=5)
+        for channel in self.channels:
+            if channel is not None:
+                channel.close()
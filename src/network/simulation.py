@@ -0,0 +1,210 @@
+# src/network/simulation.py
+"""
+Server-authoritative match simulation for one lobby
+"""
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from config.settings import SIM_TICK_RATE, SERVER_SEND_RATE, MAX_FRAME_TIME, MAX_BUFFERED_INPUTS
+from src.core.game import Game
+
+class LobbySimulation:
+    """
+    Runs a headless standard-mode Game for a lobby at a fixed tick rate
+
+    Client commands are queued as they arrive and applied at the start of
+    the next tick, so every tick sees a consistent set of inputs. Move
+    commands carrying a ``seq`` are per-tick inputs from a predicting
+    client: each moves the player exactly once, like the client's own
+    prediction, and the last consumed seq is reported in the player's
+    state so the client can reconcile. A player earns one input per tick;
+    ticks on which nothing had arrived are banked (up to
+    ``MAX_BUFFERED_INPUTS``) so late or batched inputs are caught up on
+    without ever moving faster than the client. Every
+    ``tick_rate / send_rate`` ticks ``on_state`` is awaited so the server
+    can broadcast the new state.
+
+    Each lobby's Game draws from its own seeded RNG, so a lobby replays
+    from its seed however many matches share the process.
+    """
+
+    def __init__(self, player_ids: List[str], player_names: List[str], seed: Optional[int] = None,
+                 tick_rate: int = SIM_TICK_RATE, send_rate: int = SERVER_SEND_RATE,
+                 on_state: Optional[Callable[["LobbySimulation"], Awaitable[None]]] = None):
+        self.game = Game(game_mode="standard", headless=True, seed=seed)
+        self.tick_rate = tick_rate
+        self.ticks_per_send = max(1, tick_rate // send_rate)
+        self.on_state = on_state
+        self.running = False
+        self.stopped = False
+        self.tick = 0
+
+        # Lobby player id -> simulated Player
+        players = self.game.set_players(player_names)
+        self.players = dict(zip(player_ids, players))
+        for player in players:
+            player.is_controlled = False
+
+        self.commands: deque = deque()
+        self.move_intents: Dict[str, tuple] = {}
+        self.move_inputs: Dict[str, deque] = {pid: deque() for pid in player_ids}
+        self.input_credit: Dict[str, int] = {pid: 0 for pid in player_ids}
+        self.input_acks: Dict[str, int] = {}
+        self.results: List[str] = []
+
+    def queue_command(self, player_id: str, data: Dict[str, Any]):
+        """Queue a client command to be applied at the next tick boundary"""
+        self.commands.append((player_id, data))
+
+    def remove_player(self, player_id: str):
+        """Drop a disconnected player's input; their character stays in the match"""
+        self.move_intents.pop(player_id, None)
+        self.move_inputs.get(player_id, deque()).clear()
+
+    def is_over(self) -> bool:
+        phase_manager = self.game.phase_manager
+        return phase_manager.is_end_phase() or not any(p.is_alive for p in self.game.players)
+
+    def _apply_commands(self):
+        """Apply every queued command in arrival order"""
+        while self.commands:
+            player_id, data = self.commands.popleft()
+            player = self.players.get(player_id)
+            if player is None or not player.is_alive:
+                continue
+            try:
+                if not isinstance(data, dict):
+                    raise TypeError("command must be an object")
+                self._apply_command(player_id, player, data)
+            except (TypeError, ValueError, OverflowError):
+                # Malformed input from one client must not stop the lobby
+                self.results.append(f"Player {player_id} sent an invalid command")
+
+    def _apply_command(self, player_id: str, player, data: Dict[str, Any]):
+        """Apply one command; fields are parsed before anything changes"""
+        action = data.get("action", "command")
+        if action == "move":
+            move_x = max(-1, min(1, int(data.get("x", 0))))
+            move_y = max(-1, min(1, int(data.get("y", 0))))
+            if "seq" in data:
+                # A batched run of identical inputs arrives as one move with a count
+                seq = int(data["seq"])
+                count = max(1, min(MAX_BUFFERED_INPUTS, int(data.get("count", 1))))
+                # Predicted inputs replace any held-key intent
+                self.move_intents.pop(player_id, None)
+                inputs = self.move_inputs[player_id]
+                for i in range(count):
+                    inputs.append((seq + i, move_x, move_y))
+                # Too far behind the client: drop old inputs, it will reconcile
+                while len(inputs) > MAX_BUFFERED_INPUTS:
+                    inputs.popleft()
+            else:
+                # Held-key style intent, applied every tick until changed
+                self.move_intents[player_id] = (move_x, move_y)
+        elif action == "use_card":
+            index = int(data.get("index", -1))
+            self.game.current_player = self.game.players.index(player)
+            self.game._use_card(index)
+        else:
+            self.results.append(f"Player {player_id} executed {data.get('command')}")
+
+    def step(self):
+        """Apply queued commands and advance the match by one fixed tick"""
+        self._apply_commands()
+        for player_id, inputs in self.move_inputs.items():
+            player = self.players[player_id]
+            credit = min(MAX_BUFFERED_INPUTS, self.input_credit[player_id] + 1)
+            # Nothing is repeated when no input arrived: the client did not
+            # move on that tick either, and its input will still come
+            while inputs and credit > 0:
+                seq, move_x, move_y = inputs.popleft()
+                credit -= 1
+                self.input_acks[player_id] = seq
+                if player.is_alive and (move_x or move_y):
+                    self.game.apply_movement(player, move_x, move_y, self.game.sim_dt)
+            self.input_credit[player_id] = credit
+        for player_id, (move_x, move_y) in self.move_intents.items():
+            player = self.players[player_id]
+            if player.is_alive and (move_x or move_y):
+                self.game.apply_movement(player, move_x, move_y, self.game.sim_dt)
+        self.game.tick()
+        self.tick += 1
+
+    def take_results(self) -> List[str]:
+        """Command results produced since the last call"""
+        results, self.results = self.results, []
+        return results
+
+    def get_state(self) -> Dict[str, Any]:
+        """Current match state in the lobby game_state layout"""
+        phase_manager = self.game.phase_manager
+        state = {
+            "tick": self.tick,
+            "phase": phase_manager.current_phase.value,
+            "day_count": phase_manager.day_count,
+            "time_left": float(phase_manager.time_left),
+            "players": {},
+            "monsters": {},
+        }
+        for player_id, player in self.players.items():
+            state["players"][player_id] = {
+                "name": player.name,
+                "hp": float(player.hp),
+                "max_hp": player.max_hp,
+                "level": player.level,
+                "role": player.role.value,
+                "cards": list(player.cards),
+                "alive": player.is_alive,
+                "position": [player.position[0], player.position[1]],
+                "input_seq": self.input_acks.get(player_id, 0),
+            }
+        for monster in self.game.monster_system.monsters:
+            state["monsters"][monster.id] = {
+                "symbol": monster.symbol,
+                "hp": monster.hp,
+                "max_hp": monster.max_hp,
+                "boss": monster.is_boss,
+                "position": [monster.position[0], monster.position[1]],
+            }
+        return state
+
+    def summary(self) -> Dict[str, Any]:
+        """Result of the match for the game_over message"""
+        return {
+            "seed": self.game.seed,
+            "ticks": self.tick,
+            "day": self.game.phase_manager.day_count,
+            "survivors": [pid for pid, p in self.players.items() if p.is_alive],
+        }
+
+    async def run(self):
+        """Tick until the match ends or stop() is called (run as an asyncio task)"""
+        loop = asyncio.get_running_loop()
+        tick_dt = 1.0 / self.tick_rate
+        next_tick = loop.time()
+        self.running = True
+
+        while not self.stopped and not self.is_over():
+            self.step()
+            if self.on_state and self.tick % self.ticks_per_send == 0:
+                await self.on_state(self)
+
+            next_tick += tick_dt
+            delay = next_tick - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                # Behind schedule: skip lost time instead of bursting to catch up
+                if -delay > MAX_FRAME_TIME:
+                    next_tick = loop.time()
+                await asyncio.sleep(0)
+
+        # Final state so clients see how the match ended
+        if self.on_state:
+            await self.on_state(self)
+        self.running = False
+
+    def stop(self):
+        """End run() at the next tick; also honoured if run() has not started yet"""
+        self.stopped = True
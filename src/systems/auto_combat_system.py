@@ -1,7 +1,7 @@
 # src/systems/auto_combat_system.py
 
 import math
-import random
+import numpy as np
 import pygame
 from typing import List, Tuple, Optional
 
@@ -29,6 +29,14 @@ class AutoCombatSystem:
         if self.current_cooldown <= 0:
             # Tìm người chơi và quái vật
             players = self._get_controlled_players()
+            
+            # Dùng kho quái vật NumPy nếu có: xử lý toàn bộ đòn đánh trong một lượt
+            store = self._get_monster_store()
+            if store is not None:
+                if self._resolve_batched_attacks(players, store):
+                    self.current_cooldown = self.attack_cooldown
+                return
+            
             monsters = self._get_nearby_monsters(players)
             
             # Nếu có quái vật, thực hiện tấn công
@@ -36,6 +44,73 @@ class AutoCombatSystem:
                 self._perform_auto_attacks(players, monsters)
                 self.current_cooldown = self.attack_cooldown
     
+    def _get_monster_store(self):
+        """Lấy MonsterArray của MonsterSystem (None nếu không có)"""
+        monster_system = getattr(self.game, 'monster_system', None)
+        return getattr(monster_system, 'monster_store', None)
+    
+    def _resolve_batched_attacks(self, players, store):
+        """Xử lý đòn đánh của mọi người chơi trong một lượt vector hóa
+        
+        1. Tính khoảng cách bình phương người chơi x quái vật
+        2. Chọn quái vật gần nhất trong tầm cho từng người chơi
+        3. Trừ máu, đánh dấu quái chết rồi nén mảng (mark-and-compact)
+        
+        Returns:
+            bool: True nếu có ít nhất một đòn tấn công
+        """
+        n = store.count
+        if not players or n == 0:
+            return False
+        
+        player_pos = np.array([(p.position[0], p.position[1]) for p in players], dtype=np.float64)
+        delta = store.positions[None, :n, :] - player_pos[:, None, :]
+        dist_sq = np.einsum('pnk,pnk->pn', delta, delta)
+        
+        hp = store.hp[:n]
+        valid = store.alive[:n] & (hp > 0)
+        dist_sq[:, ~valid] = np.inf
+        
+        nearest = np.argmin(dist_sq, axis=1)
+        attacking = dist_sq[np.arange(len(players)), nearest] <= self.attack_range * self.attack_range
+        if not attacking.any():
+            return False
+        
+        attacker_idx = np.flatnonzero(attacking)
+        hits = nearest[attacker_idx]
+        
+        # Trừ máu một lần cho mọi đòn (nhiều người có thể đánh cùng một con)
+        hp_before = hp.copy()
+        np.subtract.at(hp, hits, self.attack_damage)
+        killed = valid & (hp <= 0)
+        hp[killed] = 0
+        store.alive[:n] &= ~killed
+        
+        # Tạo hiệu ứng tấn công nếu có
+        if hasattr(self.game, 'gameplay_enhancements') and hasattr(self.game.gameplay_enhancements, 'create_impact_effect'):
+            for m in hits:
+                self.game.gameplay_enhancements.create_impact_effect(tuple(store.positions[m]))
+        
+        # Người hạ gục là người có đòn đánh làm máu về 0 (theo thứ tự người chơi)
+        for m in np.flatnonzero(killed):
+            attackers = attacker_idx[hits == m]
+            strikes_needed = int(math.ceil(hp_before[m] / self.attack_damage))
+            killer = players[attackers[min(strikes_needed, len(attackers)) - 1]]
+            
+            # Tăng exp nếu cần
+            if hasattr(killer, 'add_exp'):
+                killer.add_exp(50)  # 50 điểm exp cho mỗi quái
+            
+            # Thông báo
+            if hasattr(self.game, 'ui_bridge') and hasattr(self.game.ui_bridge, 'show_notification'):
+                self.game.ui_bridge.show_notification(f"Defeated monster!", "success")
+        
+        # Nén mảng một lần thay vì list.remove() cho từng con
+        if killed.any():
+            self.game.monster_system.kill(*(store.views[m] for m in np.flatnonzero(killed)))
+        
+        return True
+    
     def draw(self, screen):
         """Vẽ hiệu ứng tấn công và thông tin debug"""
         # Vẽ phạm vi tấn công khi ở chế độ debug
@@ -68,6 +143,19 @@ class AutoCombatSystem:
                     (bar_x, bar_y, int(bar_width * cooldown_pct), bar_height)
                 )
     
+    def get_dirty_rects(self):
+        """Vùng màn hình mà draw() vẽ: vòng phạm vi và thanh cooldown (chỉ ở chế độ debug)"""
+        if not getattr(self.game, 'debug_mode', False):
+            return []
+        
+        radius = int(self.attack_range)
+        rects = []
+        for player in self._get_controlled_players():
+            x, y = int(player.position[0]), int(player.position[1])
+            # Hình vuông bao vòng tròn cũng chứa thanh cooldown bên trong
+            rects.append(pygame.Rect(x - radius - 1, y - radius - 1, 2 * radius + 2, 2 * radius + 2))
+        return rects
+    
     def _get_controlled_players(self):
         """Lấy danh sách người chơi có thể tấn công"""
         if not hasattr(self.game, 'players'):
@@ -81,18 +169,17 @@ class AutoCombatSystem:
             return []
         
         nearby_monsters = []
+        range_sq = self.attack_range * self.attack_range
         for monster in self.game.monsters:
             if not getattr(monster, 'alive', True) or getattr(monster, 'hp', 0) <= 0:
                 continue
                 
             # Kiểm tra có trong tầm tấn công của bất kỳ người chơi nào không
+            mx, my = getattr(monster, 'position', (0, 0))[:2]
             for player in players:
-                distance = self._calculate_distance(
-                    player.position, 
-                    getattr(monster, 'position', (0, 0))
-                )
-                
-                if distance <= self.attack_range:
+                dx = player.position[0] - mx
+                dy = player.position[1] - my
+                if dx * dx + dy * dy <= range_sq:
                     nearby_monsters.append(monster)
                     break
         
@@ -100,12 +187,19 @@ class AutoCombatSystem:
     
     def _perform_auto_attacks(self, players, monsters):
         """Thực hiện tấn công tự động"""
+        killed = []
         for player in players:
             # Tìm quái vật gần nhất
             nearest_monster = self._find_nearest_monster(player, monsters)
             if nearest_monster:
                 # Tấn công
-                self._attack_target(player, nearest_monster)
+                if self._attack_target(player, nearest_monster):
+                    killed.append(nearest_monster)
+        
+        # Xóa quái chết một lần (mark-and-compact) thay vì remove() từng con
+        if killed and hasattr(self.game, 'monsters'):
+            dead_ids = {id(m) for m in killed}
+            self.game.monsters[:] = [m for m in self.game.monsters if id(m) not in dead_ids]
     
     def _find_nearest_monster(self, player, monsters):
         """Tìm quái vật gần nhất"""
@@ -113,25 +207,28 @@ class AutoCombatSystem:
             return None
             
         nearest = None
-        min_distance = float('inf')
+        min_distance_sq = float('inf')
+        px, py = player.position[0], player.position[1]
         
         for monster in monsters:
-            distance = self._calculate_distance(
-                player.position, 
-                getattr(monster, 'position', (0, 0))
-            )
+            mx, my = getattr(monster, 'position', (0, 0))[:2]
+            distance_sq = (px - mx) * (px - mx) + (py - my) * (py - my)
             
-            if distance < min_distance:
-                min_distance = distance
+            if distance_sq < min_distance_sq:
+                min_distance_sq = distance_sq
                 nearest = monster
         
         return nearest
     
     def _attack_target(self, player, target):
-        """Thực hiện đòn tấn công"""
+        """Thực hiện đòn tấn công
+        
+        Returns:
+            bool: True nếu đòn này hạ gục mục tiêu (người gọi tự xóa khỏi danh sách)
+        """
         # Kiểm tra nếu chỉ tấn công quái vật
         if self.attack_only_monsters and not hasattr(target, 'is_boss') and not hasattr(target, 'symbol'):
-            return
+            return False
         
         # Xử lý sát thương
         if hasattr(target, 'take_damage'):
@@ -146,19 +243,20 @@ class AutoCombatSystem:
         if hasattr(self.game, 'gameplay_enhancements') and hasattr(self.game.gameplay_enhancements, 'create_impact_effect'):
             self.game.gameplay_enhancements.create_impact_effect(getattr(target, 'position', (0, 0)))
         
-        # Kiểm tra nếu target đã chết
-        if getattr(target, 'hp', 0) <= 0:
-            # Xử lý khi tiêu diệt quái vật
-            if hasattr(self.game, 'monsters') and target in self.game.monsters:
-                self.game.monsters.remove(target)
-                
-                # Tăng exp nếu cần
-                if hasattr(player, 'add_exp'):
-                    player.add_exp(50)  # 50 điểm exp cho mỗi quái
-                
-                # Thông báo
-                if hasattr(self.game, 'ui_bridge') and hasattr(self.game.ui_bridge, 'show_notification'):
-                    self.game.ui_bridge.show_notification(f"Defeated monster!", "success")
+        # Kiểm tra nếu target đã chết (chỉ người ra đòn kết liễu được exp)
+        if getattr(target, 'hp', 0) <= 0 and not getattr(target, '_auto_combat_killed', False):
+            setattr(target, '_auto_combat_killed', True)
+            
+            # Tăng exp nếu cần
+            if hasattr(player, 'add_exp'):
+                player.add_exp(50)  # 50 điểm exp cho mỗi quái
+            
+            # Thông báo
+            if hasattr(self.game, 'ui_bridge') and hasattr(self.game.ui_bridge, 'show_notification'):
+                self.game.ui_bridge.show_notification(f"Defeated monster!", "success")
+            return True
+        
+        return False
     
     def _calculate_distance(self, pos1, pos2):
         """Tính khoảng cách giữa hai điểm"""
@@ -1,7 +1,7 @@
 # src/systems/card_generator.py
 
-import random
 from typing import List, Dict, Any
+from ..utils.rng import rng_of
 
 class CardGenerator:
     """Generates card options for selection screens"""
@@ -96,9 +96,10 @@ class CardGenerator:
     def generate_card_options(self, player_level: int, num_options: int = 3) -> List[Dict[str, Any]]:
         """Generate a set of card options based on player level"""
         options = []
+        rng = rng_of(self.game)
         
         # Always include at least one attack card
-        options.append(random.choice(self.attack_cards))
+        options.append(rng.choice(self.attack_cards))
         
         # Higher chance for support cards at higher levels
         support_chance = min(0.3 + player_level * 0.05, 0.6)
@@ -106,22 +107,22 @@ class CardGenerator:
         # Fill remaining slots
         remaining_slots = num_options - len(options)
         for _ in range(remaining_slots):
-            if random.random() < support_chance:
+            if rng.random() < support_chance:
                 card_pool = self.support_cards
             else:
-                card_pool = random.choice([self.attack_cards, self.utility_cards])
+                card_pool = rng.choice([self.attack_cards, self.utility_cards])
                 
             # Select a card not already in options
             available_cards = [c for c in card_pool if not any(o["id"] == c["id"] for o in options)]
             if available_cards:
-                options.append(random.choice(available_cards))
+                options.append(rng.choice(available_cards))
             else:
                 # If all cards from the chosen pool are taken, pick from another pool
-                alternative_pool = random.choice([self.attack_cards, self.utility_cards, self.support_cards])
+                alternative_pool = rng.choice([self.attack_cards, self.utility_cards, self.support_cards])
                 available_cards = [c for c in alternative_pool if not any(o["id"] == c["id"] for o in options)]
                 if available_cards:
-                    options.append(random.choice(available_cards))
+                    options.append(rng.choice(available_cards))
         
         # Shuffle the options
-        random.shuffle(options)
+        rng.shuffle(options)
         return options
@@ -5,14 +5,57 @@ import json
 import requests
 from typing import Dict, List, Tuple, Optional
 
+from config.settings import DIALOGUE_ASYNC, DIALOGUE_STREAM, DIALOGUE_TIMEOUT
+from src.ai.dialogue_pipeline import DialoguePipeline, DialogueRequest
+from src.ai.llm_http import LLMSession, shared_llm_session
+from src.ai.offline_dialogue import OfflineDialogueEngine, context_tags
+from src.ai.response_cache import ResponseCache, make_key, shared_response_cache
+
+# Câu dự phòng theo chủ đề; {name} là tên NPC. Cũng được đưa vào bộ trả lời cục bộ.
+FALLBACK_RESPONSES = {
+    "general": [
+        "{name} nhún vai. 'Tôi không có gì để nói với bạn.'",
+        "'Những chuyện thường ngày ấy mà...' {name} thở dài.",
+        "'Thời tiết hôm nay thật kỳ lạ phải không?' {name} nói."
+    ],
+    "identity": [
+        "'Tôi là {name}, bạn quên rồi sao?'",
+        "{name} cau mày. 'Bạn đang hỏi gì vậy? Tôi là {name} đây.'"
+    ],
+    "murder": [
+        "Mắt {name} mở to. 'Tôi không biết gì về vụ đó cả.'",
+        "'Đừng nói to!' {name} nhìn quanh. 'Tôi nghĩ kẻ giết người vẫn còn ở đây...'"
+    ],
+    "clues": [
+        "'Tôi tìm thấy cái này sau nhà kho.' {name} đưa cho bạn một mảnh giấy nhỏ.",
+        "'Manh mối ư? Cẩn thận nhé, không phải ai cũng muốn bạn tìm ra sự thật đâu.'"
+    ]
+}
+
 class DialogueSystem:
-    def __init__(self, game):
+    def __init__(self, game, response_cache: Optional[ResponseCache] = None, http: Optional[LLMSession] = None):
         self.game = game
         self.dialogue_history = {}  # {npc_id: [conversations]}
         self.conversation_state = {}  # {npc_id: {topic, mood, suspicion}}
         self.active_conversation = None
         self.grok_api_key = None  # Đọc từ config
         self.grok_endpoint = "https://api.grok.ai/v1/chat/completions"
+        self.grok_model = "grok-3-mini-beta"
+        
+        # Gọi API ở luồng nền để vòng lặp game không bị chặn
+        self.async_responses = DIALOGUE_ASYNC
+        self.stream_responses = DIALOGUE_STREAM  # Nhận phản hồi theo từng đoạn (SSE)
+        self.request_timeout = DIALOGUE_TIMEOUT
+        self.pipeline = DialoguePipeline(timeout=DIALOGUE_TIMEOUT)
+        self.pending_responses: Dict[str, Tuple[DialogueRequest, dict]] = {}  # {npc_id: (request, history entry)}
+        
+        # Cache phản hồi dùng chung với GrokClient (bộ nhớ + SQLite) nếu không truyền vào
+        self.response_cache = response_cache if response_cache is not None else shared_response_cache()
+        # Session HTTP dùng chung (keep-alive, giới hạn đồng thời, thử lại) nếu không truyền vào
+        self.http = http if http is not None else shared_llm_session()
+        # Bộ trả lời cục bộ khi không có API key (TF-IDF trên npc_responses.json + lịch sử)
+        self.offline_engine = OfflineDialogueEngine.load()
+        self.offline_engine.add_responses({"fallback": FALLBACK_RESPONSES})
         
         # Tải API key
         self._load_api_key()
@@ -103,15 +146,30 @@ class DialogueSystem:
             )
         
         # Tạo phản hồi từ NPC
-        npc_response = self._generate_npc_response(npc, message_text)
-        
-        # Ghi lại phản hồi
-        self.dialogue_history[npc_id].append({
+        request = None
+        if self.async_responses and self.grok_api_key:
+            # Trả lời dự phòng ngay; phản hồi thật sẽ thay thế khi về (xem update())
+            request = self.request_npc_response(npc, message_text)
+            npc_response = request.text
+            if request.done:
+                # Trúng cache: đã là phản hồi thật, không cần chờ
+                request = None
+                self._remember_exchange(npc_id, message_text, npc_response)
+        else:
+            npc_response = self._generate_npc_response(npc, message_text)
+        
+        # Ghi lại phản hồi. Phản hồi dạng stream bắt đầu rỗng trong lịch sử và
+        # hiện dần qua update(); người gọi vẫn nhận câu dự phòng để hiển thị tạm
+        entry = {
             "speaker": "npc",
-            "text": npc_response,
+            "text": "" if request and request.stream else npc_response,
             "time": self.game.current_time,
             "day": self.game.current_day
-        })
+        }
+        self.dialogue_history[npc_id].append(entry)
+        if request:
+            entry["pending"] = True
+            self.pending_responses[npc_id] = (request, entry)
         
         # Cập nhật start_time để đo thời gian phản ứng tiếp theo
         self.active_conversation["start_time"] = time.time()
@@ -126,6 +184,9 @@ class DialogueSystem:
         npc = self.active_conversation["npc"]
         npc_id = npc.npc_id
         
+        # Phản hồi chưa về không còn ý nghĩa sau khi tạm biệt
+        self.cancel_pending(npc_id)
+        
         # Thêm lời chào tạm biệt
         farewell = self._generate_npc_farewell(npc)
         
@@ -142,6 +203,111 @@ class DialogueSystem:
         
         return farewell
     
+    def request_npc_response(self, npc, player_message) -> DialogueRequest:
+        """Gửi yêu cầu phản hồi tới Grok ở luồng nền, trả về handle ngay lập tức
+        
+        handle.text là câu dự phòng cho tới khi phản hồi thật về. Nếu phản hồi
+        đã có trong cache bộ nhớ thì handle trả về đã hoàn tất. Khi bật
+        stream_responses, phản hồi được gửi về từng đoạn (handle.stream).
+        """
+        npc_id = npc.npc_id
+        npc_state = self.conversation_state.get(npc_id, {})
+        fallback = self._generate_fallback_response(npc, npc_state)
+        
+        # Chỉ còn một yêu cầu cho mỗi NPC: yêu cầu cũ bị huỷ
+        self.cancel_pending(npc_id)
+        
+        # Prompt được tạo trên luồng game; luồng nền chỉ gọi HTTP
+        messages = self._build_grok_messages(npc, player_message)
+        cache_key = self._cache_key(npc, messages)
+        cached = self.response_cache.get(cache_key, memory_only=True)
+        if cached:
+            return DialogueRequest.completed(npc_id, cached)
+        if self.stream_responses:
+            return self.pipeline.submit(self._stream_completion, npc_id, fallback, messages, cache_key, stream=True)
+        return self.pipeline.submit(self._request_completion, npc_id, fallback, messages, cache_key)
+    
+    def update(self, on_stream=None):
+        """Gọi mỗi frame: nhận các phản hồi đã về, không bao giờ chặn
+        
+        Args:
+            on_stream: Hàm on_stream(npc_id, text, new_reply) nhận từng đoạn của
+                phản hồi dạng stream (và câu dự phòng nếu stream lỗi trước đoạn
+                đầu tiên); new_reply là True ở đoạn đầu tiên của mỗi phản hồi
+        
+        Returns:
+            list: [(npc, text)] các phản hồi thật vừa thay thế câu dự phòng
+        """
+        # Đoạn stream mới: nối vào lịch sử ngay, không chờ hết câu
+        for request, entry in list(self.pending_responses.values()):
+            if request.stream:
+                self._take_streamed(request, entry, on_stream)
+        
+        arrived = []
+        for request in self.pipeline.poll():
+            request_entry = self.pending_responses.get(request.npc_id)
+            if not request_entry or request_entry[0] is not request:
+                continue
+            del self.pending_responses[request.npc_id]
+            entry = request_entry[1]
+            entry.pop("pending", None)
+            if request.stream:
+                self._take_streamed(request, entry, on_stream)
+                if not entry["text"]:
+                    # Lỗi trước đoạn đầu tiên: dùng câu dự phòng
+                    entry["text"] = request.fallback
+                    if on_stream:
+                        on_stream(request.npc_id, request.fallback, True)
+            if request.is_real:
+                entry["text"] = request.text
+                prompt = self._prompt_for(request.npc_id, entry)
+                if prompt is not None:
+                    self._remember_exchange(request.npc_id, prompt, request.text)
+                npc = self._get_npc_by_id(request.npc_id)
+                if npc:
+                    arrived.append((npc, request.text))
+            elif request.error:
+                print(f"Error calling Grok API: {request.error}")
+        return arrived
+    
+    def _remember_exchange(self, npc_id, player_message, reply):
+        """Đưa cặp (câu hỏi, phản hồi thật) vào bộ trả lời cục bộ để dùng lại khi offline
+        
+        Phản hồi thật từ cache, lời gọi đồng bộ hay luồng nền đều đi qua đây,
+        nên lịch sử luôn được gắn cùng một chủ đề.
+        """
+        self.offline_engine.add_exchange(npc_id, player_message, reply, self._extract_topic(player_message))
+    
+    def _prompt_for(self, npc_id, entry):
+        """Câu của người chơi ngay trước lượt NPC entry trong lịch sử, None nếu không có"""
+        history = self.dialogue_history.get(npc_id, [])
+        for i, item in enumerate(history):
+            if item is entry:
+                if i > 0 and history[i - 1]["speaker"] == "player":
+                    return history[i - 1]["text"]
+                return None
+        return None
+    
+    def _take_streamed(self, request, entry, on_stream):
+        """Chuyển các đoạn stream mới của request vào lịch sử và on_stream"""
+        piece = request.take_streamed()
+        if piece:
+            new_reply = not entry["text"]
+            entry["text"] += piece
+            if on_stream:
+                on_stream(request.npc_id, piece, new_reply)
+    
+    def cancel_pending(self, npc_id=None):
+        """Huỷ phản hồi đang chờ của một NPC (hoặc tất cả), giữ câu dự phòng"""
+        for pending_id in list(self.pending_responses):
+            if npc_id is None or pending_id == npc_id:
+                request, entry = self.pending_responses.pop(pending_id)
+                request.cancel()
+                entry.pop("pending", None)
+                if not entry["text"]:
+                    # Stream bị huỷ trước đoạn đầu tiên: không để lượt NPC rỗng trong lịch sử
+                    entry["text"] = request.fallback
+    
     def _get_npc_by_id(self, npc_id):
         """Lấy NPC theo ID"""
         for npc in self.game.npcs:
@@ -233,8 +399,47 @@ class DialogueSystem:
         npc_state = self.conversation_state.get(npc_id, {})
         
         if not self.grok_api_key:
-            # Fallback khi không có API key
+            # Không có API key: chọn câu trả lời cục bộ, không cần mạng
+            reply = self._generate_offline_response(npc, player_message)
+            return reply or self._generate_fallback_response(npc, npc_state)
+        
+        try:
+            messages = self._build_grok_messages(npc, player_message)
+            reply = self._request_completion(messages, self._cache_key(npc, messages))
+        except Exception as e:
+            print(f"Error calling Grok API: {e}")
+            reply = None
+        if not reply:
             return self._generate_fallback_response(npc, npc_state)
+        self._remember_exchange(npc_id, player_message, reply)
+        return reply
+    
+    def _generate_offline_response(self, npc, player_message):
+        """Chọn phản hồi từ bộ trả lời cục bộ theo ý định và chủ đề của người chơi"""
+        npc_state = self.conversation_state.get(npc.npc_id, {})
+        intent = self._analyze_player_intent(player_message)
+        night = getattr(self.game, "is_night", False) or self.game.current_time == "night"
+        tags = context_tags(intent, npc_state.get("suspicion", 0.0), night,
+                            role=self._player_role(), events=self._happened_events())
+        reply = self.offline_engine.respond(npc.npc_id, player_message, tags)
+        return reply.replace("{name}", npc.name) if reply else None
+    
+    def _player_role(self):
+        """Vai trò thật của người chơi đang nói chuyện ("traitor", ...), None nếu chưa rõ"""
+        player = self.active_conversation["player"] if self.active_conversation else None
+        role = getattr(player, "role", None)
+        name = getattr(role, "name", None)
+        return name.lower() if name else None
+    
+    def _happened_events(self):
+        """Loại các sự kiện đã thực sự xảy ra trong game"""
+        event_generator = getattr(self.game, "event_generator", None)
+        return {event["type"] for event in getattr(event_generator, "triggered_events", [])}
+    
+    def _build_grok_messages(self, npc, player_message):
+        """Tạo danh sách message (system prompt + lịch sử) gửi cho Grok"""
+        npc_id = npc.npc_id
+        npc_state = self.conversation_state.get(npc_id, {})
         
         # Prepare context for Grok
         npc_history = self._get_conversation_history(npc_id, limit=5)
@@ -262,71 +467,115 @@ class DialogueSystem:
         
         # Thêm lịch sử hội thoại
         for entry in npc_history:
+            if not entry["text"]:
+                # Phản hồi stream chưa có đoạn nào: API không nhận lượt rỗng
+                continue
             role = "assistant" if entry["speaker"] == "npc" else "user"
             messages.append({"role": role, "content": entry["text"]})
         
         # Thêm message hiện tại
         messages.append({"role": "user", "content": player_message})
         
+        return messages
+    
+    def _cache_key(self, npc, messages):
+        """Khoá cache: prompt đã chuẩn hoá + trạng thái NPC (làm tròn) + model
+        
+        Chỉ dùng system prompt và câu hỏi hiện tại, bỏ qua lịch sử hội thoại:
+        cùng câu hỏi trong cùng trạng thái NPC thì dùng lại câu trả lời.
+        """
+        npc_state = self.conversation_state.get(npc.npc_id, {})
+        bucket = (
+            npc.npc_id,
+            npc_state.get("mood", "neutral"),
+            npc_state.get("topic", "general"),
+            round(npc_state.get("suspicion", 0.0) * 4) / 4
+        )
+        return make_key([messages[0], messages[-1]], self.grok_model, bucket)
+    
+    def _request_completion(self, messages, cache_key=None):
+        """Gọi Grok API (chặn, có timeout); trả về nội dung phản hồi hoặc None
+        
+        Chạy được trên luồng nền: chỉ dùng messages đã tạo sẵn, không đụng tới trạng thái game.
+        Có cache_key thì tra cache (cả SQLite) trước và lưu phản hồi mới vào cache.
+        """
+        if cache_key:
+            cached = self.response_cache.get(cache_key)
+            if cached:
+                return cached
+        
+        # Call Grok API
         try:
-            # Call Grok API
-            response = requests.post(
+            result = self.http.post_json(
                 self.grok_endpoint,
-                headers={
-                    "Authorization": f"Bearer {self.grok_api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "grok-3-mini-beta",
-                    "messages": messages,
-                    "temperature": 0.7,
-                    "max_tokens": 150
-                }
+                self._completion_payload(messages),
+                headers=self._api_headers(),
+                timeout=self.request_timeout
             )
-            
-            response.raise_for_status()
-            result = response.json()
-            
-            if "choices" in result and len(result["choices"]) > 0:
-                return result["choices"][0]["message"]["content"]
-            else:
-                return self._generate_fallback_response(npc, npc_state)
-                
-        except Exception as e:
-            print(f"Error calling Grok API: {e}")
-            return self._generate_fallback_response(npc, npc_state)
+        except requests.Timeout as e:
+            raise TimeoutError(str(e)) from e
+        
+        if "choices" in result and len(result["choices"]) > 0:
+            reply = result["choices"][0]["message"]["content"]
+            if cache_key and reply:
+                self.response_cache.put(cache_key, reply)
+            return reply
+        return None
+    
+    def _stream_completion(self, feed, messages, cache_key=None):
+        """Như _request_completion nhưng nhận phản hồi dạng stream
+        
+        Mỗi đoạn nhận được chuyển ngay cho feed(); trả về toàn bộ phản hồi.
+        """
+        if cache_key:
+            cached = self.response_cache.get(cache_key)
+            if cached:
+                feed(cached)
+                return cached
+        
+        pieces = []
+        try:
+            for piece in self.http.stream_chat(
+                self.grok_endpoint,
+                self._completion_payload(messages),
+                headers=self._api_headers(),
+                timeout=self.request_timeout
+            ):
+                pieces.append(piece)
+                feed(piece)
+        except requests.Timeout as e:
+            raise TimeoutError(str(e)) from e
+        
+        reply = "".join(pieces)
+        if cache_key and reply:
+            self.response_cache.put(cache_key, reply)
+        return reply or None
+    
+    def _completion_payload(self, messages):
+        return {
+            "model": self.grok_model,
+            "messages": messages,
+            "temperature": 0.7,
+            "max_tokens": 150
+        }
+    
+    def _api_headers(self):
+        return {
+            "Authorization": f"Bearer {self.grok_api_key}",
+            "Content-Type": "application/json"
+        }
     
     def _generate_fallback_response(self, npc, npc_state):
         """Tạo phản hồi dự phòng khi không thể sử dụng Grok API"""
         topic = npc_state.get("topic", "general")
         suspicion = npc_state.get("suspicion", 0.0)
         
-        responses = {
-            "general": [
-                f"{npc.name} nhún vai. 'Tôi không có gì để nói với bạn.'",
-                f"'Những chuyện thường ngày ấy mà...' {npc.name} thở dài.",
-                f"'Thời tiết hôm nay thật kỳ lạ phải không?' {npc.name} nói."
-            ],
-            "identity": [
-                f"'Tôi là {npc.name}, bạn quên rồi sao?'",
-                f"{npc.name} cau mày. 'Bạn đang hỏi gì vậy? Tôi là {npc.name} đây.'"
-            ],
-            "murder": [
-                f"Mắt {npc.name} mở to. 'Tôi không biết gì về vụ đó cả.'",
-                f"'Đừng nói to!' {npc.name} nhìn quanh. 'Tôi nghĩ kẻ giết người vẫn còn ở đây...'"
-            ],
-            "clues": [
-                f"'Tôi tìm thấy cái này sau nhà kho.' {npc.name} đưa cho bạn một mảnh giấy nhỏ.",
-                f"'Manh mối ư? Cẩn thận nhé, không phải ai cũng muốn bạn tìm ra sự thật đâu.'"
-            ]
-        }
-        
-        response_pool = responses.get(topic, responses["general"])
+        response_pool = FALLBACK_RESPONSES.get(topic, FALLBACK_RESPONSES["general"])
         
         if suspicion > 0.7:
             return f"{npc.name} nhìn bạn đầy nghi ngờ. 'Tôi không tin bạn. Đừng có đến gần tôi nữa.'"
         
-        return random.choice(response_pool)
+        return random.choice(response_pool).replace("{name}", npc.name)
     
     def _generate_npc_farewell(self, npc):
         """Tạo lời chào tạm biệt từ NPC"""
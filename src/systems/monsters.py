@@ -1,22 +1,28 @@
 # src/systems/monsters.py - MONSTER SYSTEM
 
-import random
 import math
+import numpy as np
 import pygame  # Thêm import này để vẽ monsters
-from ..core.entities import Monster
+from ..core.entities import MonsterArray
 from config.settings import MONSTER_SPAWN_CONFIG, SCREEN_WIDTH, SCREEN_HEIGHT
+from ..utils.font_utils import render_text
+from ..utils.rng import rng_of
 
 class MonsterSystem:
     """Manages monster spawning and behavior"""
     
     def __init__(self, game):
         self.game = game
-        self.monsters = []
+        self.attack_range = 30
+        
+        # NumPy structure-of-arrays backend; self.monsters holds thin Monster views
+        self.monster_store = MonsterArray()
+        self.monsters = self.monster_store.views
     
     def spawn_monsters(self):
         """Spawn monsters based on current day"""
         # Clear existing monsters
-        self.monsters.clear()
+        self.monster_store.clear()
         
         # Calculate number of monsters - sửa để tránh lỗi
         player_count = 3  # Giá trị mặc định
@@ -34,9 +40,12 @@ class MonsterSystem:
         monster_count = (MONSTER_SPAWN_CONFIG["base_per_player"] * player_count + 
                         int(MONSTER_SPAWN_CONFIG["scaling_per_day"] * (day_count - 1)))
         
-        # Clamp between min and max
+        # Clamp between min and max (swarm mode allows far bigger hordes)
+        max_monsters = MONSTER_SPAWN_CONFIG["max_monsters"]
+        if getattr(self.game, 'game_mode', "standard") == "swarm":
+            max_monsters = MONSTER_SPAWN_CONFIG["swarm_max_monsters"]
         monster_count = max(MONSTER_SPAWN_CONFIG["min_monsters"], 
-                           min(MONSTER_SPAWN_CONFIG["max_monsters"], monster_count))
+                           min(max_monsters, monster_count))
         
         # Create monsters
         monster_types = MONSTER_SPAWN_CONFIG["types"]
@@ -44,7 +53,7 @@ class MonsterSystem:
         
         for _ in range(monster_count):
             # Select type
-            monster_data = random.choices(monster_types, weights=weights)[0]
+            monster_data = rng_of(self.game).choices(monster_types, weights=weights)[0]
             
             # Scale stats
             hp_scale = 1 + (day_count - 1) * 0.2
@@ -56,108 +65,98 @@ class MonsterSystem:
             # Spawn position
             pos = self._get_spawn_position()
             
-            monster = Monster(monster_data["symbol"], hp, damage, pos, monster_data["speed"])
-            monster.max_hp = hp
-            self.monsters.append(monster)
+            self.monster_store.spawn(monster_data["symbol"], hp, damage, pos, monster_data["speed"])
         
         self.game.logger.info(f"Spawned {monster_count} monsters for day {day_count}")
     
     def _get_spawn_position(self):
         """Get random spawn position from screen edges"""
-        edge = random.choice(['top', 'left', 'right'])
+        rng = rng_of(self.game)
+        edge = rng.choice(['top', 'left', 'right'])
         if edge == 'top':
-            return [random.randint(100, SCREEN_WIDTH-100), 0]
+            return [rng.randint(100, SCREEN_WIDTH-100), 0]
         elif edge == 'left':
-            return [0, random.randint(100, SCREEN_HEIGHT-100)]
+            return [0, rng.randint(100, SCREEN_HEIGHT-100)]
         else:
-            return [SCREEN_WIDTH, random.randint(100, SCREEN_HEIGHT-100)]
+            return [SCREEN_WIDTH, rng.randint(100, SCREEN_HEIGHT-100)]
     
     def update(self, dt):
-        """Update all monsters"""
+        """Update all monsters - movement, contact damage and culling are vectorized"""
         if self.game.phase_manager.is_night_phase():
             return
-    
-        for monster in self.monsters[:]:
-            self._update_monster_movement(monster, dt)
-            self._handle_monster_attacks(monster, dt)
-    
-    def _update_monster_movement(self, monster, dt):
-        """Update monster movement towards targets"""
-        # Find nearest target
-        targets = []
         
-        # Add players as targets - sửa để tránh lỗi
-        if hasattr(self.game, 'player_manager') and hasattr(self.game.player_manager, 'players'):
-            for player in self.game.player_manager.players:
-                if player.is_alive:
-                    targets.append({"position": player.position, "is_player": True, "obj": player})
-        elif hasattr(self.game, 'players'):
-            for player in self.game.players:
-                if player.is_alive:
-                    targets.append({"position": player.position, "is_player": True, "obj": player})
+        # Drop monsters killed since the last tick (auto-combat, skills, ...)
+        self.cull_dead()
         
-        # Add NPCs as targets - sửa để tránh lỗi
-        if hasattr(self.game, 'npc_system') and hasattr(self.game.npc_system, 'npcs'):
-            for npc in self.game.npc_system.npcs:
-                if npc["alive"]:
-                    targets.append({"position": npc["position"], "is_player": False, "obj": npc})
-        
-        if not targets:
+        targets = self._get_targets()
+        if not targets or not self.monster_store:
             return
         
-        # Find nearest target
-        nearest = min(targets, key=lambda t: self._distance(monster.position, t["position"]))
+        # Every monster against every target in one NumPy pass (targets are few)
+        target_positions = np.array([position for position, _, _ in targets], dtype=np.float64)
+        self.monster_store.move_toward_nearest(target_positions, dt)
         
-        # Move towards target
-        dx = nearest["position"][0] - monster.position[0]
-        dy = nearest["position"][1] - monster.position[1]
-        dist = (dx**2 + dy**2)**0.5
-        
-        if dist > 0:
-            monster.position[0] += (dx / dist) * monster.speed * dt * 50
-            monster.position[1] += (dy / dist) * monster.speed * dt * 50
+        damage = self.monster_store.contact_damage(target_positions, dt, self.attack_range)
+        for (_, target, is_player), amount in zip(targets, damage):
+            if amount > 0:
+                self._apply_contact_damage(target, is_player, amount)
     
-    def _handle_monster_attacks(self, monster, dt):
-        """Handle monster attacks"""
-        # Find targets in attack range
-        for target in self._get_targets_in_range(monster, 30):
-            if target["is_player"]:
-                player = target["obj"]
-                player.hp = max(0, player.hp - monster.damage * dt)
-                if player.hp <= 0:
-                    player.is_alive = False
-                    if hasattr(self.game, 'ui_bridge'):
-                        self.game.ui_bridge.show_notification(f"{player.name} has fallen!", "error")
-            else:
-                npc = target["obj"]
-                npc["hp"] = max(0, npc["hp"] - monster.damage * dt)
-                if npc["hp"] <= 0:
-                    npc["alive"] = False
-                    if hasattr(self.game, 'ui_bridge'):
-                        self.game.ui_bridge.show_notification(f"NPC {npc['name']} has died!", "error")
+    def cull_dead(self):
+        """Compact dead monsters out of the store now instead of next tick
+        
+        Returns:
+            list: Views of the removed monsters
+        """
+        return self.monster_store.cull_dead()
     
-    def _get_targets_in_range(self, monster, range):
-        """Get all targets within range"""
-        targets = []
+    def kill(self, *monsters):
+        """Mark monsters dead and compact them out of the store right away
         
-        # Check players - sửa để tránh lỗi
+        Kill sites call this rather than waiting for update(), which is
+        skipped at night: a dead row must not be hit or credited again.
+        Several kills from one attack share a single compaction.
+        """
+        for monster in monsters:
+            monster.alive = False
+        if monsters:
+            self.cull_dead()
+    
+    def _get_players(self):
+        """Get players from player_manager if available, else from game"""
         if hasattr(self.game, 'player_manager') and hasattr(self.game.player_manager, 'players'):
-            for player in self.game.player_manager.players:
-                if player.is_alive and self._distance(monster.position, player.position) < range:
-                    targets.append({"position": player.position, "is_player": True, "obj": player})
+            return self.game.player_manager.players
         elif hasattr(self.game, 'players'):
-            for player in self.game.players:
-                if player.is_alive and self._distance(monster.position, player.position) < range:
-                    targets.append({"position": player.position, "is_player": True, "obj": player})
+            return self.game.players
+        return []
+    
+    def _get_targets(self):
+        """Alive players and NPCs monsters can chase this tick
         
-        # Check NPCs - sửa để tránh lỗi
+        Returns:
+            list: (position, target, is_player) tuples
+        """
+        targets = [(player.position, player, True) for player in self._get_players() if player.is_alive]
         if hasattr(self.game, 'npc_system') and hasattr(self.game.npc_system, 'npcs'):
-            for npc in self.game.npc_system.npcs:
-                if npc["alive"] and self._distance(monster.position, npc["position"]) < range:
-                    targets.append({"position": npc["position"], "is_player": False, "obj": npc})
-        
+            targets.extend((npc["position"], npc, False) for npc in self.game.npc_system.npcs if npc["alive"])
         return targets
     
+    def _apply_contact_damage(self, target, is_player, amount):
+        """Apply one tick of summed monster contact damage to a target"""
+        if is_player:
+            player = target
+            player.hp = max(0, player.hp - amount)
+            if player.hp <= 0:
+                player.is_alive = False
+                if hasattr(self.game, 'ui_bridge'):
+                    self.game.ui_bridge.show_notification(f"{player.name} has fallen!", "error")
+        else:
+            npc = target
+            npc["hp"] = max(0, npc["hp"] - amount)
+            if npc["hp"] <= 0:
+                npc["alive"] = False
+                if hasattr(self.game, 'ui_bridge'):
+                    self.game.ui_bridge.show_notification(f"NPC {npc['name']} has died!", "error")
+    
     def _distance(self, pos1, pos2):
         """Calculate distance between positions"""
         dx = pos1[0] - pos2[0]
@@ -175,7 +174,7 @@ class MonsterSystem:
                 
                 # Draw symbol
                 if hasattr(self.game, 'font'):
-                    font_surface = self.game.font.render(monster.symbol, True, (255, 255, 255))
+                    font_surface = render_text(self.game.font, monster.symbol, (255, 255, 255))
                     rect = font_surface.get_rect(center=(int(monster.position[0]), int(monster.position[1])))
                     screen.blit(font_surface, rect)
                 else:
@@ -186,6 +185,21 @@ class MonsterSystem:
                 # Sửa: Vẽ thanh máu cho quái vật
                 self._draw_monster_health(screen, monster)
 
+    def get_dirty_rects(self):
+        """Screen rects covering every monster as drawn by draw() (sprite, symbol, health bar)"""
+        if self.game.phase_manager.is_night_phase() and not getattr(self.game, 'debug_mode', False):
+            return []
+        
+        font = getattr(self.game, 'font', None)
+        rects = []
+        for monster in self.monsters:
+            x, y = int(monster.position[0]), int(monster.position[1])
+            rect = pygame.Rect(x - 15, y - 15, 30, 30)
+            if font:
+                rect.union_ip(render_text(font, monster.symbol, (255, 255, 255)).get_rect(center=(x, y)))
+            rects.append(rect)
+        return rects
+    
     def _draw_monster_health(self, screen, monster):
         """Vẽ thanh máu của quái vật"""
         # Đảm bảo quái vật có thuộc tính max_hp
@@ -216,10 +230,7 @@ class MonsterSystem:
                 
     def apply_difficulty_scaling(self, scaling_factor):
         """Scale monster stats by difficulty factor"""
-        for monster in self.monsters:
-            monster.max_hp = int(monster.max_hp * scaling_factor)
-            monster.hp = monster.max_hp
-            monster.damage = int(monster.damage * scaling_factor)
+        self.monster_store.scale_stats(scaling_factor)
     
     def spawn_boss(self, day):
         """Spawn boss on certain days"""
@@ -236,19 +247,18 @@ class MonsterSystem:
         boss_data = boss_types[day]
         boss_pos = self._get_spawn_position()
         
-        boss = Monster(
+        self.monster_store.spawn(
             boss_data["symbol"], 
             boss_data["hp"], 
             boss_data["damage"], 
             boss_pos, 
-            boss_data["speed"]
+            boss_data["speed"],
+            is_boss=True
         )
-        boss.is_boss = True
-        self.monsters.append(boss)
         
         if hasattr(self.game, 'ui_bridge'):
             self.game.ui_bridge.show_notification(f"BOSS HAS APPEARED!", "warning")
     
     def reset(self):
         """Reset the monster system"""
-        self.monsters.clear()
+        self.monster_store.clear()
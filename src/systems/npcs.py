@@ -28,6 +28,17 @@ class NPCSystem:
         # Có thể thêm logic di chuyển NPC ở đây
         pass
     
+    def get_dirty_rects(self):
+        """Screen rects covering every NPC as drawn by draw() (body, health bar, name)"""
+        rects = []
+        for npc in self.npcs:
+            if npc["alive"]:
+                x, y = int(npc["position"][0]), int(npc["position"][1])
+                name_width, name_height = self.game.small_font.size(npc["name"])
+                rect = pygame.Rect(x - 30, y - 25, max(50, name_width), 15 + name_height)
+                rects.append(rect.union(pygame.Rect(x - 20, y - 25, 40, 35)))
+        return rects
+    
     def draw(self, screen):
         """Draw all NPCs"""
         for npc in self.npcs:
@@ -3,6 +3,7 @@
 import pygame
 import math
 from typing import List, Dict, Optional
+from ..utils.font_utils import get_sys_font
 
 class CardSelectionUI:
     """Card selection UI that matches the style in the screenshot"""
@@ -14,9 +15,9 @@ class CardSelectionUI:
         self.screen_height = game.screen.get_height()
         
         # Fonts
-        self.title_font = pygame.font.SysFont("Arial", 22, bold=True)
-        self.desc_font = pygame.font.SysFont("Arial", 16)
-        self.small_font = pygame.font.SysFont("Arial", 14)
+        self.title_font = get_sys_font("Arial", 22, bold=True)
+        self.desc_font = get_sys_font("Arial", 16)
+        self.small_font = get_sys_font("Arial", 14)
         
         # Card properties
         self.card_width = 200
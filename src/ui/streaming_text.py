@@ -0,0 +1,99 @@
+# src/ui/streaming_text.py
+"""
+Word-wrapped text box that grows as a streamed reply arrives
+"""
+from typing import List, Optional
+
+import pygame
+
+from ..utils.font_utils import render_text
+
+class StreamingTextBox:
+    """
+    Text that is appended piece by piece and wrapped to ``max_width``
+
+    Only the last, still open line is re-wrapped when text is appended;
+    lines above it are final. Final lines are drawn through the shared
+    ``text_cache`` (greetings and cached replies repeat, so their surfaces
+    are reused), while the open line is rendered once per change without
+    polluting the cache with half-typed strings.
+    """
+
+    def __init__(self, font, max_width: int, color=(255, 255, 255), line_spacing: int = 2,
+                 max_lines: Optional[int] = None):
+        self.font = font
+        self.max_width = max_width
+        self.color = color
+        self.line_spacing = line_spacing
+        self.max_lines = max_lines
+        self.lines: List[str] = []  # Final lines
+        self.open_line = ""
+        self._open_surface: Optional[pygame.Surface] = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self.lines) + self.open_line
+
+    @property
+    def height(self) -> int:
+        line_count = len(self.lines) + (1 if self.open_line else 0)
+        return line_count * (self.font.get_linesize() + self.line_spacing)
+
+    def clear(self):
+        self.lines = []
+        self.open_line = ""
+        self._open_surface = None
+
+    def set_text(self, text: str):
+        self.clear()
+        self.append(text)
+
+    def append(self, piece: str):
+        """Add streamed text; wraps only the open line"""
+        if not piece:
+            return
+        paragraphs = (self.open_line + piece).split("\n")
+        for paragraph in paragraphs[:-1]:
+            self.lines.extend(self._wrap(paragraph))
+            # Keep the break so .text round-trips
+            self.lines[-1] += "\n"
+        wrapped = self._wrap(paragraphs[-1])
+        self.lines.extend(wrapped[:-1])
+        self.open_line = wrapped[-1]
+        self._open_surface = None
+        if self.max_lines is not None and len(self.lines) >= self.max_lines:
+            # Scroll: keep the newest lines
+            del self.lines[:len(self.lines) - self.max_lines + 1]
+
+    def _wrap(self, text: str) -> List[str]:
+        """
+        Greedy word wrap; every line but the last keeps its trailing space,
+        so joining the lines gives the original text back
+        """
+        lines = []
+        current = ""
+        for word in text.split(" "):
+            candidate = f"{current} {word}" if current else word
+            if current and self.font.size(candidate.rstrip())[0] > self.max_width:
+                lines.append(current + " ")
+                current = word
+            else:
+                current = candidate
+        lines.append(current)
+        return lines
+
+    def draw(self, surface: pygame.Surface, position) -> pygame.Rect:
+        """Blit the box with its top-left at position; returns the drawn area"""
+        x, y = position
+        area = pygame.Rect(x, y, 0, 0)
+        step = self.font.get_linesize() + self.line_spacing
+        for line in self.lines:
+            line = line.rstrip()
+            if line:
+                area.union_ip(surface.blit(render_text(self.font, line, self.color), (x, y)))
+            y += step
+        if self.open_line:
+            if self._open_surface is None:
+                self._open_surface = render_text(self.font, self.open_line, self.color, cached=False)
+            area.union_ip(surface.blit(self._open_surface, (x, y)))
+        return area
@@ -0,0 +1,99 @@
+# src/utils/dirty_rects.py
+"""
+Dirty-rectangle display updates
+"""
+from typing import Iterable, List, Optional
+import pygame
+
+# Above this share of the screen a single flip is cheaper than many rects
+FULL_FLIP_AREA_RATIO = 0.5
+
+class DirtyRectRenderer:
+    """
+    Push only the changed parts of the frame to the display
+
+    Each frame:
+        1. ``begin_frame()`` restores the cached static layer under
+           everything drawn last frame (or the whole screen after
+           ``invalidate()``).
+        2. The game draws as usual and reports what it drew with ``mark()``.
+        3. ``present()`` calls ``pygame.display.update`` with last frame's
+           and this frame's rects, so moved sprites are erased and redrawn.
+
+    Anything drawn outside the marked rects is left behind, so systems must
+    report every region they draw. ``full_refresh_interval`` forces a full
+    repaint every so often to clean up after any that don't.
+    """
+
+    def __init__(self, screen: pygame.Surface, full_refresh_interval: int = 0):
+        self.screen = screen
+        self.screen_rect = screen.get_rect()
+        self.static_layer = pygame.Surface(screen.get_size()).convert()
+        self.full_refresh_interval = full_refresh_interval
+        self.prev_rects: List[pygame.Rect] = []
+        self.rects: List[pygame.Rect] = []
+        self.full_redraw = True
+        self.frames_since_full = 0
+
+        # Stats for the last presented frame
+        self.last_rect_count = 0
+        self.last_area = 0
+
+    def set_static_layer(self, draw_fn):
+        """
+        Rebuild the cached static layer (background, panel frames, ...)
+
+        Args:
+            draw_fn (callable): Called with the layer surface to draw onto
+        """
+        draw_fn(self.static_layer)
+        self.invalidate()
+
+    def invalidate(self):
+        """Repaint and flip the whole screen on the next frame"""
+        self.full_redraw = True
+
+    def begin_frame(self):
+        """Erase last frame's dynamic content by restoring the static layer"""
+        if self.full_refresh_interval and self.frames_since_full >= self.full_refresh_interval:
+            self.full_redraw = True
+
+        if self.full_redraw:
+            self.screen.blit(self.static_layer, (0, 0))
+        else:
+            for rect in self.prev_rects:
+                self.screen.blit(self.static_layer, rect, rect)
+        self.rects = []
+
+    def mark(self, rects: Iterable[Optional[pygame.Rect]]):
+        """Report screen regions drawn this frame (None entries are ignored)"""
+        clip = self.screen_rect
+        for rect in rects:
+            if rect is None:
+                continue
+            rect = clip.clip(rect)
+            if rect.width and rect.height:
+                self.rects.append(rect)
+
+    def present(self):
+        """Update the changed regions of the display"""
+        # Static regions (HUD panels) repeat every frame; send each rect once
+        update_rects = list({tuple(r): r for r in self.prev_rects + self.rects}.values())
+        area = sum(r.width * r.height for r in update_rects)
+        screen_area = self.screen_rect.width * self.screen_rect.height
+
+        if self.full_redraw or area > screen_area * FULL_FLIP_AREA_RATIO:
+            pygame.display.flip()
+            self.full_redraw = False
+            self.frames_since_full = 0
+            self.last_rect_count = 1
+            self.last_area = screen_area
+        else:
+            if update_rects:
+                pygame.display.update(update_rects)
+            self.frames_since_full += 1
+            self.last_rect_count = len(update_rects)
+            self.last_area = area
+
+        self.prev_rects = self.rects
+        self.rects = []
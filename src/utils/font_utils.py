@@ -3,6 +3,7 @@ Font utilities for supporting multilingual text rendering including Vietnamese
 """
 import os
 import unicodedata
+from collections import OrderedDict
 import pygame
 from pathlib import Path
 
@@ -16,6 +17,9 @@ NOTO_BOLD = FONT_DIR / "NotoSans-Bold.ttf"
 NOTO_ITALIC = FONT_DIR / "NotoSans-Italic.ttf"
 NOTO_BOLD_ITALIC = FONT_DIR / "NotoSans-BoldItalic.ttf"
 
+# Maximum number of rendered text surfaces kept by render_text
+TEXT_CACHE_SIZE = 1024
+
 # Vietnamese character handling
 def normalize_vietnamese(text):
     """
@@ -34,10 +38,19 @@ def normalize_vietnamese(text):
     # This ensures combining diacritical marks are properly combined with base characters
     return unicodedata.normalize('NFC', text)
 
+# Process-wide font registry: (source, size, bold, italic) -> pygame font
+_font_registry = {}
+
+# Sizes loaded by preload_fonts when none are given
+PRELOAD_FONT_SIZES = (14, 18, 24, 32)
+
 def get_font(size, bold=False, italic=False):
     """
     Get a font that supports Vietnamese characters
 
+    Fonts come from a process-wide registry, so each (size, style) is loaded
+    from disk - or resolved to its fallback - only once.
+
     Args:
         size (int): Font size
         bold (bool): Whether to use bold font
@@ -46,6 +59,60 @@ def get_font(size, bold=False, italic=False):
     Returns:
         pygame.font.Font: Font object that supports Vietnamese
     """
+    key = ("noto", size, bold, italic)
+    font = _font_registry.get(key)
+    if font is None:
+        font = _font_registry[key] = _load_font(size, bold, italic)
+    return font
+
+def get_sys_font(name, size, bold=False, italic=False):
+    """
+    Get a system font (or pygame's default font when name is None) from the registry
+
+    Args:
+        name (str): System font name such as "Arial", or None
+        size (int): Font size
+        bold (bool): Whether to use bold font
+        italic (bool): Whether to use italic font
+
+    Returns:
+        pygame.font.Font: Shared font object
+    """
+    key = (name, size, bold, italic)
+    font = _font_registry.get(key)
+    if font is None:
+        if name is None:
+            font = pygame.font.Font(None, size)
+            font.set_bold(bold)
+            font.set_italic(italic)
+        else:
+            font = pygame.font.SysFont(name, size, bold=bold, italic=italic)
+        _font_registry[key] = font
+    return font
+
+def preload_fonts(sizes=PRELOAD_FONT_SIZES, styles=((False, False), (True, False))):
+    """
+    Load fonts up front so opening a screen does not hit the disk
+
+    Args:
+        sizes (iterable): Font sizes to load
+        styles (iterable): (bold, italic) pairs to load for each size
+
+    Returns:
+        int: Number of fonts now in the registry
+    """
+    for size in sizes:
+        for bold, italic in styles:
+            get_font(size, bold, italic)
+    return len(_font_registry)
+
+def clear_font_registry():
+    """Forget every loaded font (call after pygame.font.quit())"""
+    _font_registry.clear()
+    text_cache.clear()
+
+def _load_font(size, bold=False, italic=False):
+    """Load a Noto font from disk, falling back to a system font"""
     # Select the appropriate font file
     if bold and italic:
         font_path = NOTO_BOLD_ITALIC
@@ -60,7 +127,7 @@ def get_font(size, bold=False, italic=False):
     if not os.path.exists(font_path):
         # Fall back to system font if font file not found
         print(f"Warning: Font file not found: {font_path}")
-        return pygame.font.SysFont("Arial", size, bold=bold, italic=italic)
+        return get_sys_font("Arial", size, bold, italic)
 
     try:
         # Load font with unicode=True to ensure proper handling of Unicode characters
@@ -68,12 +135,111 @@ def get_font(size, bold=False, italic=False):
     except Exception as e:
         print(f"Error loading font: {e}")
         # Fall back to system font
-        return pygame.font.SysFont("Arial", size, bold=bold, italic=italic)
+        return get_sys_font("Arial", size, bold, italic)
 
-def render_text(font, text, color=(255, 255, 255), background=None):
+class TextSurfaceCache:
+    """
+    LRU cache of rendered text surfaces
+
+    HUD labels, names and card text are mostly identical from one frame to
+    the next, so the rasterized surface is reused instead of re-running
+    normalization and font.render every frame. Cached surfaces are shared:
+    callers must blit them, not draw onto them.
+    """
+
+    def __init__(self, max_size=TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    def get(self, font, text, color, background=None):
+        """
+        Get the rendered surface for text, rendering it on a miss
+
+        Args:
+            font (pygame.font.Font): Font to use
+            text (str): Text to render
+            color (tuple): RGB color tuple
+            background (tuple): RGB background color tuple or None
+
+        Returns:
+            pygame.Surface: Rendered text surface
+        """
+        key = (font, text, tuple(color), tuple(background) if background is not None else None)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = _render_text_uncached(font, text, color, background)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def resize(self, max_size):
+        """Change the size bound, evicting the oldest entries if needed"""
+        self.max_size = max_size
+        while len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached surface and reset counters"""
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """
+        Get cache counters
+
+        Returns:
+            dict: hits, misses, hit_rate, size and max_size
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self.surfaces),
+            "max_size": self.max_size,
+        }
+
+# Shared cache used by render_text
+text_cache = TextSurfaceCache()
+
+def render_text(font, text, color=(255, 255, 255), background=None, cached=True):
     """
     Render text with proper encoding for Vietnamese
 
+    Results are served from the shared LRU ``text_cache``; the returned
+    surface may be shared with other callers and must not be modified.
+
+    Args:
+        font (pygame.font.Font): Font to use
+        text (str): Text to render (can include Vietnamese)
+        color (tuple): RGB color tuple
+        background (tuple): RGB background color tuple or None for transparent
+        cached (bool): False for one-off text (e.g. a line still being typed)
+            that would only push reusable surfaces out of the cache
+
+    Returns:
+        pygame.Surface: Rendered text surface
+    """
+    if not cached:
+        return _render_text_uncached(font, text, color, background)
+    return text_cache.get(font, text, color, background)
+
+def _render_text_uncached(font, text, color=(255, 255, 255), background=None):
+    """
+    Render text with proper encoding for Vietnamese, bypassing the cache
+
     Args:
         font (pygame.font.Font): Font to use
         text (str): Text to render (can include Vietnamese)
@@ -96,12 +262,12 @@ def render_text(font, text, color=(255, 255, 255), background=None):
             return font.render(normalized_text, True, color, background)
         except Exception as e:
             print(f"Failed second attempt to render text: {e}")
-            fallback_font = pygame.font.SysFont("Arial", font.get_height())
+            fallback_font = get_sys_font("Arial", font.get_height())
             return fallback_font.render(text, True, color, background)
     except Exception as e:
         print(f"Error rendering text: {e}")
         # Try rendering with default font if there's an error
-        fallback_font = pygame.font.SysFont("Arial", font.get_height())
+        fallback_font = get_sys_font("Arial", font.get_height())
         return fallback_font.render(text, True, color, background)
 
 # Input text handling for Vietnamese
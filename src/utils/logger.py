@@ -16,6 +16,11 @@ def setup_logger(name: str, log_level=logging.INFO):
     logger = logging.getLogger(name)
     logger.setLevel(log_level)
     
+    # Reuse existing handlers - many Game instances per process (headless sims)
+    # would otherwise open a new log file and duplicate every line
+    if logger.handlers:
+        return logger
+    
     # Create formatter
     formatter = logging.Formatter(
         fmt='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
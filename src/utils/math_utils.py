@@ -1,16 +1,17 @@
 # src/utils/math_utils.py
 
-import random
 import math
+from .rng import rng as default_rng
 
 def distance(a, b):
     """Tính khoảng cách Euclidean giữa hai điểm a và b."""
     return math.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2)
 
-def random_position(bounds=(1000, 800)):
-    """Trả về vị trí ngẫu nhiên trong giới hạn màn hình."""
-    return (random.randint(0, bounds[0]), random.randint(0, bounds[1]))
+def random_position(bounds=(1000, 800), rng=None):
+    """Trả về vị trí ngẫu nhiên trong giới hạn màn hình (rng: bộ sinh số của trận, mặc định dùng chung)."""
+    rng = rng or default_rng
+    return (rng.randint(0, bounds[0]), rng.randint(0, bounds[1]))
 
-def chance(percent):
+def chance(percent, rng=None):
     """Trả về True với xác suất phần trăm cho trước."""
-    return random.random() < percent / 100
+    return (rng or default_rng).random() < percent / 100
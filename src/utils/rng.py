@@ -0,0 +1,28 @@
+# src/utils/rng.py
+"""
+Seeded random number generators for gameplay systems
+"""
+import random
+
+# Fallback for code that runs outside a Game (tools, tests). Every Game owns
+# its own generator (``Game.rng``) and its systems draw from that one, so
+# several matches in one process never share random state.
+rng = random.Random()
+
+def new_rng(seed=None):
+    """
+    Create a generator for one match
+
+    Args:
+        seed (int): Seed to use, or None to pick a fresh one
+
+    Returns:
+        tuple: (random.Random, seed actually used - log it to replay the match)
+    """
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+    return random.Random(seed), seed
+
+def rng_of(owner):
+    """Generator attached to owner (a Game, or an entity a Game created), or the fallback"""
+    return getattr(owner, "rng", None) or rng
@@ -0,0 +1,25 @@
+# src/utils/shared.py
+"""
+Process-wide instances created on first use
+"""
+import functools
+import threading
+
+def process_wide(factory):
+    """
+    Turn a zero-argument factory into an accessor for one shared instance
+
+    The factory runs on the first call only (under a lock, so concurrent
+    first callers still get the same object); later calls return that
+    instance.
+    """
+    lock = threading.Lock()
+    instance = []
+
+    @functools.wraps(factory)
+    def get():
+        with lock:
+            if not instance:
+                instance.append(factory())
+            return instance[0]
+    return get
@@ -0,0 +1,170 @@
+# src/utils/spatial_hash.py
+"""
+Uniform-grid spatial hash for fast proximity queries
+"""
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+# Below this many entries a plain scan beats walking grid rings
+LINEAR_SCAN_THRESHOLD = 16
+
+class SpatialHash:
+    """
+    Buckets entities into square cells so nearest/radius queries only look
+    at nearby cells instead of every entity.
+
+    The grid is meant to be rebuilt once per tick: ``clear()`` then
+    ``insert()`` every entity. Entries are stored as ``(x, y, item)`` and
+    queries return those same tuples.
+    """
+
+    def __init__(self, cell_size: float = 64):
+        self.cell_size = float(cell_size)
+        self.cells: Dict[Tuple[int, int], List[Tuple[float, float, Any]]] = {}
+        self.count = 0
+
+        # Occupied cell bounds, used to stop ring searches early
+        self.min_cx = self.min_cy = 0
+        self.max_cx = self.max_cy = -1
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        """Remove all entries"""
+        self.cells.clear()
+        self.count = 0
+        self.min_cx = self.min_cy = 0
+        self.max_cx = self.max_cy = -1
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+
+    def insert(self, position, item: Any):
+        """
+        Register an item at a position
+
+        Args:
+            position: (x, y) position of the item
+            item: Object returned by queries
+        """
+        x, y = position[0], position[1]
+        cx, cy = self._cell(x, y)
+        bucket = self.cells.get((cx, cy))
+        if bucket is None:
+            bucket = self.cells[(cx, cy)] = []
+        bucket.append((x, y, item))
+
+        if self.count == 0:
+            self.min_cx = self.max_cx = cx
+            self.min_cy = self.max_cy = cy
+        else:
+            if cx < self.min_cx: self.min_cx = cx
+            if cx > self.max_cx: self.max_cx = cx
+            if cy < self.min_cy: self.min_cy = cy
+            if cy > self.max_cy: self.max_cy = cy
+        self.count += 1
+
+    def entries(self):
+        """Iterate over every (x, y, item) entry"""
+        for bucket in self.cells.values():
+            yield from bucket
+
+    def query_radius(self, position, radius: float) -> List[Tuple[float, float, Any]]:
+        """
+        Get all entries strictly within radius of a position
+
+        Args:
+            position: (x, y) query centre
+            radius (float): Search radius
+
+        Returns:
+            list: (x, y, item) entries inside the circle
+        """
+        if self.count == 0:
+            return []
+
+        px, py = position[0], position[1]
+        r2 = radius * radius
+        min_cx, min_cy = self._cell(px - radius, py - radius)
+        max_cx, max_cy = self._cell(px + radius, py + radius)
+
+        # Only walk cells that can actually hold entries
+        min_cx = max(min_cx, self.min_cx)
+        min_cy = max(min_cy, self.min_cy)
+        max_cx = min(max_cx, self.max_cx)
+        max_cy = min(max_cy, self.max_cy)
+
+        result = []
+        cells = self.cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for entry in bucket:
+                    dx = entry[0] - px
+                    dy = entry[1] - py
+                    if dx * dx + dy * dy < r2:
+                        result.append(entry)
+        return result
+
+    def nearest(self, position, max_radius: Optional[float] = None) -> Optional[Tuple[float, float, Any]]:
+        """
+        Find the entry closest to a position
+
+        Args:
+            position: (x, y) query point
+            max_radius (float): Ignore entries further than this (None = no limit)
+
+        Returns:
+            tuple: (x, y, item) of the nearest entry, or None if nothing qualifies
+        """
+        if self.count == 0:
+            return None
+
+        px, py = position[0], position[1]
+        best = None
+        best_d2 = float('inf') if max_radius is None else max_radius * max_radius
+
+        # Few entries: a straight scan is cheaper than walking cells
+        if self.count <= LINEAR_SCAN_THRESHOLD:
+            for entry in self.entries():
+                dx = entry[0] - px
+                dy = entry[1] - py
+                d2 = dx * dx + dy * dy
+                if d2 <= best_d2:
+                    best_d2 = d2
+                    best = entry
+            return best
+
+        # Walk square rings of cells outward from the query cell
+        ox, oy = self._cell(px, py)
+        max_ring = max(abs(ox - self.min_cx), abs(self.max_cx - ox),
+                       abs(oy - self.min_cy), abs(self.max_cy - oy))
+        cells = self.cells
+
+        for ring in range(max_ring + 1):
+            for cx in range(max(ox - ring, self.min_cx), min(ox + ring, self.max_cx) + 1):
+                on_edge_x = cx == ox - ring or cx == ox + ring
+                for cy in range(max(oy - ring, self.min_cy), min(oy + ring, self.max_cy) + 1):
+                    # Interior cells were covered by smaller rings
+                    if not on_edge_x and cy != oy - ring and cy != oy + ring:
+                        continue
+                    bucket = cells.get((cx, cy))
+                    if not bucket:
+                        continue
+                    for entry in bucket:
+                        dx = entry[0] - px
+                        dy = entry[1] - py
+                        d2 = dx * dx + dy * dy
+                        if d2 <= best_d2:
+                            best_d2 = d2
+                            best = entry
+
+            # Anything in a later ring is at least ring * cell_size away
+            reach = ring * self.cell_size
+            if best_d2 <= reach * reach:
+                break
+
+        return best
@@ -0,0 +1,266 @@
+# src/utils/sprite_cache.py
+"""
+Pre-rendered surfaces for visual effects
+"""
+import math
+from collections import OrderedDict
+import pygame
+
+# Radii are rounded up to a multiple of this so nearby sizes share a stamp
+RADIUS_BUCKET = 2
+
+# Rotated sprites: angles snap to 360 / ANGLE_STEPS degrees, lengths to SIZE_BUCKET pixels
+ANGLE_STEPS = 64
+SIZE_BUCKET = 4
+MAX_ROTATION_PIXELS = 4_000_000  # ~16 MB of RGBA surfaces
+
+# Beams change length and width every frame: one full-length sprite is cached
+# per coarse (length, width) bucket and clipped to the current length
+BEAM_LENGTH_BUCKET = 64
+BEAM_WIDTH_BUCKET = 4
+
+# Extra rotation (degrees) for shapes drawn pointing up rather than along +x
+ROTATION_OFFSETS = {'triangle': -90, 'star': -90}
+
+class StampCache:
+    """
+    Pre-rendered effect stamps keyed by (shape, radius bucket, color)
+
+    Stamps are drawn at full opacity once; per-frame fading is applied with
+    ``set_alpha`` right before blitting, so no surface is allocated while
+    drawing. Stamps are shared and must only be blitted.
+    """
+
+    def __init__(self, max_size: int = 512, radius_bucket: int = RADIUS_BUCKET):
+        self.max_size = max_size
+        self.radius_bucket = radius_bucket
+        self.stamps = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.stamps)
+
+    def bucket(self, radius: float) -> int:
+        """Round a radius up to its bucket (at least one bucket)"""
+        step = self.radius_bucket
+        return max(step, int(math.ceil(radius / step)) * step)
+
+    def get(self, shape: str, radius: float, color) -> pygame.Surface:
+        """
+        Get the stamp for a shape, building it on first use
+
+        Args:
+            shape (str): 'circle', 'ring', 'aoe', 'triangle' or 'star'
+            radius (float): Half the stamp size in pixels
+            color (tuple): RGB color
+
+        Returns:
+            pygame.Surface: Square SRCALPHA surface of side 2 * bucketed radius
+        """
+        key = (shape, self.bucket(radius), tuple(color[:3]))
+        stamp = self.stamps.get(key)
+        if stamp is not None:
+            self.hits += 1
+            self.stamps.move_to_end(key)
+            return stamp
+
+        self.misses += 1
+        stamp = draw_shape(shape, key[1], key[2])
+        self.stamps[key] = stamp
+        if len(self.stamps) > self.max_size:
+            self.stamps.popitem(last=False)
+        return stamp
+
+    def blit(self, screen, shape: str, radius: float, color, center, alpha: int = 255):
+        """Blit a faded stamp centred on a position"""
+        if radius <= 0 or alpha <= 0:
+            return
+        stamp = self.get(shape, radius, color)
+        stamp.set_alpha(alpha)
+        screen.blit(stamp, stamp.get_rect(center=(int(center[0]), int(center[1]))))
+
+    def clear(self):
+        """Drop every stamp and reset counters"""
+        self.stamps.clear()
+        self.hits = 0
+        self.misses = 0
+
+class RotationCache:
+    """
+    Lazily built rotated sprites for directional effects
+
+    Each (kind, quantized size, color, angle step) is drawn and rotated once;
+    afterwards drawing is a plain blit. Entries are evicted least recently
+    used once their total pixel count exceeds ``max_pixels``.
+
+    Kinds:
+        'attack': slash of size (range, width) from the centre outward
+        'beam': gradient beam of size (length, width) from the centre outward;
+            draw it with ``blit_beam``, which reuses one sprite while it grows
+        'triangle' / 'star': projectile shapes of size (radius,)
+    """
+
+    def __init__(self, angle_steps: int = ANGLE_STEPS, size_bucket: int = SIZE_BUCKET,
+                 max_pixels: int = MAX_ROTATION_PIXELS):
+        self.angle_steps = angle_steps
+        self.size_bucket = size_bucket
+        self.max_pixels = max_pixels
+        self.sprites = OrderedDict()
+        self.pixels = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def _quantize_size(self, size) -> tuple:
+        step = self.size_bucket
+        return tuple(max(step, int(math.ceil(d / step)) * step) for d in size)
+
+    def _angle_step(self, direction: float) -> int:
+        return int(round(direction / (2 * math.pi) * self.angle_steps)) % self.angle_steps
+
+    def get(self, kind: str, size, color, direction: float) -> pygame.Surface:
+        """
+        Get a rotated sprite, building it on first use
+
+        Args:
+            kind (str): Sprite kind (see class docstring)
+            size (tuple): Kind-specific dimensions in pixels
+            color (tuple): RGB color
+            direction (float): Facing in radians, screen coordinates
+
+        Returns:
+            pygame.Surface: Rotated SRCALPHA surface to blit centred on the source
+        """
+        key = (kind, self._quantize_size(size), tuple(color[:3]), self._angle_step(direction))
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            self.sprites.move_to_end(key)
+            return sprite
+
+        self.misses += 1
+        base = draw_directional(kind, key[1], key[2])
+        degrees = -key[3] * 360.0 / self.angle_steps + ROTATION_OFFSETS.get(kind, 0)
+        sprite = pygame.transform.rotate(base, degrees)
+
+        self.sprites[key] = sprite
+        self.pixels += sprite.get_width() * sprite.get_height()
+        while self.pixels > self.max_pixels and len(self.sprites) > 1:
+            _, old = self.sprites.popitem(last=False)
+            self.pixels -= old.get_width() * old.get_height()
+        return sprite
+
+    def blit(self, screen, kind: str, size, color, center, direction: float, alpha: int = 255):
+        """Blit a faded rotated sprite centred on a position"""
+        if alpha <= 0 or min(size) <= 0:
+            return
+        sprite = self.get(kind, size, color, direction)
+        sprite.set_alpha(alpha)
+        screen.blit(sprite, sprite.get_rect(center=(int(center[0]), int(center[1]))))
+
+    def blit_beam(self, screen, max_length: float, width: float, color, source, direction: float,
+                  length: float = None, alpha: int = 255):
+        """
+        Blit the first ``length`` pixels of a beam leaving ``source``
+
+        The sprite is the beam at ``max_length`` rounded up to
+        BEAM_LENGTH_BUCKET (width to BEAM_WIDTH_BUCKET), so a growing and
+        thinning beam reuses a few sprites; the part past ``length`` is
+        clipped away by the blit area.
+        """
+        length = max_length if length is None else min(length, max_length)
+        if alpha <= 0 or length <= 0 or width <= 0:
+            return
+        size = (max(BEAM_LENGTH_BUCKET, int(math.ceil(max_length / BEAM_LENGTH_BUCKET)) * BEAM_LENGTH_BUCKET),
+                max(BEAM_WIDTH_BUCKET, int(math.ceil(width / BEAM_WIDTH_BUCKET)) * BEAM_WIDTH_BUCKET))
+        sprite = self.get('beam', size, color, direction)
+        sprite.set_alpha(alpha)
+        sx, sy = int(source[0]), int(source[1])
+        rect = sprite.get_rect(center=(sx, sy))
+
+        # Box around the segment source -> source + length, padded by half the width
+        half = size[1] // 2 + 1
+        ex, ey = sx + math.cos(direction) * length, sy + math.sin(direction) * length
+        left, top = int(min(sx, ex)) - half, int(min(sy, ey)) - half
+        area = pygame.Rect(left - rect.x, top - rect.y,
+                           int(max(sx, ex)) + half - left, int(max(sy, ey)) + half - top)
+        area = area.clip(sprite.get_rect())
+        screen.blit(sprite, (rect.x + area.x, rect.y + area.y), area)
+
+    def clear(self):
+        """Drop every sprite and reset counters"""
+        self.sprites.clear()
+        self.pixels = 0
+        self.hits = 0
+        self.misses = 0
+
+def draw_directional(kind: str, size: tuple, color) -> pygame.Surface:
+    """
+    Draw an unrotated directional sprite pointing along +x from its centre
+
+    Args:
+        kind (str): 'attack', 'beam', 'triangle' or 'star'
+        size (tuple): (length, width) for attack/beam, (radius,) for shapes
+        color (tuple): RGB color
+
+    Returns:
+        pygame.Surface: Rendered sprite
+    """
+    if kind in ('triangle', 'star'):
+        return draw_shape(kind, size[0], color)
+
+    length, width = size
+    surf = pygame.Surface((length * 2, width), pygame.SRCALPHA)
+    start, end = (length, width // 2), (length * 2, width // 2)
+    if kind == 'attack':
+        pygame.draw.line(surf, color, start, end, width)
+    elif kind == 'beam':
+        pygame.draw.line(surf, color, start, end, width)
+        # Brighter core towards the middle of the beam
+        for i in range(5):
+            gradient_color = (*color, int(255 * (5 - i) / 5))
+            pygame.draw.line(surf, gradient_color, start, end, max(1, width - i * 2))
+    else:
+        raise ValueError(f"Unknown sprite kind: {kind}")
+    return surf
+
+def draw_shape(shape: str, radius: int, color) -> pygame.Surface:
+    """
+    Draw a single effect shape onto a new transparent surface
+
+    Args:
+        shape (str): 'circle', 'ring', 'aoe', 'triangle' or 'star'
+        radius (int): Half the surface size in pixels
+        color (tuple): RGB color
+
+    Returns:
+        pygame.Surface: Rendered shape
+    """
+    size = radius * 2
+    surf = pygame.Surface((size, size), pygame.SRCALPHA)
+    center = (radius, radius)
+
+    if shape == 'circle':
+        pygame.draw.circle(surf, color, center, radius)
+    elif shape == 'ring':
+        pygame.draw.circle(surf, color, center, radius, 3)
+    elif shape == 'aoe':
+        # Translucent fill with a brighter rim, matching the old per-frame drawing
+        pygame.draw.circle(surf, (*color, 200), center, radius)
+        pygame.draw.circle(surf, (*color, 255), center, radius, 3)
+    elif shape == 'triangle':
+        pygame.draw.polygon(surf, color, [(radius, 0), (0, size), (size, size)])
+    elif shape == 'star':
+        points = []
+        for i in range(10):
+            angle = math.pi * 2 * i / 10
+            r = radius if i % 2 == 0 else radius / 2
+            points.append((radius + r * math.cos(angle), radius + r * math.sin(angle)))
+        pygame.draw.polygon(surf, color, points)
+    else:
+        raise ValueError(f"Unknown stamp shape: {shape}")
+
+    return surf
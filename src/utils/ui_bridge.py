@@ -3,6 +3,7 @@
 import pygame
 from typing import Optional, List, Dict, Any
 from ..core.skills import SKILL_LIBRARY
+from .font_utils import get_sys_font
 
 class UIBridge:
     """Enhanced UI Bridge with proper notifications and visual feedback"""
@@ -12,8 +13,14 @@ class UIBridge:
         self.notifications: List[Dict[str, Any]] = []
         self.exp_share_notifications: List[Dict[str, Any]] = []  # Separate list for EXP sharing
         self.notification_timer = 0.0
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
+        
+        # Headless games never draw, so don't touch pygame.font at all
+        if getattr(game, 'headless', False):
+            self.font = None
+            self.small_font = None
+        else:
+            self.font = get_sys_font(None, 36)
+            self.small_font = get_sys_font(None, 24)
     
     def show_notification(self, message: str, type: str = "info", duration: float = 3.0):
         """Show notification with different types"""
@@ -0,0 +1,95 @@
+"""Local stand-in for the chat-completions API, for dialogue tests"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class StubLLMServer:
+    """
+    Serves POST /v1/chat/completions on 127.0.0.1 from a background thread
+
+    ``delay`` seconds pass before each answer; ``reply`` may be a string or
+    a function of the parsed request body. ``status`` may be a list, used
+    one entry per request (the last one repeats). Received bodies are kept
+    in ``requests``; ``connections`` counts accepted TCP connections.
+
+    Requests with ``"stream": true`` are answered with server-sent events,
+    one per word of the reply, ``piece_delay`` seconds apart.
+    """
+
+    def __init__(self, reply="Stub reply", delay=0.0, status=200, piece_delay=0.0):
+        self.reply = reply
+        self.delay = delay
+        self.status = status
+        self.piece_delay = piece_delay
+        self.requests = []
+        self.connections = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                stub.connections += 1
+                super().setup()
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                stub.requests.append(body)
+                time.sleep(stub.delay)
+                text = stub.reply(body) if callable(stub.reply) else stub.reply
+                if body.get("stream"):
+                    self.send_stream(text)
+                    return
+                data = json.dumps({"choices": [{"message": {"role": "assistant", "content": text}}]}).encode()
+                self.send_response(stub.next_status())
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                try:
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    # Client gave up (timeout test)
+                    pass
+
+            def send_stream(self, text):
+                self.send_response(stub.next_status())
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                words = text.split(" ")
+                pieces = [word if i == 0 else " " + word for i, word in enumerate(words)]
+                events = [{"choices": [{"delta": {"content": piece}}]} for piece in pieces]
+                try:
+                    for event in events:
+                        self.write_chunk(f"data: {json.dumps(event)}\n\n".encode())
+                        time.sleep(stub.piece_delay)
+                    self.write_chunk(b"data: [DONE]\n\n")
+                    self.wfile.write(b"0\r\n\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def write_chunk(self, data):
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/v1/chat/completions"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def next_status(self):
+        if isinstance(self.status, list):
+            return self.status.pop(0) if len(self.status) > 1 else self.status[0]
+        return self.status
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
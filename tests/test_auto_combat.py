@@ -0,0 +1,89 @@
+import unittest
+from types import SimpleNamespace
+import pygame
+from src.core.combat import AutoCombatSystem as CombatSystem
+from src.core.entities.monster_array import MonsterArray
+from src.systems.auto_combat_system import AutoCombatSystem
+from src.systems.monsters import MonsterSystem
+
+def make_player(name, position):
+    player = SimpleNamespace(name=name, position=position, is_alive=True, skills=[], exp=0)
+    player.add_exp = lambda amount: setattr(player, "exp", player.exp + amount)
+    return player
+
+def make_game(store, players):
+    game = SimpleNamespace(monsters=store.views, players=players)
+    game.monster_system = MonsterSystem(game)
+    game.monster_system.monster_store, game.monster_system.monsters = store, store.views
+    return game
+
+class TestBatchedAttacks(unittest.TestCase):
+    def setUp(self):
+        self.store = MonsterArray(capacity=2)
+        self.players = [make_player("A", (0.0, 0.0)), make_player("B", (10.0, 0.0)), make_player("C", (500.0, 0.0))]
+        self.combat = AutoCombatSystem(make_game(self.store, self.players))
+
+    def test_every_strike_on_one_monster_counts(self):
+        # Both A and B hit the same monster: np.subtract.at applies both strikes
+        monster = self.store.spawn("Z", hp=50, damage=5, position=(5, 0))
+        self.assertTrue(self.combat._resolve_batched_attacks(self.players, self.store))
+        self.assertEqual(monster.hp, 10)
+        self.assertFalse(self.combat._resolve_batched_attacks([self.players[2]], self.store))
+
+    def test_killer_is_the_strike_that_empties_hp(self):
+        far = self.store.spawn("Z", hp=100, damage=5, position=(495, 0))
+        doomed = self.store.spawn("Z", hp=30, damage=5, position=(5, 0))
+        self.combat._resolve_batched_attacks(self.players, self.store)
+        # ceil(30 / 20) = 2 strikes: B's, the second in player order, kills
+        self.assertEqual([p.exp for p in self.players], [0, 50, 0])
+        self.assertEqual(far.hp, 80)
+
+        # Culled at once: the dead row cannot be struck or credited again
+        self.assertEqual(len(self.store), 1)
+        self.assertIs(self.store.views[0], far)
+        self.assertFalse(doomed.alive)
+        self.combat._resolve_batched_attacks(self.players, self.store)
+        self.assertEqual([p.exp for p in self.players], [0, 50, 0])
+
+class TestDeadTargets(unittest.TestCase):
+    def test_unculled_dead_monster_gives_no_second_kill(self):
+        store = MonsterArray()
+        player = make_player("A", (0.0, 0.0))
+        combat = CombatSystem(make_game(store, [player]))
+        monster = store.spawn("Z", hp=20, damage=5, position=(10, 0))
+        survivor = store.spawn("Z", hp=100, damage=5, position=(20, 0))
+        self.assertTrue(combat.execute_attack(player, monster))
+        self.assertEqual(list(store.views), [survivor])
+        self.assertFalse(combat.execute_attack(player, monster))
+        self.assertIsNot(combat.find_monster_in_range(player, (50, 0)), monster)
+
+class TestDebugDirtyRects(unittest.TestCase):
+    def test_range_circle_and_cooldown_bar_are_covered(self):
+        player = make_player("A", (200.0, 200.0))
+        combat = AutoCombatSystem(make_game(MonsterArray(), [player]))
+        self.assertEqual(combat.get_dirty_rects(), [])
+
+        combat.game.debug_mode = True
+        screen = pygame.Surface((400, 400))
+        combat.draw(screen)
+        rects = combat.get_dirty_rects()
+        self.assertEqual(len(rects), 1)
+        drawn = [(x, y) for x in range(400) for y in range(400) if screen.get_at((x, y))[:3] != (0, 0, 0)]
+        self.assertTrue(drawn)
+        self.assertTrue(all(rects[0].collidepoint(point) for point in drawn))
+
+class TestKill(unittest.TestCase):
+    def test_one_compaction_for_several_kills(self):
+        store = MonsterArray()
+        system = make_game(store, []).monster_system
+        a, b, c = (store.spawn("Z", hp=10, damage=1, position=(i, 0)) for i in range(3))
+        culls = []
+        cull_dead = store.cull_dead
+        store.cull_dead = lambda: culls.append(1) or cull_dead()
+        system.kill(a, c)
+        self.assertEqual((len(culls), list(store.views)), (1, [b]))
+        system.kill()
+        self.assertEqual(len(culls), 1)
+
+if __name__ == "__main__":
+    unittest.main()
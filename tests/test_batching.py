@@ -0,0 +1,90 @@
+import json
+import random
+import unittest
+from collections import deque
+from src.network.batching import OutboundBatcher
+from src.network.prediction import PlayerPredictor
+from src.network.simulation import LobbySimulation
+
+def move(x, y=0, seq=None):
+    message = {"type": "game_action", "action": "move", "x": x, "y": y}
+    if seq is not None:
+        message["seq"] = seq
+    return message
+
+def frame_messages(frame):
+    data = json.loads(frame)
+    return data["messages"] if data["type"] == "batch" else [data]
+
+class TestOutboundBatcher(unittest.TestCase):
+    def setUp(self):
+        self.batcher = OutboundBatcher()
+
+    def test_state_is_coalesced_and_order_kept(self):
+        self.batcher.add({"type": "state_ack", "seq": 1})
+        self.batcher.add(move(1))
+        self.batcher.add({"type": "game_action", "action": "use_card", "index": 0})
+        self.batcher.add({"type": "state_ack", "seq": 2})
+        self.batcher.add(move(-1))
+        self.assertEqual(len(self.batcher), 3)
+        self.assertEqual(frame_messages(self.batcher.take_frame()), [
+            {"type": "game_action", "action": "use_card", "index": 0},
+            {"type": "state_ack", "seq": 2},
+            move(-1),
+        ])
+        self.assertEqual((self.batcher.queued, self.batcher.frames), (5, 1))
+
+    def test_single_message_is_sent_bare(self):
+        self.assertIsNone(self.batcher.take_frame())
+        self.batcher.add({"type": "ping", "t": 1.5})
+        self.assertEqual(json.loads(self.batcher.take_frame()), {"type": "ping", "t": 1.5})
+        self.assertIsNone(self.batcher.take_frame())
+
+    def test_seq_runs_merge_into_count(self):
+        for seq in (1, 2, 3):
+            self.batcher.add(move(1, seq=seq))
+        self.batcher.add(move(0, 1, seq=4))  # New direction starts a new run
+        self.batcher.add(move(0, 1, seq=6))  # Gap in seq: not merged
+        self.assertEqual(frame_messages(self.batcher.take_frame()), [
+            dict(move(1, seq=1), count=3), move(0, 1, seq=4), move(0, 1, seq=6),
+        ])
+
+class TestBatchedPrediction(unittest.TestCase):
+    def test_bursty_delivery_does_not_drift(self):
+        # Inputs leave the client every other tick, merged into counted runs,
+        # and frames arrive with jitter: the server sees bursts and gaps
+        rand = random.Random(2)
+        arrival = 0
+        sim = LobbySimulation(["p1", "p2"], ["A", "B"], seed=1)
+        player = sim.players["p1"]
+        predictor = PlayerPredictor(sim.game.apply_movement)
+        predictor.reconcile(player.position, 0)
+        batcher = OutboundBatcher()
+        in_flight, states = deque(), deque()
+        for tick, (move_x, move_y) in enumerate([(1, 0)] * 60 + [(0, 1)] * 60 + [(0, 0)] * 30):
+            payload = predictor.step(move_x, move_y)
+            if payload:
+                batcher.add(dict(payload, type="game_action"))
+            if tick % 2 == 1:
+                frame = batcher.take_frame()
+                if frame:
+                    arrival = max(arrival, tick + 4 + rand.randint(0, 3))
+                    in_flight.append((arrival, frame_messages(frame)))
+            while in_flight and in_flight[0][0] <= tick:
+                for message in in_flight.popleft()[1]:
+                    sim.queue_command("p1", message)
+            sim.step()
+            if tick % 3 == 0:
+                record = sim.get_state()["players"]["p1"]
+                states.append((tick + 4, record["position"], record["input_seq"]))
+            while states and states[0][0] <= tick:
+                _, position, seq = states.popleft()
+                predictor.reconcile(position, seq)
+
+        self.assertEqual(predictor.corrections, 0)
+        self.assertFalse(predictor.pending)
+        self.assertAlmostEqual(predictor.position[0], player.position[0])
+        self.assertAlmostEqual(predictor.position[1], player.position[1])
+
+if __name__ == "__main__":
+    unittest.main()
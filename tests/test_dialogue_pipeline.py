@@ -0,0 +1,77 @@
+import time
+import unittest
+from types import SimpleNamespace
+from src.ai.dialogue_pipeline import CANCELLED, DONE, TIMED_OUT
+from src.ai.response_cache import ResponseCache
+from src.systems.dialogue_system import DialogueSystem
+from stub_llm_server import StubLLMServer
+
+def make_dialogue(url, timeout=2.0, stream=False):
+    npc = SimpleNamespace(npc_id="npc_1", name="Ava", alive=True)
+    game = SimpleNamespace(npcs=[npc], current_time="day", current_day=1)
+    dialogue = DialogueSystem(game)
+    dialogue.grok_api_key = "test-key"
+    dialogue.grok_endpoint = url
+    dialogue.request_timeout = dialogue.pipeline.timeout = timeout
+    dialogue.response_cache = ResponseCache(path=None)
+    dialogue.stream_responses = stream
+    dialogue.start_conversation(SimpleNamespace(id=1), "npc_1")
+    return dialogue
+
+def wait_for(dialogue, seconds=3.0):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        arrived = dialogue.update()
+        if arrived:
+            return arrived
+        time.sleep(0.01)
+    return []
+
+class TestDialoguePipeline(unittest.TestCase):
+    def test_fallback_served_immediately_then_replaced(self):
+        with StubLLMServer(reply="Tôi đã thấy hắn.", delay=0.3) as stub:
+            dialogue = make_dialogue(stub.url)
+            start = time.monotonic()
+            text = dialogue.process_player_message("Bạn có thấy gì không?")
+            self.assertLess(time.monotonic() - start, 0.1)
+            self.assertNotEqual(text, "Tôi đã thấy hắn.")
+            self.assertTrue(dialogue.dialogue_history["npc_1"][-1]["pending"])
+
+            [(npc, reply)] = wait_for(dialogue)
+            self.assertEqual((npc.npc_id, reply), ("npc_1", "Tôi đã thấy hắn."))
+            entry = dialogue.dialogue_history["npc_1"][-1]
+            self.assertEqual(entry["text"], "Tôi đã thấy hắn.")
+            self.assertNotIn("pending", entry)
+            self.assertEqual(stub.requests[0]["messages"][-1]["content"], "Bạn có thấy gì không?")
+
+    def test_slow_reply_times_out_to_fallback(self):
+        with StubLLMServer(delay=1.0) as stub:
+            dialogue = make_dialogue(stub.url, timeout=0.2)
+            fallback = dialogue.process_player_message("Xin chào")
+            request, _ = dialogue.pending_responses["npc_1"]
+            self.assertEqual(wait_for(dialogue, 0.5), [])
+            self.assertEqual(request.status, TIMED_OUT)
+            self.assertEqual(dialogue.dialogue_history["npc_1"][-1]["text"], fallback)
+
+    def test_cancel_on_end_conversation(self):
+        with StubLLMServer(delay=0.3) as stub:
+            dialogue = make_dialogue(stub.url)
+            dialogue.process_player_message("Xin chào")
+            request, _ = dialogue.pending_responses["npc_1"]
+            dialogue.end_conversation()
+            self.assertEqual(request.status, CANCELLED)
+            self.assertEqual(wait_for(dialogue, 0.5), [])
+
+    def test_new_message_supersedes_pending_reply(self):
+        with StubLLMServer(reply=lambda body: body["messages"][-1]["content"].upper(), delay=0.1) as stub:
+            dialogue = make_dialogue(stub.url)
+            dialogue.process_player_message("một")
+            first, _ = dialogue.pending_responses["npc_1"]
+            dialogue.process_player_message("hai")
+            self.assertEqual(first.status, CANCELLED)
+            [(_, reply)] = wait_for(dialogue)
+            self.assertEqual(reply, "HAI")
+            self.assertEqual(dialogue.pipeline.pending, [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import pygame
+from src.utils import font_utils
+from src.utils.font_utils import TextSurfaceCache, render_text
+
+class TestTextSurfaceCache(unittest.TestCase):
+    def setUp(self):
+        pygame.font.init()
+        self.font = pygame.font.Font(None, 16)
+
+    def test_lru_eviction(self):
+        cache = TextSurfaceCache(max_size=2)
+        a = cache.get(self.font, "a", (255, 255, 255))
+        cache.get(self.font, "b", (255, 255, 255))
+        self.assertIs(cache.get(self.font, "a", [255, 255, 255]), a)  # Color lists hash like tuples
+        cache.get(self.font, "c", (255, 255, 255))  # Evicts "b", the least recently used
+        self.assertEqual([key[1] for key in cache.surfaces], ["a", "c"])
+
+        cache.resize(1)
+        self.assertEqual([key[1] for key in cache.surfaces], ["c"])
+
+    def test_stats(self):
+        cache = TextSurfaceCache(max_size=8)
+        self.assertEqual(cache.stats()["hit_rate"], 0.0)
+        for _ in range(3):
+            cache.get(self.font, "HP", (255, 0, 0))
+        cache.get(self.font, "HP", (0, 255, 0))
+        self.assertEqual(cache.stats(), {"hits": 2, "misses": 2, "hit_rate": 0.5, "size": 2, "max_size": 8})
+        cache.clear()
+        self.assertEqual((cache.stats()["hits"], len(cache)), (0, 0))
+
+    def test_uncached_render_bypasses_shared_cache(self):
+        before = len(font_utils.text_cache)
+        surface = render_text(self.font, "đang gõ...", cached=False)
+        self.assertGreater(surface.get_width(), 0)
+        self.assertEqual(len(font_utils.text_cache), before)
+
+class TestFontRegistry(unittest.TestCase):
+    def setUp(self):
+        pygame.font.init()
+        font_utils.clear_font_registry()
+        self.addCleanup(font_utils.clear_font_registry)
+
+    def test_fonts_are_loaded_once(self):
+        font = font_utils.get_font(18)
+        self.assertIs(font_utils.get_font(18), font)
+        self.assertIsNot(font_utils.get_font(18, bold=True), font)
+        default = font_utils.get_sys_font(None, 20)
+        self.assertIs(font_utils.get_sys_font(None, 20), default)
+        self.assertIsNot(font_utils.get_sys_font(None, 20, italic=True), default)
+
+    def test_preload_and_clear(self):
+        count = font_utils.preload_fonts(sizes=(14, 24))
+        self.assertGreaterEqual(count, 4)
+        font = font_utils.get_font(14)
+        render_text(font, "Ngày 1")
+        self.assertGreater(len(font_utils.text_cache), 0)
+
+        font_utils.clear_font_registry()
+        self.assertEqual(len(font_utils._font_registry), 0)
+        self.assertEqual(len(font_utils.text_cache), 0)
+        self.assertIsNot(font_utils.get_font(14), font)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+from src.core.game import Game
+
+class TestHeadless(unittest.TestCase):
+    def test_swarm_mode_selects_a_character_and_runs(self):
+        game = Game(game_mode="swarm", headless=True, seed=7)
+        summary = game.run_headless(max_steps=120)
+        self.assertEqual(summary["steps"], 120)
+        self.assertEqual(len(game.players), 1)
+
+    def test_standard_mode_runs(self):
+        summary = Game(headless=True, seed=7).run_headless(max_steps=120)
+        self.assertEqual(summary["steps"], 120)
+
+    def test_games_in_one_process_keep_their_own_seed(self):
+        def state(game):
+            return ([(tuple(p.position), p.hp) for p in game.players],
+                    [(tuple(m.position), m.hp) for m in game.monsters])
+
+        # Interleaved ticks: with a shared RNG each game would see the other's draws
+        first, second = Game(headless=True, seed=11), Game(headless=True, seed=11)
+        for _ in range(600):
+            first.tick()
+            second.tick()
+        self.assertTrue(first.monsters)
+        self.assertEqual(state(first), state(second))
+        self.assertEqual(first.rng.random(), second.rng.random())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+from src.network.interest import InterestManager
+from src.network.protocol import SnapshotHistory, apply_delta, decode_delta, empty_snapshot
+
+def make_state(p1_x, monsters, phase="Day"):
+    return {
+        "phase": phase,
+        "day_count": 1,
+        "players": {
+            "p1": {"hp": 100, "alive": True, "position": [p1_x, 0]},
+            "p2": {"hp": 0, "alive": False, "position": [0, 0]},
+        },
+        "monsters": {mid: {"symbol": "Z", "hp": 40.0, "position": [x, 0]} for mid, x in monsters.items()},
+    }
+
+class TestInterestManager(unittest.TestCase):
+    def setUp(self):
+        self.history = SnapshotHistory()
+        self.interest = InterestManager(view_radius=100, night_view_radius=50, hysteresis=1.5)
+        self.client = {}
+        self.acked = None
+
+    def _sync(self, state):
+        self.interest.update(self.history.push(state))
+        delta = decode_delta(self.interest.encode_for("p1", self.acked))
+        base = self.client[delta["baseline"]] if delta["baseline"] else empty_snapshot()
+        snapshot = apply_delta(base, delta)
+        self.client[snapshot["seq"]] = snapshot
+        self.acked = snapshot["seq"]
+        return snapshot
+
+    def test_only_nearby_monsters_are_sent(self):
+        snapshot = self._sync(make_state(0, {1: 50, 2: 500}))
+        self.assertEqual(set(snapshot["monsters"]), {1})
+        self.assertEqual(set(snapshot["players"]), {"p1", "p2"})
+        self.assertEqual(snapshot["globals"]["phase"], "Day")
+
+    def test_monsters_enter_and_leave_view(self):
+        self._sync(make_state(0, {1: 50, 2: 500}))
+        snapshot = self._sync(make_state(450, {1: 50, 2: 500}))
+        self.assertEqual(set(snapshot["monsters"]), {2})
+        self.assertEqual(snapshot, self.interest.views["p1"].snapshots[snapshot["seq"]])
+
+    def test_hysteresis_keeps_edge_monsters(self):
+        self._sync(make_state(0, {1: 90}))
+        # Out of the view radius but inside 1.5x: still visible
+        self.assertEqual(set(self._sync(make_state(0, {1: 140}))["monsters"]), {1})
+        self.assertEqual(set(self._sync(make_state(0, {1: 160}))["monsters"]), set())
+        # Not visible before, so it must come back inside the radius
+        self.assertEqual(set(self._sync(make_state(0, {1: 140}))["monsters"]), set())
+
+    def test_night_shrinks_view(self):
+        snapshot = self._sync(make_state(0, {1: 40, 2: 80}, phase="Night"))
+        self.assertEqual(set(snapshot["monsters"]), {1})
+
+    def test_dead_players_see_everything(self):
+        self._sync(make_state(0, {1: 50, 2: 500}))
+        self.assertEqual(self.interest.views["p2"].relevant, {1, 2})
+
+if __name__ == "__main__":
+    unittest.main()
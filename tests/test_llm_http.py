@@ -0,0 +1,48 @@
+import threading
+import unittest
+import requests
+from src.ai.llm_http import LLMSession
+from stub_llm_server import StubLLMServer
+
+def content(result):
+    return result["choices"][0]["message"]["content"]
+
+class TestLLMSession(unittest.TestCase):
+    def test_connections_are_reused(self):
+        with StubLLMServer(reply="ok") as stub:
+            session = LLMSession()
+            for i in range(3):
+                self.assertEqual(content(session.post_json(stub.url, {"n": i}, timeout=2)), "ok")
+            self.assertEqual(stub.connections, 1)
+            stats = session.stats()
+            self.assertEqual((stats["requests"], stats["errors"]), (3, 0))
+            self.assertIn("latency_p95", stats)
+
+    def test_retries_overloaded_answers(self):
+        with StubLLMServer(reply="ok", status=[503, 429, 200]) as stub:
+            session = LLMSession(max_retries=2, backoff=0.01)
+            self.assertEqual(content(session.post_json(stub.url, {}, timeout=2)), "ok")
+            self.assertEqual((session.attempts, session.retries), (3, 2))
+
+        with StubLLMServer(status=[503]) as stub:
+            session = LLMSession(max_retries=1, backoff=0.01)
+            with self.assertRaises(requests.HTTPError):
+                session.post_json(stub.url, {}, timeout=2)
+            self.assertEqual(session.errors, 1)
+
+    def test_identical_concurrent_requests_are_coalesced(self):
+        with StubLLMServer(reply=lambda body: body["q"], delay=0.2) as stub:
+            session = LLMSession(max_concurrency=2)
+            results = []
+            threads = [threading.Thread(target=lambda q=q: results.append(
+                content(session.post_json(stub.url, {"q": q}, timeout=2)))) for q in ("a", "a", "a", "b")]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(sorted(results), ["a", "a", "a", "b"])
+            self.assertEqual(len(stub.requests), 2)
+            self.assertEqual(session.coalesced, 2)
+
+if __name__ == "__main__":
+    unittest.main()
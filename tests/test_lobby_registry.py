@@ -0,0 +1,66 @@
+import unittest
+from src.network.lobby_registry import LobbyRegistry
+
+class TestLobbyRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = LobbyRegistry(min_players=3)
+
+    def _seat(self, lobby, *player_ids):
+        for pid in player_ids:
+            self.registry.add_player(lobby, pid)
+
+    def test_ids_are_not_reused_after_cleanup(self):
+        first = self.registry.create("a")
+        self._seat(first, "p1")
+        self.assertTrue(self.registry.remove_player(first, "p1"))
+        self.assertNotIn(first.id, self.registry)
+        second = self.registry.create("b")
+        self.assertNotEqual(first.id, second.id)
+
+    def test_open_index_tracks_free_slots(self):
+        lobby = self.registry.create("a")
+        self._seat(lobby, "p1", "p2", "p3", "p4", "p5")
+        self.assertIsNone(self.registry.find_open())
+        self.assertFalse(self.registry.add_player(lobby, "p6"))
+        self.registry.remove_player(lobby, "p5")
+        self.assertIs(self.registry.find_open(), lobby)
+        self.registry.set_state(lobby, "in_game")
+        self.assertIsNone(self.registry.find_open())
+        self.assertEqual(self.registry.list_open(), [])
+
+    def test_only_waiting_lobbies_accept_players(self):
+        lobby = self.registry.create("a")
+        self._seat(lobby, "p1", "p2", "p3")
+        for state in ("in_game", "finished"):
+            self.registry.set_state(lobby, state)
+            self.assertFalse(lobby.is_open)
+            self.assertFalse(self.registry.add_player(lobby, "late"))
+        self.assertEqual(lobby.players, {"p1", "p2", "p3"})
+
+    def test_find_open_prefers_fullest(self):
+        small, big = self.registry.create("small"), self.registry.create("big")
+        self._seat(small, "p1")
+        self._seat(big, "p2", "p3", "p4")
+        self.assertIs(self.registry.find_open(), big)
+
+    def test_matchmaking_waits_for_enough_players(self):
+        self.registry.enqueue("p1")
+        self.registry.enqueue("p2")
+        self.assertEqual(self.registry.match(), [])
+        self.registry.enqueue("p3")
+        [(lobby, players)] = self.registry.match()
+        self.assertEqual(players, ["p1", "p2", "p3"])
+        self.assertFalse(self.registry.queue)
+
+    def test_matchmaking_tops_up_open_lobbies(self):
+        lobby = self.registry.create("a")
+        self._seat(lobby, "p1", "p2")
+        for pid in ("q1", "q2", "q3", "q4"):
+            self.registry.enqueue(pid)
+        self.registry.dequeue("q4")
+        [(placed, players)] = self.registry.match()
+        self.assertIs(placed, lobby)
+        self.assertEqual(players, ["q1", "q2", "q3"])
+
+if __name__ == "__main__":
+    unittest.main()
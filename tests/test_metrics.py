@@ -0,0 +1,37 @@
+import asyncio
+import json
+import unittest
+from src.network.metrics import ServerMetrics, serve_metrics
+
+class TestServerMetrics(unittest.TestCase):
+    def test_rates_over_window(self):
+        metrics = ServerMetrics()
+        metrics.samples[0] = (0.0, dict(metrics.samples[0][1]))
+        for _ in range(10):
+            metrics.count_out(100)
+        metrics.sample()
+        metrics.samples[-1] = (2.0, metrics.samples[-1][1])
+        rates = metrics.rates()
+        self.assertEqual(rates["messages_out"], 5.0)
+        self.assertEqual(rates["bytes_out"], 500.0)
+        self.assertEqual(metrics.report({"connections": 3})["gauges"]["connections"], 3)
+
+    def test_http_endpoint(self):
+        async def fetch(path):
+            server = await serve_metrics(lambda: {"ok": 1}, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            server.close()
+            return response
+
+        head, body = asyncio.run(fetch("/metrics")).split(b"\r\n\r\n", 1)
+        self.assertTrue(head.startswith(b"HTTP/1.1 200"))
+        self.assertEqual(json.loads(body), {"ok": 1})
+        self.assertTrue(asyncio.run(fetch("/nope")).startswith(b"HTTP/1.1 404"))
+
+if __name__ == "__main__":
+    unittest.main()
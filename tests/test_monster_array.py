@@ -0,0 +1,69 @@
+import unittest
+import numpy as np
+from src.core.entities.monster_array import MonsterArray
+
+class TestMonsterArray(unittest.TestCase):
+    def setUp(self):
+        self.store = MonsterArray(capacity=2)
+        self.views = [self.store.spawn(symbol, hp=10, damage=4, position=(i * 100, 0))
+                      for i, symbol in enumerate("ABCD")]
+
+    def test_spawn_grows_capacity(self):
+        self.assertEqual((len(self.store), self.store.capacity), (4, 4))
+        self.assertEqual([v.id for v in self.views], [1, 2, 3, 4])
+        self.assertEqual(self.views[3].position.tolist(), [300.0, 0.0])
+
+    def test_cull_dead_compacts_in_order(self):
+        a, b, c, d = self.views
+        b.alive = False
+        d.hp = 0
+        removed = self.store.cull_dead()
+        self.assertEqual(removed, [b, d])
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(self.store.symbols, ["A", "C"])
+        self.assertEqual(self.store.positions[:2].tolist(), [[0, 0], [200, 0]])
+        self.assertFalse(self.store.alive[2:4].any())
+        self.assertEqual(self.store.cull_dead(), [])
+
+    def test_views_list_is_rebound_in_place(self):
+        # MonsterSystem.monsters / game.monsters alias this list
+        alias = self.store.views
+        self.views[0].alive = False
+        self.store.cull_dead()
+        self.assertIs(self.store.views, alias)
+        self.assertEqual([v.symbol for v in alias], ["B", "C", "D"])
+        # Survivors follow their new rows
+        survivor = alias[0]
+        survivor.hp = 7
+        self.assertEqual(self.store.hp[0], 7)
+
+    def test_culled_view_detaches_with_its_last_state(self):
+        b = self.views[1]
+        b.hp = 0
+        self.store.cull_dead()
+        self.assertEqual((b.symbol, b.hp, b.alive, b.id), ("B", 0.0, False, 2))
+        self.assertEqual(b.position.tolist(), [100.0, 0.0])
+        # Writes go to the frozen copy, not to the row now used by another monster
+        b.position = (5, 5)
+        self.assertEqual(self.store.positions[1].tolist(), [200.0, 0.0])
+        self.assertFalse(self.store.remove(b))
+
+    def test_nearest_targets_and_contact_damage(self):
+        targets = np.array([[0.0, 0.0], [290.0, 0.0]])
+        nearest, dist_sq = self.store.nearest_targets(targets)
+        self.assertEqual(nearest.tolist(), [0, 0, 1, 1])
+        self.assertEqual(dist_sq.tolist(), [0.0, 10000.0, 8100.0, 100.0])
+
+        self.views[0].alive = False  # Dead monsters deal no damage
+        damage = self.store.contact_damage(targets, dt=0.5, attack_range=95)
+        self.assertEqual(damage.tolist(), [0.0, 4 * 0.5 * 2])
+
+    def test_move_toward_nearest(self):
+        targets = np.array([[0.0, 100.0]])
+        self.views[1].alive = False
+        self.store.move_toward_nearest(targets, dt=0.1, speed_scale=50.0)
+        self.assertEqual(self.views[0].position.tolist(), [0.0, 5.0])
+        self.assertEqual(self.views[1].position.tolist(), [100.0, 0.0])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import time
+import unittest
+from types import SimpleNamespace
+from src.ai.offline_dialogue import OfflineDialogueEngine, context_tags, tokenize
+from src.systems.dialogue_system import FALLBACK_RESPONSES, DialogueSystem
+from src.utils.file_utils import load_json
+
+RESPONSES = load_json("data/dialogues/npc_responses.json")
+
+class TestOfflineDialogueEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = OfflineDialogueEngine(RESPONSES)
+
+    def test_tokenize_keeps_word_pairs(self):
+        self.assertIn("giết người", tokenize("Ai đã GIẾT NGƯỜI?"))
+
+    def test_intent_picks_category(self):
+        intent = {"topic": "general", "is_accusation": True}
+        reply = self.engine.respond("npc_1", "Tôi nghi ngờ bạn", context_tags(intent))
+        self.assertIn(reply, RESPONSES["suspicion"]["high"])
+        reply = self.engine.respond("npc_1", "Trời tối rồi", context_tags({"topic": "general"}, night=True))
+        self.assertIn(reply, RESPONSES["general"]["night"])
+
+    def test_similar_message_reuses_past_exchange(self):
+        self.engine.add_exchange("npc_1", "Đêm qua bạn ở đâu?", "Tôi ở nhà thờ cả đêm.")
+        tags = context_tags({"topic": "general"})
+        self.assertEqual(self.engine.respond("npc_1", "bạn ở đâu đêm qua", tags), "Tôi ở nhà thờ cả đêm.")
+        self.assertNotEqual(self.engine.respond("npc_1", "Thời tiết thế nào?", tags), "Tôi ở nhà thờ cả đêm.")
+
+    def test_role_and_event_lines_need_to_be_true(self):
+        murder = {"topic": "murder"}
+        self.assertNotIn("events/player_died", context_tags(murder))
+        self.assertIn("events/player_died", context_tags(murder, events=["murder"]))
+        self.assertFalse([tag for tag in context_tags(murder, role="protector") if tag.startswith("traitor/")])
+        self.assertIn("traitor/unaware", context_tags(murder, role="traitor"))
+        self.assertIn("traitor/aware", context_tags(murder, suspicion=0.95, role="traitor"))
+
+        # A protector asking about a murder that never happened hears neither
+        for _ in range(5):
+            reply = self.engine.respond("npc_1", "Ai đã giết người?", context_tags(murder, role="protector"))
+            self.assertNotIn(reply, RESPONSES["events"]["player_died"] + RESPONSES["traitor"]["aware"])
+
+    def test_history_is_capped_and_indexed_incrementally(self):
+        engine = OfflineDialogueEngine(RESPONSES, history_limit=3)
+        canned = len(engine)
+        for i in range(5):
+            engine.add_exchange("npc_1", f"câu hỏi số{i}", f"Trả lời {i}.")
+        self.assertEqual(len(engine), canned + 3)
+        self.assertNotIn("số0", engine.postings)
+        self.assertEqual(engine.document_frequency["câu"], 3)
+        tags = context_tags({"topic": "general"})
+        self.assertEqual(engine.respond("npc_2", "câu hỏi số4", tags), "Trả lời 4.")
+        self.assertNotEqual(engine.respond("npc_2", "câu hỏi số0", tags), "Trả lời 0.")
+        # A forgotten exchange can be learned again
+        engine.add_exchange("npc_1", "câu hỏi số0", "Trả lời 0.")
+        self.assertEqual(engine.respond("npc_3", "câu hỏi số0", tags), "Trả lời 0.")
+
+    def test_recent_replies_are_not_repeated(self):
+        tags = context_tags({"topic": "ritual"}, role="chaos")
+        replies = [self.engine.respond("npc_1", "nghi lễ", tags) for _ in range(3)]
+        self.assertEqual(len(set(replies)), 3)
+
+    def test_queries_are_fast(self):
+        tags = context_tags({"topic": "murder", "is_threatening": True})
+        self.engine.respond("npc_1", "warmup", tags)
+        start = time.perf_counter()
+        for _ in range(200):
+            self.engine.respond("npc_1", "Có xác chết ở nhà kho, bạn thấy máu không?", tags)
+        self.assertLess((time.perf_counter() - start) / 200, 0.001)
+
+class TestDialogueSystemOffline(unittest.TestCase):
+    def test_no_api_key_uses_offline_engine(self):
+        npc = SimpleNamespace(npc_id="npc_1", name="Ava", alive=True)
+        dialogue = DialogueSystem(SimpleNamespace(npcs=[npc], current_time="day", current_day=1))
+        dialogue.grok_api_key = None
+        dialogue.start_conversation(SimpleNamespace(id=1), "npc_1")
+        reply = dialogue.process_player_message("Có xác chết ở nhà kho")
+        murder_lines = [line.replace("{name}", "Ava") for line in FALLBACK_RESPONSES["murder"]]
+        self.assertIn(reply, murder_lines)
+        self.assertEqual(dialogue.pending_responses, {})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import asyncio
+import unittest
+from src.network.outbox import ClientOutbox
+
+class FakeWebSocket:
+    """Records what is sent; sends block while ``gate`` is clear"""
+
+    def __init__(self):
+        self.sent = []
+        self.closed_with = None
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.error = None
+
+    async def send(self, payload):
+        await self.gate.wait()
+        if self.error:
+            raise self.error
+        self.sent.append(payload)
+
+    async def close(self, code=1000, reason=""):
+        self.closed_with = (code, reason)
+
+async def settle():
+    """Let the writer task run until it blocks again"""
+    await asyncio.sleep(0.01)
+
+class TestClientOutbox(unittest.TestCase):
+    def test_overflow_disconnects(self):
+        async def scenario():
+            websocket = FakeWebSocket()
+            outbox = ClientOutbox(websocket, limit=2)
+            self.assertTrue(outbox.put_event("a"))
+            self.assertTrue(outbox.put_event("b"))
+            self.assertFalse(outbox.put_event("c"))
+            self.assertEqual((outbox.closed, outbox.close_reason, len(outbox)), (True, "send queue overflow", 0))
+            self.assertFalse(outbox.put_state(b"s"))
+            await outbox.aclose()
+            self.assertEqual(websocket.closed_with, (1013, "send queue overflow"))
+        asyncio.run(scenario())
+
+    def test_states_are_coalesced_behind_events(self):
+        async def scenario():
+            websocket = FakeWebSocket()
+            outbox = ClientOutbox(websocket)
+            outbox.start()
+            websocket.gate.clear()
+            outbox.put_event("first")
+            await settle()  # Writer is now blocked sending "first"
+            for state in (b"s1", b"s2", b"s3"):
+                outbox.put_state(state)
+            outbox.put_event("second")
+            websocket.gate.set()
+            await settle()
+            self.assertEqual(websocket.sent, ["first", "second", b"s3"])
+            self.assertEqual((outbox.coalesced, outbox.sent, len(outbox)), (2, 3, 0))
+            await outbox.aclose()
+            self.assertIsNone(websocket.closed_with)
+        asyncio.run(scenario())
+
+    def test_blocked_send_times_out(self):
+        async def scenario():
+            websocket = FakeWebSocket()
+            websocket.gate.clear()
+            outbox = ClientOutbox(websocket, send_timeout=0.05)
+            outbox.start()
+            outbox.put_event("stuck")
+            await asyncio.sleep(0.1)
+            self.assertEqual(outbox.close_reason, "send timed out")
+            await outbox.aclose()
+            self.assertEqual(websocket.closed_with, (1013, "send timed out"))
+        asyncio.run(scenario())
+
+    def test_failed_send_stops_writing(self):
+        async def scenario():
+            websocket = FakeWebSocket()
+            websocket.error = ConnectionResetError()
+            outbox = ClientOutbox(websocket)
+            outbox.start()
+            outbox.put_event("lost")
+            await settle()
+            self.assertTrue(outbox.closed)
+            self.assertFalse(outbox.put_event("more"))
+            await outbox.aclose()
+        asyncio.run(scenario())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+from src.core.particles import ParticlePool
+
+class TestParticlePool(unittest.TestCase):
+    def test_emit_drops_when_full(self):
+        pool = ParticlePool(capacity=2)
+        self.assertTrue(pool.emit((0, 0), (255, 0, 0), 10, 1.0))
+        self.assertTrue(pool.emit((1, 1), (255, 0, 0), 10, 1.0))
+        self.assertFalse(pool.emit((2, 2), (255, 0, 0), 10, 1.0))
+        self.assertEqual(len(pool), 2)
+        self.assertEqual(pool.dropped, 1)
+
+    def test_expiry_keeps_survivors_packed(self):
+        pool = ParticlePool(capacity=8)
+        lifetimes = [0.1, 1.0, 0.1, 1.0, 1.0, 0.1]
+        for i, lifetime in enumerate(lifetimes):
+            pool.emit((i, 0), (0, 0, 255), 5, lifetime)
+
+        pool.update(0.5)
+
+        self.assertEqual(len(pool), 3)
+        survivors = sorted(pool.positions[:pool.count, 0].tolist())
+        self.assertEqual(survivors, [1.0, 3.0, 4.0])
+        self.assertTrue((pool.lifetime[:pool.count] == 1.0).all())
+
+    def test_freed_rows_are_reused(self):
+        pool = ParticlePool(capacity=1)
+        pool.emit((0, 0), (0, 255, 0), 5, 0.1)
+        pool.update(0.2)
+        self.assertEqual(len(pool), 0)
+        self.assertTrue(pool.emit((3, 4), (0, 255, 0), 5, 0.1))
+        self.assertEqual(pool.positions[0].tolist(), [3.0, 4.0])
+
+if __name__ == "__main__":
+    unittest.main()
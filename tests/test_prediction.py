@@ -0,0 +1,99 @@
+import random
+import unittest
+from collections import deque
+from types import SimpleNamespace
+from src.network.prediction import PlayerPredictor, SnapshotBuffer
+from src.network.simulation import LobbySimulation
+
+class TestPrediction(unittest.TestCase):
+    def setUp(self):
+        self.sim = LobbySimulation(["p1", "p2", "p3"], ["A", "B", "C"], seed=1)
+        self.player = self.sim.players["p1"]
+        self.predictor = PlayerPredictor(self.sim.game.apply_movement)
+        self.predictor.reconcile(self.player.position, 0)
+
+    def _run(self, inputs, latency_ticks=6, jitter_ticks=0):
+        """Client ticks with inputs reaching the server and states coming back after a delay"""
+        rand = random.Random(5)
+        to_server, to_client = deque(), deque()
+        arrival = 0
+        for tick, (move_x, move_y) in enumerate(inputs):
+            payload = self.predictor.step(move_x, move_y)
+            if payload:
+                # Jittered but in order, as over one TCP connection
+                arrival = max(arrival, tick + latency_ticks + rand.randint(0, jitter_ticks))
+                to_server.append((arrival, payload))
+            while to_server and to_server[0][0] <= tick:
+                self.sim.queue_command("p1", to_server.popleft()[1])
+            self.sim.step()
+            if tick % 3 == 0:
+                record = self.sim.get_state()["players"]["p1"]
+                to_client.append((tick + latency_ticks, list(record["position"]), record["input_seq"]))
+            while to_client and to_client[0][0] <= tick:
+                _, position, seq = to_client.popleft()
+                self.predictor.reconcile(position, seq)
+
+    def test_local_input_applies_immediately(self):
+        start = self.player.position
+        self.predictor.step(1, 0)
+        self.assertGreater(self.predictor.position[0], start[0])
+        self.assertEqual(self.player.position, start)
+
+    def test_prediction_matches_server_after_inputs_settle(self):
+        self._run([(1, 0)] * 40 + [(0, 1)] * 30 + [(0, 0)] * 30)
+        self.assertFalse(self.predictor.pending)
+        self.assertAlmostEqual(self.predictor.position[0], self.player.position[0])
+        self.assertAlmostEqual(self.predictor.position[1], self.player.position[1])
+        self.assertEqual(self.predictor.corrections, 0)
+
+    def test_jittered_inputs_do_not_drift(self):
+        expected = SimpleNamespace(position=self.player.position)
+        for _ in range(120):
+            self.sim.game.apply_movement(expected, 1, 0, self.predictor.dt)
+        self._run([(1, 0)] * 120 + [(0, 0)] * 20, jitter_ticks=3)
+        # The server moved exactly once per predicted input, never ahead of the client
+        self.assertEqual(self.predictor.corrections, 0)
+        self.assertAlmostEqual(self.player.position[0], expected.position[0])
+        self.assertAlmostEqual(self.predictor.position[0], expected.position[0])
+
+    def test_server_correction_is_blended(self):
+        self.predictor.reconcile((self.player.position[0] + 10, self.player.position[1]), 0)
+        self.assertAlmostEqual(self.predictor.render_position[0] - self.predictor.position[0], -10)
+        for _ in range(60):
+            self.predictor.step(0, 0)
+        self.assertLess(abs(self.predictor.render_position[0] - self.predictor.position[0]), 0.5)
+
+class TestCommandValidation(unittest.TestCase):
+    def test_malformed_commands_are_dropped(self):
+        sim = LobbySimulation(["p1", "p2"], ["A", "B"], seed=1)
+        for data in ({"action": "move", "x": "left"}, {"action": "move", "x": 1, "seq": None},
+                     {"action": "move", "x": 1, "seq": 1, "count": float("inf")},
+                     {"action": "use_card", "index": [0]}, ["move"]):
+            sim.queue_command("p1", data)
+        sim.queue_command("p2", {"action": "move", "x": 1, "y": 0, "seq": 1})
+        start = sim.players["p2"].position
+        sim.step()
+        self.assertEqual(len(sim.take_results()), 5)
+        self.assertEqual(sim.move_inputs["p1"], deque())
+        self.assertGreater(sim.players["p2"].position[0], start[0])
+
+class TestSnapshotBuffer(unittest.TestCase):
+    def test_interpolates_between_ticks(self):
+        buffer = SnapshotBuffer(tick_rate=60, delay=0.1)
+        for tick in (0, 3, 6, 9):
+            buffer.push({"tick": tick, "monsters": {1: {"position": [tick * 10, 0]}}, "players": {}})
+        buffer.render_tick = 4.5
+        self.assertAlmostEqual(buffer.sample()["monsters"][1]["position"][0], 45)
+
+    def test_render_clock_trails_newest_state(self):
+        buffer = SnapshotBuffer(tick_rate=60, delay=0.1)
+        for tick in range(0, 600, 3):
+            buffer.push({"tick": tick, "players": {}, "monsters": {}})
+            for _ in range(3):
+                buffer.advance(1 / 60)
+        # Within one send interval of newest tick - delay, never past the newest state
+        self.assertLess(buffer.render_tick, 597)
+        self.assertGreater(buffer.render_tick, 597 - 6 - 3)
+
+if __name__ == "__main__":
+    unittest.main()
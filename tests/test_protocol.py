@@ -0,0 +1,76 @@
+import unittest
+import random
+from src.network.protocol import (
+    SnapshotHistory, ProtocolError, apply_delta, decode_delta, empty_snapshot, snapshot_to_game_state
+)
+
+def make_state(rand, monster_ids, tick):
+    return {
+        "phase": "day",
+        "day_count": 2,
+        "time_left": 60 - tick * 0.1,
+        "players": {
+            "p1": {"hp": 100, "role": "♕", "cards": [], "position": [100 + tick, 400]},
+            "p2": {"hp": 80.0, "role": "♛", "cards": ["x"], "position": [150, 400]},
+        },
+        "monsters": {
+            mid: {"symbol": "Z", "position": [rand.uniform(0, 1280), rand.uniform(0, 720)],
+                  "hp": rand.choice([40.0, 25.5]), "max_hp": 40}
+            for mid in monster_ids
+        },
+    }
+
+class TestStateSync(unittest.TestCase):
+    def setUp(self):
+        self.rand = random.Random(3)
+        self.history = SnapshotHistory()
+
+    def _receive(self, client, data):
+        delta = decode_delta(data)
+        base = client[delta["baseline"]] if delta["baseline"] else empty_snapshot()
+        snapshot = apply_delta(base, delta)
+        client[snapshot["seq"]] = snapshot
+        return snapshot
+
+    def test_full_snapshot_round_trip(self):
+        self.history.push(make_state(self.rand, range(1, 50), 0))
+        snapshot = self._receive({}, self.history.encode_for(None))
+        self.assertEqual(snapshot, self.history.latest)
+
+    def test_deltas_track_server_state(self):
+        client = {}
+        acked = None
+        ids = list(range(1, 200))
+        for tick in range(20):
+            # Monsters die and spawn between sends
+            ids = ids[3:] + [ids[-1] + 1, ids[-1] + 5]
+            self.history.push(make_state(self.rand, ids, tick))
+            acked = self._receive(client, self.history.encode_for(acked))["seq"]
+            self.assertEqual(client[acked], self.history.latest)
+
+        state = snapshot_to_game_state(client[acked])
+        self.assertEqual(sorted(state["monsters"]), ids)
+        self.assertEqual(state["players"]["p1"]["position"], [119, 400])
+
+    def test_unknown_baseline_gets_full_snapshot(self):
+        self.history.push(make_state(self.rand, [1, 2], 0))
+        self.assertEqual(decode_delta(self.history.encode_for(999))["baseline"], 0)
+
+    def test_small_moves_are_compact(self):
+        state = make_state(self.rand, range(1, 301), 0)
+        self.history.push(state)
+        for monster in state["monsters"].values():
+            monster["position"][0] += 5
+        self.history.push(state)
+        # ~3 bytes per moved monster plus headers
+        self.assertLess(len(self.history.encode_for(1)), 1200)
+
+    def test_delta_against_wrong_baseline_rejected(self):
+        self.history.push(make_state(self.rand, [1], 0))
+        self.history.push(make_state(self.rand, [1], 1))
+        delta = decode_delta(self.history.encode_for(1))
+        with self.assertRaises(ProtocolError):
+            apply_delta(empty_snapshot(), delta)
+
+if __name__ == "__main__":
+    unittest.main()
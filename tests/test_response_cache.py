@@ -0,0 +1,136 @@
+import os
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from src.ai.grok_integration import GrokClient
+from src.ai.response_cache import ResponseCache, make_key
+from src.systems.dialogue_system import DialogueSystem
+from src.utils.shared import process_wide
+from stub_llm_server import StubLLMServer
+
+def messages(text):
+    return [{"role": "system", "content": "Bạn là Ava."}, {"role": "user", "content": text}]
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache.sqlite3")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_key_normalizes_prompt(self):
+        self.assertEqual(make_key(messages("Bạn là ai?"), "m"), make_key(messages("  bạn   LÀ ai "), "m"))
+        self.assertNotEqual(make_key(messages("Bạn là ai?"), "m"), make_key(messages("Bạn là ai?"), "other"))
+        self.assertNotEqual(make_key(messages("Bạn là ai?"), "m", ("calm",)),
+                            make_key(messages("Bạn là ai?"), "m", ("angry",)))
+
+    def test_lru_and_disk_tiers(self):
+        cache = ResponseCache(self.path, max_entries=2)
+        for name in "abc":
+            cache.put(name, name.upper())
+        self.assertEqual(list(cache.memory), ["b", "c"])
+        self.assertEqual(cache.get("a"), "A")  # Evicted from memory, still on disk
+        self.assertEqual((cache.memory_hits, cache.disk_hits), (0, 1))
+        cache.close()
+
+        reopened = ResponseCache(self.path)
+        self.assertEqual(reopened.get("c"), "C")
+        self.assertIsNone(reopened.get("missing"))
+        self.assertEqual(reopened.hit_rate, 0.5)
+        reopened.close()
+
+    def test_disk_tier_opens_on_first_use(self):
+        cache = ResponseCache(self.path)
+        self.assertIsNone(cache.get("a", memory_only=True))
+        self.assertFalse(os.path.exists(self.path))
+        cache.put("a", "A")
+        self.assertTrue(os.path.exists(self.path))
+        cache.close()
+        # Closed before any use: stays memory-only and never creates the file
+        unused = os.path.join(self.tmp.name, "unused.sqlite3")
+        cache = ResponseCache(unused)
+        cache.close()
+        cache.put("a", "A")
+        self.assertFalse(os.path.exists(unused))
+
+    def test_ttl_and_disk_size_limit(self):
+        cache = ResponseCache(self.path, disk_entries=2, ttl=0.05)
+        for name in "abc":
+            cache.put(name, name.upper())
+        self.assertEqual(cache._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0], 2)
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("c"))
+        cache.close()
+
+    def test_shared_by_dialogue_and_grok_client(self):
+        cache = ResponseCache(path=None)
+        with StubLLMServer(reply="Không.", delay=0.05) as stub:
+            client = GrokClient("test-key", cache=cache)
+            client.endpoint = stub.url
+            self.assertEqual(client.ask("Có ai ở đây không?"), "Không.")
+            self.assertEqual(client.ask("có ai ở đây không"), "Không.")
+            self.assertEqual(len(stub.requests), 1)
+
+            npc = SimpleNamespace(npc_id="npc_1", name="Ava", alive=True)
+            dialogue = DialogueSystem(SimpleNamespace(npcs=[npc], current_time="day", current_day=1), cache)
+            self.assertIs(dialogue.response_cache, cache)
+            dialogue.grok_api_key, dialogue.grok_endpoint = "test-key", stub.url
+            dialogue.async_responses = False
+            dialogue.start_conversation(SimpleNamespace(id=1), "npc_1")
+            self.assertEqual(dialogue.process_player_message("Bạn là ai?"), "Không.")
+            dialogue.end_conversation()
+
+            # Same question later, different history: answered from the cache at once
+            dialogue.async_responses = True
+            dialogue.start_conversation(SimpleNamespace(id=1), "npc_1")
+            self.assertEqual(dialogue.process_player_message("bạn là ai"), "Không.")
+            self.assertEqual(dialogue.pending_responses, {})
+            self.assertEqual(len(stub.requests), 2)
+
+    def test_every_reply_path_feeds_offline_history(self):
+        def exchanges(dialogue):
+            engine = dialogue.offline_engine
+            return sorted((engine.documents[i].key[1], tuple(sorted(engine.documents[i].tags)))
+                          for i in engine.history)
+
+        cache = ResponseCache(path=None)
+        npc = SimpleNamespace(npc_id="npc_1", name="Ava", alive=True)
+        game = SimpleNamespace(npcs=[npc], current_time="day", current_day=1)
+        with StubLLMServer(reply="Tôi là Ava.") as stub:
+            dialogues = [DialogueSystem(game, cache) for _ in range(3)]
+            for dialogue in dialogues:
+                dialogue.grok_api_key, dialogue.grok_endpoint = "test-key", stub.url
+                dialogue.stream_responses = False
+                dialogue.start_conversation(SimpleNamespace(id=1), "npc_1")
+            sync, cached, background = dialogues
+
+            sync.async_responses = False
+            sync.process_player_message("Bạn là ai?")
+            cached.process_player_message("Bạn là ai?")  # Answered from the cache
+            self.assertEqual(cached.pending_responses, {})
+            background.process_player_message("Tên bạn là gì?")
+            deadline = time.time() + 5
+            while not background.update() and time.time() < deadline:
+                time.sleep(0.01)
+
+        tags = ("history", "npc:npc_1", "topic:identity")
+        self.assertEqual(exchanges(sync), [("Bạn là ai?", tags)])
+        self.assertEqual(exchanges(cached), exchanges(sync))
+        self.assertEqual(exchanges(background), [("Tên bạn là gì?", tags)])
+
+class TestProcessWide(unittest.TestCase):
+    def test_factory_runs_once(self):
+        calls = []
+
+        @process_wide
+        def shared():
+            calls.append(1)
+            return object()
+
+        self.assertIs(shared(), shared())
+        self.assertEqual(len(calls), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import asyncio
+import socket
+import unittest
+from src.network.shard import ShardPool, _Channel
+from src.network.simulation import LobbySimulation
+
+class TestShardPool(unittest.TestCase):
+    def _run(self, scenario):
+        async def main():
+            pool = ShardPool(1)
+            inbox = asyncio.Queue()
+            pool.start(inbox.put_nowait)
+            try:
+                await asyncio.wait_for(scenario(pool, inbox), timeout=60)
+            finally:
+                pool.shutdown()
+        asyncio.run(main())
+
+    def test_start_state_game_over_round_trip(self):
+        async def scenario(pool, inbox):
+            self.assertEqual(pool.start_lobby("l1", ["p1", "p2"], ["A", "B"], seed=3), 0)
+            self.assertEqual(pool.player_load, [2])
+            kind, lobby_id, state, _ = await inbox.get()
+            self.assertEqual((kind, lobby_id), ("state", "l1"))
+            self.assertEqual(sorted(state["players"]), ["p1", "p2"])
+
+            pool.send("l1", "stop")
+            msg = await inbox.get()
+            while msg[0] == "state":
+                msg = await inbox.get()
+            self.assertEqual(msg, ("game_over", "l1", None, "stopped"))
+            self.assertEqual((pool.player_load, pool.lobby_load, pool.placement), ([0], [0], {}))
+        self._run(scenario)
+
+    def test_dead_worker_closes_its_lobbies(self):
+        async def scenario(pool, inbox):
+            pool.start_lobby("l1", ["p1"], ["A"], seed=3)
+            await inbox.get()
+            pool.processes[0].kill()
+            msg = await inbox.get()
+            while msg[0] == "state":
+                msg = await inbox.get()
+            self.assertEqual(msg, ("game_over", "l1", None, "error"))
+            self.assertEqual(pool.placement, {})
+            self.assertIsNone(pool.start_lobby("l2", ["p1"], ["A"]))
+        self._run(scenario)
+
+    def test_send_to_dead_worker_does_not_raise(self):
+        async def scenario(pool, inbox):
+            pool.start_lobby("l1", ["p1"], ["A"], seed=3)
+            await inbox.get()
+            pool.processes[0].kill()
+            pool.processes[0].join()
+            # The write fails before the EOF is read: the worker is marked dead at once
+            for _ in range(64):
+                pool.send("l1", "command", "p1", {"type": "move", "x": 1, "y": 0})
+            msg = await inbox.get()
+            while msg[0] == "state":
+                msg = await inbox.get()
+            self.assertEqual(msg, ("game_over", "l1", None, "error"))
+            self.assertEqual(pool.alive, [False])
+        self._run(scenario)
+
+class TestChannel(unittest.TestCase):
+    def test_send_never_blocks_on_a_slow_reader(self):
+        async def main():
+            left, right = socket.socketpair()
+            received = []
+            sender = _Channel(left, received.append, lambda: None)
+            payload = b"x" * (256 * 1024)
+            for i in range(32):
+                # Far more than the socket buffer holds; the rest waits in the channel
+                sender.send(("state", i, payload))
+            self.assertGreater(sender.pending, 0)
+
+            closed = asyncio.Event()
+            receiver = _Channel(right, received.append, closed.set)
+            while len(received) < 32:
+                await asyncio.sleep(0.01)
+            self.assertEqual([msg[1] for msg in received], list(range(32)))
+            self.assertEqual(sender.pending, 0)
+
+            sender.close()
+            await asyncio.wait_for(closed.wait(), timeout=5)
+            self.assertTrue(receiver.closed)
+        asyncio.run(asyncio.wait_for(main(), timeout=30))
+
+class TestLobbySimulationStop(unittest.TestCase):
+    def test_stop_before_run_starts(self):
+        # A stop can be handled in the same batch as the start, before run() begins
+        simulation = LobbySimulation(["p1"], ["A"], seed=3)
+        simulation.stop()
+        asyncio.run(asyncio.wait_for(simulation.run(), timeout=5))
+        self.assertEqual(simulation.tick, 0)
+        self.assertFalse(simulation.running)
+
+if __name__ == "__main__":
+    unittest.main()
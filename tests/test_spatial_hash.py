@@ -0,0 +1,42 @@
+import unittest
+import random
+from src.utils.spatial_hash import SpatialHash
+
+class TestSpatialHash(unittest.TestCase):
+    def setUp(self):
+        self.grid = SpatialHash(cell_size=64)
+        rand = random.Random(42)
+        self.points = [(rand.uniform(0, 1280), rand.uniform(0, 720), i) for i in range(200)]
+        for x, y, i in self.points:
+            self.grid.insert((x, y), i)
+
+    def _dist_sq(self, a, b):
+        return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2
+
+    def test_empty_grid(self):
+        grid = SpatialHash(64)
+        self.assertIsNone(grid.nearest((10, 10)))
+        self.assertEqual(grid.query_radius((10, 10), 100), [])
+
+    def test_nearest_matches_brute_force(self):
+        for query in [(0, 0), (640, 360), (1500, -200), (33, 700)]:
+            expected = min(self._dist_sq(query, p) for p in self.points)
+            x, y, _ = self.grid.nearest(query)
+            self.assertAlmostEqual(self._dist_sq(query, (x, y)), expected)
+
+    def test_nearest_respects_max_radius(self):
+        self.assertIsNone(self.grid.nearest((5000, 5000), max_radius=50))
+
+    def test_query_radius_matches_brute_force(self):
+        query, radius = (640, 360), 150
+        expected = sorted(i for x, y, i in self.points if self._dist_sq(query, (x, y)) < radius * radius)
+        found = sorted(item for _, _, item in self.grid.query_radius(query, radius))
+        self.assertEqual(found, expected)
+
+    def test_clear(self):
+        self.grid.clear()
+        self.assertEqual(len(self.grid), 0)
+        self.assertIsNone(self.grid.nearest((0, 0)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import math
+import os
+import unittest
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+from src.utils.sprite_cache import RotationCache, StampCache
+
+RED = (255, 0, 0)
+
+class TestStampCache(unittest.TestCase):
+    def test_radius_buckets_share_a_stamp(self):
+        cache = StampCache(max_size=2)
+        first = cache.get("circle", 9.2, RED)
+        self.assertIs(cache.get("circle", 9.9, RED), first)
+        self.assertEqual(first.get_size(), (20, 20))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_least_recently_used_is_evicted(self):
+        cache = StampCache(max_size=2)
+        cache.get("circle", 4, RED)
+        cache.get("ring", 4, RED)
+        cache.get("circle", 4, RED)
+        cache.get("aoe", 4, RED)
+        self.assertEqual([key[0] for key in cache.stamps], ["circle", "aoe"])
+
+class TestRotationCache(unittest.TestCase):
+    def test_angles_snap_to_steps(self):
+        cache = RotationCache(angle_steps=64)
+        sprite = cache.get("attack", (70, 8), RED, 0.30)
+        self.assertIs(cache.get("attack", (70, 8), RED, 0.31), sprite)
+        self.assertIsNot(cache.get("attack", (70, 8), RED, math.pi), sprite)
+
+    def test_pixel_budget_evicts_oldest(self):
+        cache = RotationCache(max_pixels=1)
+        for step in range(3):
+            newest = cache.get("attack", (40, 8), RED, step)
+        # Always keeps the sprite just built, even over budget
+        self.assertEqual(list(cache.sprites.values()), [newest])
+        self.assertEqual(cache.pixels, newest.get_width() * newest.get_height())
+
+    def test_growing_beam_reuses_a_few_sprites(self):
+        cache = RotationCache()
+        screen = pygame.Surface((800, 600), pygame.SRCALPHA)
+        # One cast: the beam grows to its full length while thinning from 20 to 10
+        for frame in range(48):
+            progress = frame / 48
+            cache.blit_beam(screen, 237, 20 * (1 - progress * 0.5), RED, (400, 300), 0.7,
+                            237 * min(progress * 3, 1.0))
+        self.assertLessEqual(cache.misses, 3)
+
+    def test_beam_extends_from_source_and_is_clipped(self):
+        cache = RotationCache()
+        screen = pygame.Surface((600, 200), pygame.SRCALPHA)
+        cache.blit_beam(screen, 300, 12, RED, (100, 100), 0.0, length=150)
+        self.assertGreater(screen.get_at((240, 100)).a, 0)
+        self.assertEqual(screen.get_at((90, 100)).a, 0)   # Nothing behind the source
+        self.assertEqual(screen.get_at((250 + 12, 100)).a, 0)  # Nothing past the length
+
+if __name__ == "__main__":
+    unittest.main()
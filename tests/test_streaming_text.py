@@ -0,0 +1,96 @@
+import os
+import time
+import unittest
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+from src.ai.dialogue_pipeline import TIMED_OUT
+from src.ui.streaming_text import StreamingTextBox
+from src.utils.font_utils import text_cache
+from stub_llm_server import StubLLMServer
+from test_dialogue_pipeline import make_dialogue
+
+REPLY = "Tôi đã thấy một bóng người đi về phía nhà thờ lúc nửa đêm."
+
+class TestStreamedReplies(unittest.TestCase):
+    def test_pieces_arrive_before_the_reply_is_complete(self):
+        with StubLLMServer(reply=REPLY, piece_delay=0.05) as stub:
+            dialogue = make_dialogue(stub.url, stream=True)
+            shown = dialogue.process_player_message("Bạn thấy gì?")
+            request, entry = dialogue.pending_responses["npc_1"]
+            # The caller shows the fallback until the first piece replaces it
+            self.assertEqual(shown, request.fallback)
+            self.assertEqual(entry["text"], "")
+
+            pieces, arrived = [], []
+            deadline = time.monotonic() + 3
+            while not arrived and time.monotonic() < deadline:
+                arrived = dialogue.update(on_stream=lambda npc_id, piece, new: pieces.append((piece, new)))
+                if pieces and not arrived:
+                    # Partial text is already in the history
+                    self.assertTrue(REPLY.startswith(entry["text"]))
+                time.sleep(0.01)
+
+            self.assertGreater(len(pieces), 3)
+            self.assertEqual([new for _, new in pieces].count(True), 1)
+            self.assertEqual("".join(piece for piece, _ in pieces), REPLY)
+            self.assertEqual(arrived[0][1], REPLY)
+            self.assertEqual(entry["text"], REPLY)
+            self.assertLess(request.first_piece, request.latency)
+            self.assertTrue(stub.requests[0]["stream"])
+
+    def test_no_first_piece_falls_back(self):
+        with StubLLMServer(reply=REPLY, delay=1.0) as stub:
+            dialogue = make_dialogue(stub.url, timeout=0.2, stream=True)
+            dialogue.process_player_message("Bạn thấy gì?")
+            request, entry = dialogue.pending_responses["npc_1"]
+            pieces = []
+            deadline = time.monotonic() + 0.6
+            while time.monotonic() < deadline:
+                dialogue.update(on_stream=lambda npc_id, piece, new: pieces.append(piece))
+                time.sleep(0.01)
+            self.assertEqual(request.status, TIMED_OUT)
+            self.assertEqual(pieces, [request.fallback])
+            self.assertEqual(entry["text"], request.fallback)
+
+    def test_cancelled_stream_leaves_no_empty_turn(self):
+        with StubLLMServer(reply=REPLY, delay=1.0) as stub:
+            dialogue = make_dialogue(stub.url, stream=True)
+            dialogue.process_player_message("Bạn thấy gì?")
+            request, entry = dialogue.pending_responses["npc_1"]
+            # The next message cancels the first stream before any piece arrived
+            dialogue.process_player_message("Còn gì nữa?")
+            self.assertEqual(entry["text"], request.fallback)
+            messages = dialogue._build_grok_messages(dialogue.active_conversation["npc"], "Còn gì nữa?")
+            self.assertTrue(all(m["content"] for m in messages))
+            dialogue.cancel_pending()
+
+class TestStreamingTextBox(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.font.init()
+        cls.font = pygame.font.Font(None, 20)
+
+    def test_incremental_wrap_matches_one_shot_wrap(self):
+        streamed = StreamingTextBox(self.font, 120)
+        for word in REPLY.split(" "):
+            streamed.append(word if not streamed.text else " " + word)
+        whole = StreamingTextBox(self.font, 120)
+        whole.set_text(REPLY)
+        self.assertEqual(streamed.lines, whole.lines)
+        self.assertEqual(streamed.open_line, whole.open_line)
+        self.assertEqual(streamed.text, REPLY)
+        for line in streamed.lines:
+            self.assertLessEqual(self.font.size(line.rstrip())[0], 120)
+
+    def test_final_lines_reuse_cached_surfaces(self):
+        box = StreamingTextBox(self.font, 120)
+        box.set_text(REPLY)
+        surface = pygame.Surface((200, 200))
+        box.draw(surface, (0, 0))
+        hits = text_cache.hits
+        box.append(" Thật")
+        box.draw(surface, (0, 0))
+        self.assertEqual(text_cache.hits - hits, len(box.lines))
+
+if __name__ == "__main__":
+    unittest.main()